@@ -0,0 +1,201 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   batch_recv.py
+
+ \brief  Batched UDP receive with kernel receive timestamps
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import ctypes
+import ctypes.util
+import socket
+import errno
+import array
+import time
+import os
+
+"""
+From linux/socket.h, SCM_TIMESTAMPNS has the same value as SO_TIMESTAMPNS
+"""
+SO_TIMESTAMPNS  = getattr(socket,'SO_TIMESTAMPNS',35)
+SCM_TIMESTAMPNS = SO_TIMESTAMPNS
+MSG_DONTWAIT    = 0x40
+
+class _iovec(ctypes.Structure):
+    _fields_ = [("iov_base",ctypes.c_void_p),
+                ("iov_len",ctypes.c_size_t)]
+
+class _msghdr(ctypes.Structure):
+    _fields_ = [("msg_name",ctypes.c_void_p),
+                ("msg_namelen",ctypes.c_uint32),
+                ("msg_iov",ctypes.POINTER(_iovec)),
+                ("msg_iovlen",ctypes.c_size_t),
+                ("msg_control",ctypes.c_void_p),
+                ("msg_controllen",ctypes.c_size_t),
+                ("msg_flags",ctypes.c_int)]
+
+class _mmsghdr(ctypes.Structure):
+    _fields_ = [("msg_hdr",_msghdr),
+                ("msg_len",ctypes.c_uint)]
+
+class _cmsghdr(ctypes.Structure):
+    _fields_ = [("cmsg_len",ctypes.c_size_t),
+                ("cmsg_level",ctypes.c_int),
+                ("cmsg_type",ctypes.c_int)]
+
+class _timespec(ctypes.Structure):
+    _fields_ = [("tv_sec",ctypes.c_long),
+                ("tv_nsec",ctypes.c_long)]
+
+_CMSG_ALIGN = ctypes.sizeof(ctypes.c_size_t)
+_CONTROL_SIZE = 64
+
+def _cmsg_align(size):
+    return (size + _CMSG_ALIGN - 1) & ~(_CMSG_ALIGN - 1)
+
+def _load_recvmmsg():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'),use_errno=True)
+        recvmmsg = libc.recvmmsg
+    except (OSError,AttributeError):
+        return None
+    recvmmsg.argtypes = [ctypes.c_int,ctypes.POINTER(_mmsghdr),ctypes.c_uint,ctypes.c_int,ctypes.c_void_p]
+    recvmmsg.restype = ctypes.c_int
+    return recvmmsg
+
+_recvmmsg = _load_recvmmsg()
+
+"""
+Errors that mean there is nothing (more) to read on a connected UDP socket
+"""
+_EMPTY_ERRNOS = [errno.EAGAIN,errno.EWOULDBLOCK,errno.EINTR,errno.ECONNREFUSED]
+
+class BatchReceiver(object):
+    """
+    Drains every datagram pending on a non-blocking socket in one call and
+    returns them as a list of (array('B'), stamp) pairs. With timestamps the
+    socket gets SO_TIMESTAMPNS and stamp is the kernel receive time in
+    seconds (CLOCK_REALTIME), otherwise it is None.
+
+    recvmmsg is called through ctypes with buffers allocated once, when it
+    is not available a recv_into loop is used and the stamp is the time the
+    datagram was read.
+    """
+    def __init__(self,sock,max_packet_size=1500,batch_size=32,timestamps=False):
+        self.sock = sock
+        self.max_packet_size = max_packet_size
+        self.batch_size = batch_size
+        self.timestamps = timestamps
+        self._fd = sock.fileno()
+
+        if timestamps:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET,SO_TIMESTAMPNS,1)
+            except socket.error:
+                self.timestamps = False
+                
+        if _recvmmsg is not None:
+            self._setup_recvmmsg()
+            self.recv_batch = self._recv_batch_mmsg
+        else:
+            self._buffer = bytearray(max_packet_size)
+            self.recv_batch = self._recv_batch_into
+
+    def _setup_recvmmsg(self):
+        n = self.batch_size
+        self._buffers = [ctypes.create_string_buffer(self.max_packet_size) for i in range(n)]
+        self._controls = [ctypes.create_string_buffer(_CONTROL_SIZE) for i in range(n)]
+        self._iovecs = (_iovec * n)()
+        self._msgs = (_mmsghdr * n)()
+        for i in range(n):
+            self._iovecs[i].iov_base = ctypes.addressof(self._buffers[i])
+            self._iovecs[i].iov_len = self.max_packet_size
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            hdr.msg_iovlen = 1
+            if self.timestamps:
+                hdr.msg_control = ctypes.addressof(self._controls[i])
+
+    def _kernel_stamp(self,hdr):
+        """
+        Walk the control messages for SCM_TIMESTAMPNS
+        """
+        offset = 0
+        base = hdr.msg_control
+        header_size = ctypes.sizeof(_cmsghdr)
+        while (offset + header_size) <= hdr.msg_controllen:
+            cmsg = _cmsghdr.from_address(base + offset)
+            if (cmsg.cmsg_len < header_size):
+                break
+            if (socket.SOL_SOCKET == cmsg.cmsg_level) and (SCM_TIMESTAMPNS == cmsg.cmsg_type):
+                ts = _timespec.from_address(base + offset + _cmsg_align(header_size))
+                return ts.tv_sec + ts.tv_nsec * 1e-9
+            offset += _cmsg_align(cmsg.cmsg_len)
+        return None
+
+    def _recv_batch_mmsg(self):
+        received = []
+        while True:
+            for i in range(self.batch_size):
+                hdr = self._msgs[i].msg_hdr
+                hdr.msg_namelen = 0
+                hdr.msg_flags = 0
+                if self.timestamps:
+                    hdr.msg_controllen = _CONTROL_SIZE
+            count = _recvmmsg(self._fd,self._msgs,self.batch_size,MSG_DONTWAIT,None)
+            if (count < 0):
+                err = ctypes.get_errno()
+                if err in _EMPTY_ERRNOS:
+                    return received
+                raise socket.error(err,os.strerror(err))
+
+            for i in range(count):
+                stamp = None
+                if self.timestamps:
+                    stamp = self._kernel_stamp(self._msgs[i].msg_hdr)
+                data = array.array('B',ctypes.string_at(self._buffers[i],self._msgs[i].msg_len))
+                received.append((data,stamp))
+
+            if (count < self.batch_size):
+                return received
+
+    def _recv_batch_into(self):
+        received = []
+        while True:
+            try:
+                size = self.sock.recv_into(self._buffer,self.max_packet_size)
+            except socket.error as e:
+                if e.errno in _EMPTY_ERRNOS:
+                    return received
+                raise
+            stamp = None
+            if self.timestamps:
+                stamp = time.time()
+            received.append((array.array('B',bytes(self._buffer[:size])),stamp))
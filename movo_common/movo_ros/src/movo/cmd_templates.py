@@ -0,0 +1,123 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   cmd_templates.py
+
+ \brief  Precompiled command frames that are patched in place
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from system_defines import *
+from crc32 import calc_crc32
+from ring_queue import RingQueue
+import threading
+import struct
+import array
+
+"""
+Each command is a 16-bit ID followed by 32-bit words and a 32-bit CRC, all
+little endian on the wire
+"""
+CMD_ID_SIZE = 2
+CMD_CRC_SIZE = 4
+
+"""
+Number of 32-bit words in the commands with a fixed layout
+"""
+COMMAND_WORD_COUNTS = dict({MOTION_CMD_ID:                         3,
+                            MOTION_TEST_CMD_ID:                    3,
+                            LOAD_MACH_CONFIG_CMD_ID:               12,
+                            LOAD_ETH_CONFIG_CMD_ID:                4,
+                            GENERAL_PURPOSE_CMD_ID:                2,
+                            LINEAR_ACTUATOR_POSITION_CMD_ID:       1,
+                            LINEAR_ACTUATOR_VELOCITY_LIMIT_CMD_ID: 1,
+                            EIB_GENERAL_CMD_ID:                    2,
+                            KINOVA_ACTUATOR_CMD_ID:                6})
+
+class CommandTemplate(object):
+    """
+    A reusable frame for one command ID. The ID is packed once when the
+    template is created; the variable words are patched in place with
+    struct.pack_into and update_crc rewrites the trailing CRC. A template is
+    not thread safe, each thread building frames needs its own.
+    """
+    def __init__(self,cmd_id,num_words=None):
+        if num_words is None:
+            num_words = COMMAND_WORD_COUNTS[cmd_id]
+        self.cmd_id = cmd_id
+        self.num_words = num_words
+        self.crc_offset = CMD_ID_SIZE + 4*num_words
+        self.frame = bytearray(self.crc_offset + CMD_CRC_SIZE)
+        self._words = struct.Struct('<%dI' % num_words)
+        struct.pack_into('<H',self.frame,0,cmd_id)
+        self.update_crc()
+
+    def set_words(self,words):
+        self._words.pack_into(self.frame,CMD_ID_SIZE,*[(w & 0xFFFFFFFF) for w in words])
+
+    def set_word(self,index,value):
+        struct.pack_into('<I',self.frame,CMD_ID_SIZE+4*index,value & 0xFFFFFFFF)
+
+    def set_float(self,index,value):
+        struct.pack_into('<f',self.frame,CMD_ID_SIZE+4*index,value)
+
+    def update_crc(self):
+        struct.pack_into('<I',self.frame,self.crc_offset,calc_crc32(self.frame[:self.crc_offset]))
+
+    def to_array(self):
+        return array.array('B',self.frame)
+
+    def put(self,tx_queue):
+        """
+        multiprocessing queues pickle the frame later from their feeder thread
+        so they get their own copy, a RingQueue copies it immediately
+        """
+        if isinstance(tx_queue,RingQueue):
+            tx_queue.put(self.frame)
+        else:
+            tx_queue.put(self.to_array())
+
+_thread_templates = threading.local()
+
+def get_command_template(cmd_id,num_words=None):
+    """
+    Returns the template for cmd_id owned by the calling thread
+    """
+    try:
+        templates = _thread_templates.templates
+    except AttributeError:
+        templates = dict()
+        _thread_templates.templates = templates
+
+    key = (cmd_id,num_words)
+    template = templates.get(key)
+    if template is None:
+        template = CommandTemplate(cmd_id,num_words)
+        templates[key] = template
+    return template
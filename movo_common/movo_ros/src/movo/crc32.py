@@ -38,6 +38,10 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 from ctypes import *
 import struct
 import array
+try:
+    import zlib
+except ImportError:
+    zlib = None
 
 
 crc32_tab = [   
@@ -89,13 +93,17 @@ def reverseBits(n,width):
     b = '{:0{width}b}'.format(n, width=width)
     return int(b[::-1], 2)
 
-def calc_crc32(byte_buff):
+"""
+Reference implementation, byte at a time table lookup. This is what the embedded
+platform implements and is kept as the fallback and for conformance checks.
+"""
+def calc_crc32_table(byte_buff):
     crc = 0xFFFFFFFF
     for c in byte_buff:
         crc = crc32_tab[(crc ^ c) & 0xFF] ^ (crc >> 8)
     return reverseBits(crc,32)
 
-def valid_crc32(byte_buff):
+def valid_crc32_table(byte_buff):
     success = False
 
     """
@@ -118,3 +126,58 @@ def valid_crc32(byte_buff):
         success = False
 
     return (success)
+
+"""
+zlib implementation. The protocol CRC uses the same reflected polynomial and
+initial value as zlib but has no final XOR and is bit reversed afterwards, so
+the zlib result only needs the final XOR undone and a table driven reversal.
+"""
+reverse_byte_tab = [int('{:08b}'.format(i)[::-1], 2) for i in range(256)]
+
+try:
+    _buffer = buffer
+except NameError:
+    def _buffer(obj,offset,size):
+        return memoryview(obj)[offset:offset+size]
+
+def _reverse32(n):
+    return ((reverse_byte_tab[n & 0xFF] << 24) |
+            (reverse_byte_tab[(n >> 8) & 0xFF] << 16) |
+            (reverse_byte_tab[(n >> 16) & 0xFF] << 8) |
+            (reverse_byte_tab[(n >> 24) & 0xFF]))
+
+def _as_bytes(byte_buff):
+    if isinstance(byte_buff,list):
+        return array.array('B',byte_buff)
+    return byte_buff
+
+def _zlib_crc32(byte_buff,size):
+    return _reverse32((zlib.crc32(_buffer(byte_buff,0,size)) & 0xFFFFFFFF) ^ 0xFFFFFFFF)
+
+def calc_crc32_zlib(byte_buff):
+    byte_buff = _as_bytes(byte_buff)
+    return _zlib_crc32(byte_buff,len(byte_buff))
+
+def valid_crc32_zlib(byte_buff):
+    byte_buff = _as_bytes(byte_buff)
+    size = len(byte_buff) - 4
+    if (size < 0):
+        return False
+    received_crc = struct.unpack_from("<I",byte_buff,size)[0]
+    return (received_crc == _zlib_crc32(byte_buff,size))
+
+"""
+Select the fastest implementation that conforms to the reference one
+"""
+def _select_crc32():
+    if zlib is None:
+        return calc_crc32_table,valid_crc32_table
+    try:
+        check = array.array('B',[i & 0xFF for i in range(1248)])
+        if (calc_crc32_zlib(check) == calc_crc32_table(check)):
+            return calc_crc32_zlib,valid_crc32_zlib
+    except Exception:
+        pass
+    return calc_crc32_table,valid_crc32_table
+
+calc_crc32,valid_crc32 = _select_crc32()
@@ -0,0 +1,239 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   fault_store.py
+
+ \brief  Indexed SQLite store of the decoded faultlog entries
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from faultlog_parser import *
+import array
+import calendar
+import datetime
+import hashlib
+import os
+import sqlite3
+import time
+
+"""
+Columns holding the fault status words of an entry, in fault group order
+"""
+FSW_COLUMNS = ['transient','critical','comm','sensor','imu','md','arch','internal']
+
+FAULT_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id               INTEGER PRIMARY KEY,
+    robot            TEXT NOT NULL,
+    serial           TEXT NOT NULL,
+    digest           TEXT NOT NULL UNIQUE,
+    source           TEXT,
+    ingested         REAL NOT NULL,
+    sw_build         INTEGER,
+    accumulated_time INTEGER,
+    odometer         INTEGER,
+    power_cycles     INTEGER);
+CREATE TABLE IF NOT EXISTS entries (
+    id               INTEGER PRIMARY KEY,
+    log_id           INTEGER NOT NULL REFERENCES logs(id),
+    robot            TEXT NOT NULL,
+    stamp            INTEGER NOT NULL,
+    runtime          INTEGER NOT NULL,
+    power_cycle      INTEGER NOT NULL,
+    %(fsw)s,
+    data0            INTEGER,
+    data1            INTEGER,
+    UNIQUE (robot,stamp,runtime,power_cycle,%(fsw_names)s));
+CREATE TABLE IF NOT EXISTS faults (
+    entry_id         INTEGER NOT NULL REFERENCES entries(id),
+    robot            TEXT NOT NULL,
+    stamp            INTEGER NOT NULL,
+    grp              INTEGER NOT NULL,
+    bit              INTEGER NOT NULL,
+    name             TEXT NOT NULL,
+    PRIMARY KEY (entry_id,grp,bit));
+CREATE INDEX IF NOT EXISTS faults_stamp ON faults (stamp);
+CREATE INDEX IF NOT EXISTS faults_code ON faults (grp,bit,stamp);
+CREATE INDEX IF NOT EXISTS faults_robot ON faults (robot,stamp);
+CREATE INDEX IF NOT EXISTS entries_stamp ON entries (stamp);
+""" % {'fsw':',\n    '.join(['%-16s INTEGER NOT NULL' % c for c in FSW_COLUMNS]),
+       'fsw_names':','.join(FSW_COLUMNS)}
+
+"""
+Entry times are seconds since the faultlog origin, they are stored as
+seconds since the epoch in the same (robot local) time the reports show
+"""
+FAULTLOG_EPOCH_SECONDS = calendar.timegm(FAULTLOG_EPOCH.timetuple())
+
+def faultlog_stamp(seconds):
+    return FAULTLOG_EPOCH_SECONDS + seconds
+
+def format_stamp(stamp):
+    return datetime.datetime.utcfromtimestamp(stamp).strftime("%Y-%m-%d %H:%M:%S")
+
+def parse_stamp(text):
+    """
+    Accepts seconds since the epoch or a date as YYYY-MM-DD[ HH:MM[:SS]]
+    """
+    if text is None:
+        return None
+    try:
+        return int(float(text))
+    except ValueError:
+        pass
+    for fmt in ["%Y-%m-%d %H:%M:%S","%Y-%m-%d %H:%M","%Y-%m-%d"]:
+        try:
+            return calendar.timegm(datetime.datetime.strptime(text,fmt).timetuple())
+        except ValueError:
+            pass
+    raise ValueError("%s is not a date" % text)
+
+def faultlog_serial(data):
+    return "%08X%08X" % (data[4],data[5])
+
+def faultlog_entries(data):
+    """
+    The non-empty entries of a faultlog as (stamp, runtime, power cycle,
+    fault status words, gpdata) tuples
+    """
+    entries = []
+    for i in range(MAX_FAULT_ENTRIES):
+        start = i*NUMBER_OF_ITEMS_PER_ENTRY + 11
+        entry = data[start:start+NUMBER_OF_ITEMS_PER_ENTRY]
+        if any(entry):
+            entries.append((faultlog_stamp(entry[0]),entry[1],entry[2],
+                            tuple(entry[3:3+NUMBER_OF_FAULT_GROUPS]),(entry[11],entry[12])))
+    return entries
+
+def _where(start,end,robot,table='faults'):
+    clauses = []
+    args = []
+    if start is not None:
+        clauses.append("%s.stamp >= ?" % table)
+        args.append(start)
+    if end is not None:
+        clauses.append("%s.stamp <= ?" % table)
+        args.append(end)
+    if robot is not None:
+        clauses.append("%s.robot = ?" % table)
+        args.append(robot)
+    return ((" WHERE " + " AND ".join(clauses)) if clauses else ""),args
+
+class FaultStore(object):
+    """
+    Every faultlog holds the last MAX_FAULT_ENTRIES entries of a robot, so
+    consecutive extractions mostly repeat each other. A log that was seen
+    before (same words) is skipped and an entry is stored once per robot no
+    matter how many logs contain it. Each fault bit set in an entry is a row
+    of the faults table, indexed by time, fault code and robot. A robot is
+    always identified by the serial number in its faultlog, whether the log
+    comes from the driver or from a dump.
+    """
+    def __init__(self,path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(FAULT_STORE_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.close()
+
+    def ingest(self,data,source=None):
+        """
+        Adds the faultlog words data under the serial number of the robot.
+        Returns the number of entries that were not stored before, None if
+        the same log was ingested already.
+        """
+        digest = hashlib.sha1(array.array('I',data).tostring()).hexdigest()
+        serial = robot = faultlog_serial(data)
+
+        with self._db:
+            if self._db.execute("SELECT 1 FROM logs WHERE digest = ?",(digest,)).fetchone():
+                return None
+            log_id = self._db.execute("INSERT INTO logs (robot,serial,digest,source,ingested,sw_build,accumulated_time,odometer,power_cycles) "
+                                      "VALUES (?,?,?,?,?,?,?,?,?)",
+                                      (robot,serial,digest,source,time.time(),data[6],data[8],data[9],data[10])).lastrowid
+            added = 0
+            for stamp,runtime,power_cycle,fsw,gpdata in faultlog_entries(data):
+                cursor = self._db.execute("INSERT OR IGNORE INTO entries (log_id,robot,stamp,runtime,power_cycle,%s,data0,data1) "
+                                          "VALUES (?,?,?,?,?,%s?,?)" % (','.join(FSW_COLUMNS),'?,'*NUMBER_OF_FAULT_GROUPS),
+                                          (log_id,robot,stamp,runtime,power_cycle) + fsw + gpdata)
+                if (0 == cursor.rowcount):
+                    continue
+                added += 1
+                entry_id = cursor.lastrowid
+                rows = []
+                for grp,value in enumerate(fsw):
+                    names = FAULT_BIT_NAMES[grp]
+                    rows.extend([(entry_id,robot,stamp,grp,bit,names[bit]) for bit in set_bits(value)])
+                self._db.executemany("INSERT INTO faults (entry_id,robot,stamp,grp,bit,name) VALUES (?,?,?,?,?,?)",rows)
+        return added
+
+    def ingest_dump(self,filename):
+        return self.ingest(load_faultlog_dump(filename),os.path.abspath(filename))
+
+    def fault_counts(self,start=None,end=None,robot=None):
+        """
+        (group, name, count, robots, first, last) for every fault in the time
+        range, most frequent first
+        """
+        where,args = _where(start,end,robot)
+        rows = self._db.execute("SELECT grp,name,COUNT(*),COUNT(DISTINCT robot),MIN(stamp),MAX(stamp) FROM faults%s "
+                                "GROUP BY grp,bit ORDER BY COUNT(*) DESC,grp,bit" % where,args).fetchall()
+        return [(fault_group_names[grp],name,count,robots,first,last) for grp,name,count,robots,first,last in rows]
+
+    def fault_history(self,name,start=None,end=None,robot=None):
+        """
+        (stamp, robot, power cycle, runtime) of every occurrence of a fault
+        """
+        where,args = _where(start,end,robot)
+        where = (where + " AND" if where else " WHERE") + " faults.name = ?"
+        return self._db.execute("SELECT faults.stamp,faults.robot,entries.power_cycle,entries.runtime FROM faults "
+                                "JOIN entries ON entries.id = faults.entry_id%s ORDER BY faults.stamp" % where,
+                                args + [name]).fetchall()
+
+    def robot_summary(self,start=None,end=None):
+        """
+        (robot, entries, faults, distinct faults, first, last) per robot
+        """
+        where,args = _where(start,end,None)
+        return self._db.execute("SELECT robot,COUNT(DISTINCT entry_id),COUNT(*),COUNT(DISTINCT grp*32+bit),MIN(stamp),MAX(stamp) "
+                                "FROM faults%s GROUP BY robot ORDER BY robot" % where,args).fetchall()
+
+def ingest_faultlog(path,data):
+    """
+    Opens the store for a single log so callers on any thread can use it
+    """
+    with FaultStore(os.path.expanduser(path)) as store:
+        return store.ingest(data)
@@ -36,10 +36,12 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 --------------------------------------------------------------------"""
 from system_defines import *
 from utils          import *
+import datetime
+import multiprocessing
 import webbrowser
+import array
 import os
 import time
-import rospkg
 import shutil
 
 """
@@ -52,37 +54,39 @@ class FaultlogParser:
         If this path does not exists make it it is the default path for the
         faultlog extraction
         """
-        if (False == os.path.exists(os.getcwd()+"/SI_FAULTLOGS/img")):
-            os.makedirs(os.getcwd()+"/SI_FAULTLOGS/img")
-        
-        """
-        Get the directory and make sure the user did not cancel
-        """
         self.dir_path = os.getcwd()+ "/SI_FAULTLOGS"
+        copy_logo(self.dir_path)
         
         """
-        Copy the logo over to the directory
-        """
-        rospack = rospkg.RosPack()
-        img = rospack.get_path('movo_ros') + "/src/movo/"
-        shutil.copyfile(img+'logo.png',os.getcwd()+"/SI_FAULTLOGS/img/logo.png") 
-        
-        """
-        Parse the faultlog array
+        Parse the faultlog array, the raw words are kept next to the report
+        so an archive of logs can be decoded again in batch
         """
         filename = self.dir_path + "/" + "SI_FAULTOG_" + time.strftime("%m%d%Y_%H%M%S") + ".html"     
         Create_Log_File(filename,faultlog_array.data)
+        save_faultlog_dump(os.path.splitext(filename)[0] + FAULTLOG_DUMP_SUFFIX,faultlog_array.data)
         try:
             webbrowser.open(filename)
         except:
             webbrowser.open(filename)        
 
+def copy_logo(dir_path):
+    """
+    The reports reference the logo in the img directory next to them, rospkg
+    is only needed here so the decoding works without a ROS install
+    """
+    import rospkg
+    if (False == os.path.exists(dir_path+"/img")):
+        os.makedirs(dir_path+"/img")
+    rospack = rospkg.RosPack()
+    img = rospack.get_path('movo_ros') + "/src/movo/"
+    shutil.copyfile(img+'logo.png',dir_path+"/img/logo.png") 
+
 """
 Begin faultlog file creation functions and variables
 """
-MAX_FAULT_ENTRIES = 20;
-NUMBER_OF_ITEMS_PER_ENTRY = 15;
-NUMBER_OF_FAULT_GROUPS = 8;
+MAX_FAULT_ENTRIES = 20
+NUMBER_OF_ITEMS_PER_ENTRY = 15
+NUMBER_OF_FAULT_GROUPS = 8
 
 fault_group_names = ["Transient Faults",
                      "Critical Faults",
@@ -91,7 +95,7 @@ fault_group_names = ["Transient Faults",
                      "IMU Faults",
                      "Motordrive Faults",
                      "Architecture Faults",  
-                     "Internal Faults"];
+                     "Internal Faults"]
                      
 decode_list = [transient_fault_decode,
                critical_fault_decode,
@@ -103,146 +107,68 @@ decode_list = [transient_fault_decode,
                internal_fault_decode]
 
 """
-Define calender constants
+Lookup tables built once from the decode dictionaries in system_defines,
+indexed like decode_list by fault group. For every fault group and bit there
+is the fault name and the rendered report row, unknown bits are reported as
+NO_FAULT_INDICATION.
 """
-NUMBER_OF_MONTHS_PER_YEAR  = (12)
-SECONDS_PER_MINUTE         = (60)
-SECONDS_PER_HOUR           = (3600)
-SECONDS_PER_DAY            = (86400)
-SECONDS_PER_YEAR           = (31536000)
-SECONDS_PER_LEAP_YEAR      = (31622400)
-
-days_per_month = [31, #January
-                  28, #February (in non-leap years)
-                  31, #March
-                  30, #April
-                  31, #May
-                  30, #June
-                  31, #July
-                  31, #August
-                  30, #September
-                  31, #October
-                  30, #November
-                  31  #December
-                  ];
-    
+NO_FAULT_INDICATION = "NO_FAULT_INDICATION"
+
+def _bit_names(decode):
+    return [decode.get(1<<x,NO_FAULT_INDICATION) for x in range(32)]
+
+def _bit_rows(decode):
+    return ["<tr><td></td><td>(x%08X) %s</td></tr>" % (1<<x,name) for x,name in enumerate(_bit_names(decode))]
+
+FAULT_BIT_NAMES = [_bit_names(decode) for decode in decode_list]
+FAULT_BIT_ROWS  = [_bit_rows(decode) for decode in decode_list]
+
+def set_bits(value):
+    """
+    Bit positions set in value, lowest first, only the set bits are visited
+    """
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
 """
-Convert the seconds in the fault log to an actual date based on the
-origin date
+The fault timestamps count seconds from the origin date
 """
+FAULTLOG_EPOCH = datetime.datetime(2011,1,1)
+
 def seconds_to_date(seconds):
-    year = 2011    
-    
-    get_years = True;
-    while (get_years):
-        if (0 == year % 4):
-            if (seconds - SECONDS_PER_LEAP_YEAR) >= 0:
-                year +=1;
-                seconds = seconds - SECONDS_PER_LEAP_YEAR 
-            else:
-                get_years = False;
-        else:
-            if (seconds - SECONDS_PER_YEAR) >= 0:
-                year +=1;
-                seconds = seconds - SECONDS_PER_YEAR 
-            else:
-                get_years = False;        
-        
-        
-    get_month = True;
-    month = 1;
-    while (get_month):
-        seconds_in_month = days_per_month[month - 1] * SECONDS_PER_DAY;
-        if ((0 == (year % 4)) and (2 == month)):
-            seconds_in_month += SECONDS_PER_DAY;
-             
-        if ((seconds - seconds_in_month) >= 0):
-            seconds = seconds - seconds_in_month;
-            month += 1;
-        else:
-            get_month = False;
-    
-    get_day = True;
-    day = 1;
-    while (get_day):
-        if (seconds - SECONDS_PER_DAY) >= 0:
-            seconds = seconds - SECONDS_PER_DAY;
-            day += 1;
-        else:
-            get_day = False;
-    
-    get_hour = True;
-    hour = 0;
-    while(get_hour):
-        if (seconds - SECONDS_PER_HOUR) >= 0:
-            hour += 1;
-            seconds = seconds - SECONDS_PER_HOUR;
-        else:
-            get_hour = False;
-    
-    get_minute = True;
-    minute = 0;
-    while(get_minute):
-        if (seconds - SECONDS_PER_MINUTE) >= 0:
-            minute += 1;
-            seconds = seconds - SECONDS_PER_MINUTE;
-        else:
-            get_minute = False;
-            
-    sec = seconds;
-    return "%(1)02d-%(2)02d-%(3)02d  %(4)02d:%(5)02d:%(6)02d (EST)"  %{"1":month,"2":day,"3":year,"4":hour,"5":minute,"6":sec}
+    """
+    Convert the seconds in the fault log to an actual date based on the
+    origin date
+    """
+    date = FAULTLOG_EPOCH + datetime.timedelta(seconds=seconds)
+    return "%02d-%02d-%02d  %02d:%02d:%02d (EST)" % (date.month,date.day,date.year,date.hour,date.minute,date.second)
  
 """
-Define some helper functions for creating HTML
+Define some helper functions for creating HTML rows
 """
-def trMsgHex( a, v, html):
-    html.append("<tr><td style=\"text-align:right;font-weight:bold;\">%(1)s</td><td>x%(2)08X</td></tr>" %{"1":a, "2":v});
-def trMsgLongHex( a, v1, v2, html):
-    html.append("<tr><td style=\"text-align:right;font-weight:bold;\">%(1)s</td><td>x%(2)08X%(3)08X</td></tr>" %{"1":a, "2":v1, "3":v2});
-def trMsgDec( a, v, html):
-    html.append("<tr><td style=\"text-align:right;font-weight:bold;\">%(1)s</td><td>%(2)d</td></tr>" %{"1":a, "2":v});
-def trMsgString( a, v, html):
-    html.append("<tr><td style=\"text-align:right;font-weight:bold;\">%(1)s</td><td>%(2)s</td></tr>" %{"1":a, "2":v});    
+def trMsgHex(a,v):
+    return "<tr><td style=\"text-align:right;font-weight:bold;\">%s</td><td>x%08X</td></tr>" % (a,v)
+def trMsgLongHex(a,v1,v2):
+    return "<tr><td style=\"text-align:right;font-weight:bold;\">%s</td><td>x%08X%08X</td></tr>" % (a,v1,v2)
+def trMsgDec(a,v):
+    return "<tr><td style=\"text-align:right;font-weight:bold;\">%s</td><td>%d</td></tr>" % (a,v)
+def trMsgString(a,v):
+    return "<tr><td style=\"text-align:right;font-weight:bold;\">%s</td><td>%s</td></tr>" % (a,v)
+def trMsgData(a,v):
+    return "<tr><td style=\"text-align:right;font-weight:bold;\">%s</td><td>x%08X %f</td></tr>" % (a,v,convert_u32_to_float(v))
 def secondsToTimeString(seconds): 
-    hours = seconds / 60 / 60;
-    minutes = ((seconds / 60) % 60);
-    secs = seconds % 60;
-
-    result = "%(1)d:%(2)02d:%(3)02d" %{"1":hours,"2":minutes,"3":secs};
-    
-    return result
-
-"""
-Helper function to decode the faults
-"""
-def decode_faults(value,table,html):
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (value & temp);
-        if (temp):
-            try:
-                html.append("<tr><td></td><td>(x%(1)08X) %(2)s</td></tr>" %{"1":temp,"2":table[temp]});
-            except:
-                html.append("<tr><td></td><td>(x%(1)08X) NO_FAULT_INDICATION</td></tr>"%{"1":temp})
-                
-            
-"""
-This function creates the entire parsed faultlog file
-"""            
-def Create_Log_File(filename, data):
+    return "%d:%02d:%02d" % (seconds // 3600,(seconds // 60) % 60,seconds % 60)
 
-    outfile = open(filename, "w"); 
-    
-    """
-    Create an array for holding the file lines
+def decode_faults(value,group):
     """
-    html = [];
-    
+    Report rows of the faults of group set in value
     """
-    Create the file header
-    """
-    html.append(("<html><head><title>SI Faultlog %s</title>\n"  %filename));
-    html.append("\
+    rows = FAULT_BIT_ROWS[group]
+    return [rows[x] for x in set_bits(value)]
+
+HTML_HEADER = "\
     <style>\
     BODY, tr, td {\
       font-family: arial, sans;\
@@ -261,129 +187,134 @@ def Create_Log_File(filename, data):
     h2 {\
       font-size: 14px;\
     }\
-    </style>");
-    html.append("</head><body>\n")
-    html.append("<div class=\"header\">\n<img src=\"img/logo.png\" alt=\"logo\" width=\"500\"/>\n</div>\n")
-    
+    </style></head><body>\n\
+<div class=\"header\">\n<img src=\"img/logo.png\" alt=\"logo\" width=\"500\"/>\n</div>\n"
+
+def render_raw_data(data):
     """
-    Create the faultlog instance header table
+    The raw log as 16-bit hex words, 16 per line
     """
-    html.append("<table>\n");
-    trMsgString("Filename", filename, html);
-    trMsgHex("Log Version", data[0],html);
-    trMsgDec("Log Size Bytes", data[1],html);
-    trMsgDec("Number of Entries", data[2],html);
-    trMsgDec("Latest Entry", data[3],html);
-    trMsgLongHex("Serial Number",data[4], data[5],html);
-    trMsgDec("SIC SW Build ID", data[6],html);
-    trMsgHex("SIC SW Build Stamp", data[7],html);
-    
-    acc_time = secondsToTimeString(data[8]);
-    trMsgString("Accumulated Time", acc_time,html);
-    trMsgDec("Odometer (m)", data[9],html);
-    trMsgDec("Power Cycles", data[10],html);
-    html.append("</table>\n");
-    
-    html.append("<p>Faults are listed in the order they appear in the fault\n\
-                log, not in the order in which they have occurred.</p>\n");
-    
-    
+    shorts = []
+    for word in data[:-1]:
+        shorts.append((word & 0xFFFF0000)>>16)
+        shorts.append(word & 0x0000FFFF)
+    lines = ["\n%03X: " % (i*2) + "".join(["%04X " % s for s in shorts[i:i+16]]) for i in range(0,len(shorts),16)]
+    return "<!--  Raw Data From Log\n" + "".join(lines) + "\n-->"
+
+def render_entry(i,entry,latest):
+    if latest:
+        parts = ["<h2 style='color: #99cc33'>Fault[ %d] (Latest Entry)</h2>\n" % i]
+    else:
+        parts = ["<h2>Fault[ %d]</h2>\n" % i]
+
+    if not any(entry):
+        parts.append("<i>empty</i>\n")
+        return "".join(parts)
+
+    parts.append("<table>\n")
+    parts.append(trMsgString("Time Stamp",seconds_to_date(entry[0])))
+    parts.append(trMsgString("Runtime Stamp",secondsToTimeString(entry[1])))
+    parts.append(trMsgDec("Power Cycle",entry[2]))
+
     """
-    Append the entire raw faultlog
+    Decode all the faults present
     """
-    html.append("<!--  Raw Data From Log\n");
-    raw_shorts = [0] * ((len(data) - 1) * 2);
-    for i in range(0,(len(data) - 1)):
-        raw_shorts[i * 2]     = (data[i] & 0xFFFF0000)>>16;
-        raw_shorts[i * 2 + 1] = (data[i] & 0x0000FFFF);
-        
-    
-    for i in range(0,len(raw_shorts)):    
-        if ((i % 16) == 0):
-            html.append("\n%03X: " %(i * 2));
-            
-        html.append("%04X " %raw_shorts[i]);
-    
-    html.append("\n-->");
-    
+    for k in range(NUMBER_OF_FAULT_GROUPS):
+        parts.append(trMsgHex(fault_group_names[k],entry[3+k]))
+        parts.extend(decode_faults(entry[3+k],k))
+
     """
-    Now start decoding each of the entries
+    Represent the gpdata in floating point by default
     """
-    fault_entries = [0] * MAX_FAULT_ENTRIES;
-    
-    for i in range(0,MAX_FAULT_ENTRIES):
-        temp = [0] * NUMBER_OF_ITEMS_PER_ENTRY;
-        for j in range(0,NUMBER_OF_ITEMS_PER_ENTRY):
-            temp[j]= data[i * NUMBER_OF_ITEMS_PER_ENTRY + j + 11]
-            
-        fault_entries[i] = temp;
-    
-    for i in range(0,MAX_FAULT_ENTRIES):
-        if ((i == data[3]) and (data[2])):
-            html.append(("<h2 style='color: #99cc33'>Fault[ %d] (Latest Entry)</h2>\n" %i));
-        else:
-            html.append(("<h2>Fault[ %d]</h2>\n" %i));
-        
-        """
-        Check if it is empty
-        """
-        empty = True;
-        for j in range(0,NUMBER_OF_ITEMS_PER_ENTRY):
-            if (0 != fault_entries[i][j]):
-                empty = False; 
-    
-        if (empty):
-            html.append("<i>empty</i>\n");
-        else:
-            """
-            Create the faultlog entry table
-            """
-            html.append("<table>\n");
-    
-            timestamp = seconds_to_date(fault_entries[i][0]);
-            trMsgString("Time Stamp", timestamp,html);
-    
-            runtimestamp = secondsToTimeString(fault_entries[i][1]);
-            trMsgString("Runtime Stamp", runtimestamp,html);
-            trMsgDec("Power Cycle", fault_entries[i][2],html);
-    
-            """
-            Decode all the faults present. If we are in the MCU specific faults
-            check the gpdata and decode that as well
-            """
-            for k in range(0,NUMBER_OF_FAULT_GROUPS):
-                trMsgHex(fault_group_names[k], fault_entries[i][3+k],html);
-                decode_faults(fault_entries[i][3+k], decode_list[k],html);
-    
-            """
-            Represent the gpdata in floating point by default
-            """
-            float_rep = convert_u32_to_float(fault_entries[i][11])
-            html.append("<tr><td style=\"text-align:right;font-weight:bold;\">%(1)s</td><td>x%(2)08X %(3)f</td></tr>" 
-                    % {"1":"Data[0]","2":fault_entries[i][11],"3":float_rep}); 
-    
-            float_rep = convert_u32_to_float(fault_entries[i][12])
-            html.append("<tr><td style=\"text-align:right;font-weight:bold;\">%(1)s</td><td>x%(2)08X %(3)f</td></tr>" 
-                    % {"1":"Data[1]","2":fault_entries[i][12],"3":float_rep}); 
-                    
-                    
-            """
-            Finished with this entry
-            """
-            html.append("<table>\n");
-    
+    parts.append(trMsgData("Data[0]",entry[11]))
+    parts.append(trMsgData("Data[1]",entry[12]))
+    parts.append("<table>\n")
+    return "".join(parts)
+
+def render_faultlog(filename,data):
     """
-    Finished with this log
+    Returns the HTML report of the faultlog words
     """
-    html.append("</body></html>\n");
-       
+    parts = ["<html><head><title>SI Faultlog %s</title>\n" % filename,
+             HTML_HEADER,
+             "<table>\n",
+             trMsgString("Filename",filename),
+             trMsgHex("Log Version",data[0]),
+             trMsgDec("Log Size Bytes",data[1]),
+             trMsgDec("Number of Entries",data[2]),
+             trMsgDec("Latest Entry",data[3]),
+             trMsgLongHex("Serial Number",data[4],data[5]),
+             trMsgDec("SIC SW Build ID",data[6]),
+             trMsgHex("SIC SW Build Stamp",data[7]),
+             trMsgString("Accumulated Time",secondsToTimeString(data[8])),
+             trMsgDec("Odometer (m)",data[9]),
+             trMsgDec("Power Cycles",data[10]),
+             "</table>\n",
+             "<p>Faults are listed in the order they appear in the fault\n\
+                log, not in the order in which they have occurred.</p>\n",
+             render_raw_data(data)]
+
+    for i in range(MAX_FAULT_ENTRIES):
+        start = i*NUMBER_OF_ITEMS_PER_ENTRY + 11
+        parts.append(render_entry(i,data[start:start+NUMBER_OF_ITEMS_PER_ENTRY],(i == data[3]) and data[2]))
+
+    parts.append("</body></html>\n")
+    return "".join(parts)
+
+def Create_Log_File(filename, data):
     """
-    Write the outfile and close it
+    This function creates the entire parsed faultlog file
     """
-    output = ''.join(html);
-    outfile.write(output);
-    outfile.close();
-    
+    with open(filename,"w") as outfile:
+        outfile.write(render_faultlog(filename,data))
+
+"""
+Raw faultlog dumps hold NUMBER_OF_FAULTLOG_WORDS native 32-bit words, text
+dumps with one number per word (decimal or 0x hex) are read as well
+"""
+FAULTLOG_DUMP_SUFFIX = ".dat"
+
+def save_faultlog_dump(filename,data):
+    with open(filename,"wb") as f:
+        f.write(array.array('I',data).tostring())
+
+def load_faultlog_dump(filename):
+    with open(filename,"rb") as f:
+        raw = f.read()
+    if (len(raw) == NUMBER_OF_FAULTLOG_WORDS*4):
+        return array.array('I',raw).tolist()
+    words = [int(w,0) for w in raw.decode().replace(',',' ').split()]
+    if (len(words) != NUMBER_OF_FAULTLOG_WORDS):
+        raise ValueError("%s holds %d words, a faultlog has %d" % (filename,len(words),NUMBER_OF_FAULTLOG_WORDS))
+    return words
+
+def _render_dump(job):
+    dump,output_dir = job
+    filename = os.path.join(output_dir,os.path.splitext(os.path.basename(dump))[0] + ".html")
+    try:
+        Create_Log_File(filename,load_faultlog_dump(dump))
+    except (IOError,OSError,ValueError) as e:
+        return (dump,None,str(e))
+    return (dump,filename,None)
+
+def parse_faultlog_directory(directory,output_dir=None,jobs=None):
+    """
+    Decodes every dump in directory into an HTML report in output_dir (the
+    directory itself by default) with a pool of jobs processes, one per CPU
+    by default. Returns (dump, report, error) for every dump.
+    """
+    if output_dir is None:
+        output_dir = directory
+    copy_logo(output_dir)
+    dumps = sorted([os.path.join(directory,f) for f in os.listdir(directory) if f.endswith(FAULTLOG_DUMP_SUFFIX)])
+    pool = multiprocessing.Pool(jobs)
+    try:
+        results = pool.map(_render_dump,[(dump,output_dir) for dump in dumps],chunksize=max(1,len(dumps)//(4*(jobs or multiprocessing.cpu_count()))))
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
 """
 Decode a FSW
 """    
@@ -392,73 +323,24 @@ def decode_fsw(fsw_array):
     """
     Parse the array into specific faultgroups
     """
-    faultGroup = [0] * NUM_OF_FAULTGROUPS;
+    faultGroup = [0] * NUM_OF_FAULTGROUPS
     
     faultGroup[FAULTGROUP_TRANSIENT]     = 0
-    faultGroup[FAULTGROUP_CRITICAL]      =  (fsw_array[FSW_CRITICAL_FAULTS_INDEX] & FSW_CRITICAL_FAULTS_MASK) >> FSW_CRITICAL_FAULTS_SHIFT;
-    faultGroup[FAULTGROUP_COMM]          =  (fsw_array[FSW_COMM_FAULTS_INDEX] & FSW_COMM_FAULTS_MASK) >> FSW_COMM_FAULTS_SHIFT;
-    faultGroup[FAULTGROUP_SENSORS]       =  (fsw_array[FSW_SENSORS_FAULTS_INDEX] & FSW_SENSORS_FAULTS_MASK) >> FSW_SENSORS_FAULTS_SHIFT;    
-    faultGroup[FAULTGROUP_IMU]           =  (fsw_array[FSW_IMU_FAULTS_INDEX] & FSW_IMU_FAULTS_MASK) >> FSW_IMU_FAULTS_SHIFT;
-    faultGroup[FAULTGROUP_MD]            =  (fsw_array[FSW_MD_FAULTS_INDEX] & FSW_MD_FAULTS_MASK) >> FSW_MD_FAULTS_SHIFT;
-    faultGroup[FAULTGROUP_ARCHITECTURE]  =  (fsw_array[FSW_ARCH_FAULTS_INDEX] & FSW_ARCH_FAULTS_MASK) >> FSW_ARCH_FAULTS_SHIFT;
-    faultGroup[FAULTGROUP_INTERNAL]      =  (fsw_array[FSW_INTERNAL_FAULTS_INDEX] & FSW_INTERNAL_FAULTS_MASK) >> FSW_INTERNAL_FAULTS_SHIFT;
+    faultGroup[FAULTGROUP_CRITICAL]      =  (fsw_array[FSW_CRITICAL_FAULTS_INDEX] & FSW_CRITICAL_FAULTS_MASK) >> FSW_CRITICAL_FAULTS_SHIFT
+    faultGroup[FAULTGROUP_COMM]          =  (fsw_array[FSW_COMM_FAULTS_INDEX] & FSW_COMM_FAULTS_MASK) >> FSW_COMM_FAULTS_SHIFT
+    faultGroup[FAULTGROUP_SENSORS]       =  (fsw_array[FSW_SENSORS_FAULTS_INDEX] & FSW_SENSORS_FAULTS_MASK) >> FSW_SENSORS_FAULTS_SHIFT
+    faultGroup[FAULTGROUP_IMU]           =  (fsw_array[FSW_IMU_FAULTS_INDEX] & FSW_IMU_FAULTS_MASK) >> FSW_IMU_FAULTS_SHIFT
+    faultGroup[FAULTGROUP_MD]            =  (fsw_array[FSW_MD_FAULTS_INDEX] & FSW_MD_FAULTS_MASK) >> FSW_MD_FAULTS_SHIFT
+    faultGroup[FAULTGROUP_ARCHITECTURE]  =  (fsw_array[FSW_ARCH_FAULTS_INDEX] & FSW_ARCH_FAULTS_MASK) >> FSW_ARCH_FAULTS_SHIFT
+    faultGroup[FAULTGROUP_INTERNAL]      =  (fsw_array[FSW_INTERNAL_FAULTS_INDEX] & FSW_INTERNAL_FAULTS_MASK) >> FSW_INTERNAL_FAULTS_SHIFT
 
     """
-    MCU specific faults get a special category because there is more information
-    """
-    mcu_specific_group = [];
-    mcu_specific_group.append(fsw_array[4]);
-    mcu_specific_group.append(fsw_array[5]);
-    mcu_specific_group.append(fsw_array[6]);
-    mcu_specific_group.append(fsw_array[7]);
-
+    Create a master list of present faults, the names come from the
+    precomputed tables (the transient faults are not in the FSW)
     """
-    Create a master list of present faults then check all the bits in each
-    faultgroup and go to the dictionaries to get the names
-    """
-    faults_present = [];
-
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (faultGroup[FAULTGROUP_CRITICAL] & temp);
-        if (temp):
-            faults_present.append(critical_fault_decode[temp]);
-
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (faultGroup[FAULTGROUP_COMM] & temp);
-        if (temp):
-            faults_present.append(comm_fault_decode[temp]);
-
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (faultGroup[FAULTGROUP_SENSORS] & temp);
-        if (temp):
-            faults_present.append(sensor_fault_decode[temp]);
-
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (faultGroup[FAULTGROUP_IMU] & temp);
-        if (temp):
-            faults_present.append(imu_fault_decode[temp]);
-
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (faultGroup[FAULTGROUP_MD] & temp);
-        if (temp):
-            faults_present.append(md_fault_decode[temp]);
-
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (faultGroup[FAULTGROUP_ARCHITECTURE] & temp);
-        if (temp):
-            faults_present.append(arch_fault_decode[temp]);
-
-    for x in range(0,32):
-        temp = int(math.pow(2,x))
-        temp = (faultGroup[FAULTGROUP_INTERNAL] & temp);
-        if (temp):
-            faults_present.append(internal_fault_decode[temp]);
-
+    faults_present = []
+    for group in range(FAULTGROUP_CRITICAL,NUM_OF_FAULTGROUPS):
+        names = FAULT_BIT_NAMES[group]
+        faults_present.extend([names[x] for x in set_bits(faultGroup[group])])
 
     return faults_present
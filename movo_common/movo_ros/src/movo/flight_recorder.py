@@ -0,0 +1,286 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   flight_recorder.py
+
+ \brief  Columnar flight recorder for the decoded base feedback
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import system_defines
+from system_defines import *
+from frame_decoder import MOVO_RSP_LAYOUT
+import Queue
+import array
+import json
+import os
+import struct
+import threading
+import zlib
+
+"""
+Response types recorded from each feedback frame and the words they cover
+"""
+RECORDER_STREAMS = [('status',START_STATUS_BLOCK,END_STATUS_BLOCK),
+                    ('battery',START_BATTERY_DATA_BLOCK,END_BATTERY_DATA_BLOCK),
+                    ('propulsion',START_PROPULSION_DATA_BLOCK,END_PROPULSION_DATA_BLOCK),
+                    ('imu',START_IMU_DATA_BLOCK,END_IMU_DATA_BLOCK),
+                    ('dynamics',START_DYNAMICS_DATA_BLOCK,END_DYNAMICS_DATA_BLOCK)]
+
+CHUNK_MAGIC     = b'MOVOFR1\n'
+CHUNK_SUFFIX    = '.chunk'
+COLUMN_LENGTH   = struct.Struct('<I')
+
+def frame_field_names(start,end):
+    """
+    Column names come from the ROS_*_INDEX constants of the response words
+    """
+    names = ['word_%d' % i for i in range(start,end)]
+    for name,value in vars(system_defines).items():
+        if name.startswith('ROS_') and isinstance(value,int) and (start <= value < end):
+            names[value-start] = name[4:].replace('_INDEX','').lower()
+    return names
+
+def chunk_name(stream,first_stamp):
+    """
+    Names sort by time within a stream and the stamp sorts across streams
+    """
+    return '%016d-%s%s' % (int(first_stamp*1e6),stream,CHUNK_SUFFIX)
+
+class _StreamBuffer(object):
+    def __init__(self,stream,start,end,chunk_rows):
+        self.stream = stream
+        self.start = start
+        self.end = end
+        self.names = ['stamp'] + frame_field_names(start,end)
+        self.types = 'd' + MOVO_RSP_LAYOUT[start:end]
+        self.chunk_rows = chunk_rows
+        self.reset()
+
+    def reset(self):
+        """
+        Frames are kept row major, every word fits a double exactly, and
+        split into typed columns by the writer thread
+        """
+        self.stamps = array.array('d')
+        self.values = array.array('d')
+        self.rows = 0
+
+    def append(self,rsp_data,stamp):
+        self.stamps.append(stamp)
+        self.values.extend(rsp_data[self.start:self.end])
+        self.rows += 1
+
+class FlightRecorder(object):
+    """
+    Appends the decoded fields of every feedback frame to one column per field
+    and response type. Every chunk_rows frames the columns of a response type
+    are handed to a background thread that compresses each column on its own
+    and writes them as one chunk file, the oldest chunks are removed once the
+    directory holds more than max_bytes. The receive path only appends to
+    arrays and never touches the disk.
+    """
+    def __init__(self,directory,max_bytes=1024*1024*1024,chunk_rows=6000,level=6):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.level = level
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._buffers = [_StreamBuffer(stream,start,end,chunk_rows) for stream,start,end in RECORDER_STREAMS]
+        self._chunks = sorted([f for f in os.listdir(directory) if f.endswith(CHUNK_SUFFIX)])
+        self._bytes = sum([os.path.getsize(os.path.join(directory,f)) for f in self._chunks])
+
+        self._queue = Queue.Queue()
+        self._thread = threading.Thread(target = self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def record(self,rsp_data,stamp):
+        for buf in self._buffers:
+            buf.append(rsp_data,stamp)
+            if (buf.rows >= buf.chunk_rows):
+                self._flush(buf)
+
+    def _flush(self,buf):
+        if (buf.rows > 0):
+            self._queue.put((buf.stream,buf.names,buf.types,buf.stamps,buf.values,buf.rows))
+            buf.reset()
+
+    def Shutdown(self):
+        for buf in self._buffers:
+            self._flush(buf)
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._write_chunk(*item)
+            self._trim()
+
+    def _write_chunk(self,stream,names,types,stamps,values,rows):
+        num_fields = len(names) - 1
+        columns = [stamps]
+        for i in range(num_fields):
+            if ('d' == types[i+1]) or ('f' == types[i+1]):
+                columns.append(array.array(types[i+1],values[i::num_fields]))
+            else:
+                columns.append(array.array(types[i+1],[int(value) for value in values[i::num_fields]]))
+        header = dict({'stream':stream,
+                       'columns':names,
+                       'types':types,
+                       'rows':rows,
+                       'first_stamp':columns[0][0],
+                       'last_stamp':columns[0][-1]})
+        name = chunk_name(stream,columns[0][0])
+        path = os.path.join(self.directory,name)
+        with open(path + '.tmp','wb') as f:
+            f.write(CHUNK_MAGIC)
+            f.write(json.dumps(header).encode() + b'\n')
+            for column in columns:
+                data = zlib.compress(column.tostring(),self.level)
+                f.write(COLUMN_LENGTH.pack(len(data)))
+                f.write(data)
+        os.rename(path + '.tmp',path)
+        self._chunks.append(name)
+        self._bytes += os.path.getsize(path)
+
+    def _trim(self):
+        self._chunks.sort()
+        while (self._bytes > self.max_bytes) and (len(self._chunks) > 1):
+            path = os.path.join(self.directory,self._chunks.pop(0))
+            try:
+                self._bytes -= os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                pass
+
+def read_chunk_header(f):
+    if (f.read(len(CHUNK_MAGIC)) != CHUNK_MAGIC):
+        raise ValueError('%s is not a flight recorder chunk' % f.name)
+    return json.loads(f.readline().decode())
+
+def read_chunk_columns(f,header,fields=None):
+    """
+    Reads the requested columns of a chunk whose header was just read from
+    f, the stamp is always included and only the requested columns are
+    decompressed
+    """
+    wanted = set(['stamp'] + list(fields or header['columns']))
+    columns = dict()
+    for name,typecode in zip(header['columns'],header['types']):
+        length = COLUMN_LENGTH.unpack(f.read(COLUMN_LENGTH.size))[0]
+        if name not in wanted:
+            f.seek(length,os.SEEK_CUR)
+            continue
+        column = array.array(typecode)
+        column.fromstring(zlib.decompress(f.read(length)))
+        columns[name] = column
+    return columns
+
+def read_chunk(path,fields=None):
+    """
+    Returns the header and the requested columns of a chunk
+    """
+    with open(path,'rb') as f:
+        header = read_chunk_header(f)
+        return header,read_chunk_columns(f,header,fields)
+
+class FlightRecorderReader(object):
+    """
+    Extracts time ranges of one response type from a recorder directory
+    """
+    def __init__(self,directory):
+        self.directory = directory
+
+    def chunks(self,stream):
+        suffix = '-%s%s' % (stream,CHUNK_SUFFIX)
+        return sorted([f for f in os.listdir(self.directory) if f.endswith(suffix)])
+
+    def fields(self,stream):
+        chunks = self.chunks(stream)
+        if (0 == len(chunks)):
+            return []
+        with open(os.path.join(self.directory,chunks[0]),'rb') as f:
+            return read_chunk_header(f)['columns']
+
+    def query(self,stream,start=None,end=None,fields=None):
+        """
+        Returns the column names and a list of rows with stamps in [start,end]
+        """
+        names = ['stamp'] + [name for name in (fields or self.fields(stream)) if name != 'stamp']
+        rows = []
+        for name in self.chunks(stream):
+            if (end is not None) and ((int(name.split('-')[0])/1e6) > end):
+                break
+            """
+            The header holds the time range of the chunk, chunks outside
+            the query are skipped before any column is decompressed
+            """
+            with open(os.path.join(self.directory,name),'rb') as f:
+                header = read_chunk_header(f)
+                if ((start is not None) and (header['last_stamp'] < start)) or ((end is not None) and (header['first_stamp'] > end)):
+                    continue
+                columns = read_chunk_columns(f,header,names)
+            selected = [columns[n] for n in names]
+            for i in range(header['rows']):
+                stamp = columns['stamp'][i]
+                if ((start is None) or (stamp >= start)) and ((end is None) or (stamp <= end)):
+                    rows.append([column[i] for column in selected])
+        return names,rows
+
+    def to_csv(self,f,stream,start=None,end=None,fields=None):
+        names,rows = self.query(stream,start,end,fields)
+        f.write(','.join(names) + '\n')
+        for row in rows:
+            f.write(','.join([repr(value) if isinstance(value,float) else str(value) for value in row]) + '\n')
+        return len(rows)
+
+    def to_numpy(self,stream,start=None,end=None,fields=None):
+        """
+        Returns a numpy record array, numpy is only needed for this query
+        """
+        import numpy
+        names,rows = self.query(stream,start,end,fields)
+        return numpy.rec.fromrecords(rows,names=names) if (len(rows) > 0) else None
+
+def create_flight_recorder(options,namespace=''):
+    """
+    options is the ~flight_recorder parameter dictionary, the recorder is
+    disabled unless it names a directory. Robots sharing a process record
+    to a subdirectory named after their namespace.
+    """
+    if not options.get('directory'):
+        return None
+    return FlightRecorder(os.path.join(os.path.expanduser(options['directory']),namespace.strip('/')),
+                          int(options.get('max_mb',1024)*1024*1024),
+                          options.get('chunk_rows',6000))
@@ -0,0 +1,150 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   frame_decoder.py
+
+ \brief  Precompiled decoders for the fixed layout responses sent by the
+         embedded platform
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import struct
+from system_defines import *
+
+"""
+Word types used in the layout tables, every response word is 32-bits wide
+"""
+U32_WORD   = 'I'
+FLOAT_WORD = 'f'
+
+"""
+Words in the MOVO_DATA response that are integers, every other word is an
+IEEE754 32-bit floating point value
+"""
+MOVO_RSP_U32_WORDS = [ROS_FSW_1_INDEX,
+                      ROS_FSW_2_INDEX,
+                      ROS_FSW_3_INDEX,
+                      ROS_FSW_4_INDEX,
+                      ROS_OPERATIONAL_STATE_INDEX,
+                      ROS_DYNAMIC_RESPONSE_INDEX,
+                      ROS_BUILDID_INDEX,
+                      ROS_MACHINE_ID_INDEX,
+                      ROS_BATT_STATUS,
+                      ROS_LF_MOTOR_STATUS_INDEX,
+                      ROS_RF_MOTOR_STATUS_INDEX,
+                      ROS_LR_MOTOR_STATUS_INDEX,
+                      ROS_RR_MOTOR_STATUS_INDEX,
+                      ROS_LIN_MOTOR_STATUS_INDEX,
+                      ROS_IMU_STATUS_INDEX,
+                      ROS_AHRS_FLAGS_INDEX,
+                      ROS_APP_CFG_BITMAP_INDEX,
+                      ROS_APP_ETH_IP_ADDRESS_INDEX,
+                      ROS_APP_ETH_PORT_NUMBER_INDEX,
+                      ROS_APP_ETH_SUBNET_MASK_INDEX,
+                      ROS_APP_ETH_GATEWAY_INDEX,
+                      ROS_FRAM_CFG_BITMAP_INDEX,
+                      ROS_FRAM_ETH_IP_ADDRESS_INDEX,
+                      ROS_FRAM_ETH_PORT_NUMBER_INDEX,
+                      ROS_FRAM_ETH_SUBNET_MASK_INDEX,
+                      ROS_FRAM_ETH_GATEWAY_INDEX]
+
+def make_layout(num_words,u32_words=(),default_type=FLOAT_WORD):
+    """
+    Build the word type string for a response of num_words words
+    """
+    layout = [default_type]*num_words
+    for i in u32_words:
+        layout[i] = U32_WORD
+    return ''.join(layout)
+
+MOVO_RSP_LAYOUT = make_layout(NUMBER_OF_MOVO_RSP_WORDS,MOVO_RSP_U32_WORDS)
+FAULTLOG_LAYOUT = make_layout(NUMBER_OF_FAULTLOG_WORDS,default_type=U32_WORD)
+
+"""
+Pan-tilt actuator responses are a 2 byte header, ten float words per
+actuator (pan then tilt) and the CRC
+"""
+PAN_TILT_RSP_HEADER_BYTES = 2
+PAN_TILT_RSP_LAYOUT = make_layout(20)
+
+class FrameDecoder(object):
+    """
+    Decodes a response frame into typed fields with a single unpack call. The
+    struct is compiled once when the decoder is created so the per-frame cost
+    is one call into the struct module regardless of the number of words.
+    Byte order is native to match the array('I') conversion used previously.
+    """
+    def __init__(self,layout,offset=0):
+        self.layout = layout
+        self.num_words = len(layout)
+        self.offset = offset
+        self._typed = struct.Struct('=' + layout)
+        self._blocks = dict()
+
+    def unpack(self,data_bytes):
+        """
+        Returns a tuple with one typed value per word in the layout
+        """
+        return self._typed.unpack_from(data_bytes,self.offset)
+
+    def unpack_word(self,data_bytes,index):
+        """
+        Returns one typed word without decoding the rest of the frame
+        """
+        try:
+            word = self._blocks[index]
+        except KeyError:
+            word = struct.Struct('=' + self.layout[index])
+            self._blocks[index] = word
+        return word.unpack_from(data_bytes,self.offset + 4*index)[0]
+
+    def unpack_block(self,data_bytes,start,end):
+        """
+        Returns the raw 32-bit words in [start,end), used where the integer
+        representation of a float is needed (eg. comparing configurations)
+        """
+        try:
+            block = self._blocks[(start,end)]
+        except KeyError:
+            block = struct.Struct('=%dI' % (end-start))
+            self._blocks[(start,end)] = block
+        return block.unpack_from(data_bytes,self.offset + 4*start)
+
+_decoders = dict()
+
+def get_frame_decoder(layout,offset=0):
+    """
+    Returns a decoder for the layout shared by every driver in the process,
+    decoders hold no per-frame state so one compiled struct serves them all
+    """
+    key = (layout,offset)
+    decoder = _decoders.get(key)
+    if decoder is None:
+        decoder = _decoders.setdefault(key,FrameDecoder(layout,offset))
+    return decoder
@@ -0,0 +1,113 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   frame_sequencer.py
+
+ \brief  Orders the base feedback frames by the operational time of the platform
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import math
+
+def float32_resolution(value):
+    """
+    Distance between value and the next float32, the operational time is
+    sent as a float32 so its resolution drops as the uptime grows
+    """
+    if (0.0 == value):
+        return 0.0
+    return math.ldexp(1.0,math.frexp(abs(value))[1] - 24)
+
+class FrameSequencer(object):
+    """
+    The platform stamps every feedback frame with its operational time in
+    seconds. Frames that are not newer than the last accepted one are
+    duplicates or arrived out of order and are dropped before they are
+    parsed, so odometry and status never step backwards. A step of more than
+    gap_periods stream periods is a gap and the frames it spans are counted
+    as lost. Both allow for the float32 quantisation of the two times, so
+    only steps that are gaps whatever the rounding count, and lost_frames is
+    the number of frames that were certainly missed. A step back of more
+    than reset_sec means the platform restarted and the sequence starts over.
+
+    Once the uptime is long enough that a float32 no longer resolves half a
+    period, equal times can not tell a duplicate from the next frame, those
+    frames are accepted and only older ones are dropped.
+    """
+    def __init__(self,period_sec=0.01,gap_periods=1.5,reset_sec=5.0):
+        if not (period_sec > 0.0):
+            raise ValueError("the stream period must be positive, got %s" % period_sec)
+        self.period_sec = period_sec
+        self.gap_periods = gap_periods
+        self.reset_sec = reset_sec
+        self.accepted = 0
+        self.duplicates = 0
+        self.out_of_order = 0
+        self.gaps = 0
+        self.lost_frames = 0
+        self.resets = 0
+        self._last = None
+
+    def restart(self):
+        """
+        The next frame starts a new sequence, used when the stream is restarted
+        """
+        self._last = None
+
+    def accept(self,op_time):
+        last = self._last
+        if last is not None:
+            dt = op_time - last
+            if (dt < -self.reset_sec):
+                self.resets += 1
+            elif (dt < 0.0):
+                self.out_of_order += 1
+                return False
+            elif (0.0 == dt):
+                if (float32_resolution(op_time) < 0.5*self.period_sec):
+                    self.duplicates += 1
+                    return False
+            else:
+                quantisation = 2*float32_resolution(op_time)
+                if (dt > (self.gap_periods*self.period_sec + quantisation)):
+                    self.gaps += 1
+                    self.lost_frames += int(round((dt - quantisation)/self.period_sec)) - 1
+        self._last = op_time
+        self.accepted += 1
+        return True
+
+    def counters(self):
+        """
+        Error counters reported with the link diagnostics
+        """
+        return [('duplicate_frames',self.duplicates),
+                ('out_of_order_frames',self.out_of_order),
+                ('sequence_gaps',self.gaps),
+                ('lost_frames',self.lost_frames),
+                ('platform_resets',self.resets)]
@@ -38,13 +38,76 @@ import socket
 import threading
 import os
 import array
+import multiprocessing
+from ring_queue import RingQueue,RING_POLICIES
+from io_reactor import IoReactorLink,get_io_reactor
+from batch_recv import BatchReceiver
+from packet_capture import get_packet_capture,DIR_TX,DIR_RX
+
+def create_io_queue(max_packet_size=1500,options=dict(),stamped=False):
+    """
+    Create a transmit or receive queue for an IoEthThread. The transport is
+    selected with the 'transport' key of the ~io parameter dictionary:
+        queue: multiprocessing.Queue (default)
+        ring:  in-process RingQueue with 'ring_slots' slots of max_packet_size
+               bytes, 'ring_policy' is overwrite_oldest (default) or drop_newest
+    A stamped queue carries (datagram, stamp) pairs, see rx_stamped.
+    """
+    if ('ring' == options.get('transport','queue')):
+        return RingQueue(max_packet_size,
+                         options.get('ring_slots',64),
+                         RING_POLICIES[options.get('ring_policy','overwrite_oldest')],
+                         stamped)
+    return multiprocessing.Queue()
+
+def rx_stamped(options):
+    """
+    With the 'rx_timestamps' key of the ~io parameter dictionary set, the
+    receive path captures the kernel receive time of every datagram. Items
+    on the receive queue are then (datagram, stamp) pairs and rx_callback is
+    called with the stamp as a second argument, the stamp is in seconds.
+    """
+    return options.get('rx_timestamps',False)
+
+def create_io_link(remote_address,tx_queue,rx_queue,max_packet_size=1500,options=dict(),rx_callback=None):
+    """
+    Create the UDP link for an endpoint. With the 'reactor' key of the ~io
+    parameter dictionary set, the link is serviced by the IoReactor shared by
+    the whole process and received frames are passed to rx_callback (or put on
+    rx_queue when there is none). Otherwise an IoEthThread with its own listen
+    and transmit threads is created and frames always go to rx_queue.
+
+    The 'local_ip' key selects the local address the link binds to, by
+    default it is every interface. Binding a loopback alias such as 127.0.0.2
+    lets the driver run against the platform simulator on the same host.
+
+    The 'capture' key names a file every datagram sent and received on the
+    link is recorded to, see packet_capture.py. Links with the same file
+    share one capture.
+    """
+    capture = None
+    if options.get('capture'):
+        capture = get_packet_capture(options['capture'])
+    if options.get('reactor',False):
+        return IoReactorLink(get_io_reactor(),
+                             remote_address,
+                             tx_queue,
+                             rx_queue,
+                             max_packet_size,
+                             rx_callback,
+                             rx_stamped(options),
+                             options.get('local_ip',''),
+                             capture)
+    return IoEthThread(remote_address,tx_queue,rx_queue,max_packet_size,rx_stamped(options),options.get('local_ip',''),capture)
 
 class IoEthThread(object):
-    def __init__(self,remote_address,tx_queue,rx_queue,max_packet_size=1500):
+    def __init__(self,remote_address,tx_queue,rx_queue,max_packet_size=1500,rx_timestamps=False,local_ip='',capture=None):
         self.tx_queue = tx_queue
         self.rx_queue = rx_queue
         self.max_packet_size = max_packet_size
         self.remote_address = remote_address
+        self.rx_timestamps = rx_timestamps
+        self.capture = capture
  
         """
         Initialize the UDP connection
@@ -53,8 +116,9 @@ class IoEthThread(object):
             self.conn = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.conn.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
             self.conn.setblocking(0)
-            self.conn.bind(('',self.remote_address[1]))
+            self.conn.bind((local_ip,self.remote_address[1]))
             self.conn.connect(self.remote_address)
+            self.receiver = BatchReceiver(self.conn,self.max_packet_size,timestamps=self.rx_timestamps)
         except:
             try:
                 self.conn.close()
@@ -92,9 +156,13 @@ class IoEthThread(object):
                     break
             result = select.select([self.conn],[],[],1.0)
             if (len(result[0])>0):
-                message = result[0][0].recv(self.max_packet_size)
-                message_bytes= array.array('B',message)
-                self.rx_queue.put(message_bytes)
+                for message in self.receiver.recv_batch():
+                    if self.capture is not None:
+                        self.capture.record(DIR_RX,self.remote_address,message[0],message[1])
+                    if self.rx_timestamps:
+                        self.rx_queue.put(message)
+                    else:
+                        self.rx_queue.put(message[0])
             
     def transmit(self):
         while True:
@@ -104,5 +172,7 @@ class IoEthThread(object):
             result = select.select([self.tx_queue._reader],[],[],1.0)
             if (len(result[0])>0):
                 data = result[0][0].recv()
+                if self.capture is not None:
+                    self.capture.record(DIR_TX,self.remote_address,data)
                 self.conn.sendall(data.tostring())
         
@@ -0,0 +1,230 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   io_reactor.py
+
+ \brief  Single threaded epoll reactor servicing the UDP links of every
+         endpoint in the process
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from batch_recv import BatchReceiver
+from packet_capture import DIR_TX,DIR_RX
+import collections
+import errno
+import os
+import select
+import socket
+import threading
+import traceback
+
+class IoReactor(object):
+    """
+    Owns one epoll set and one thread. Handlers are registered per file
+    descriptor and are called from the reactor thread with the epoll event mask,
+    the thread only wakes up when a descriptor is ready.
+    """
+    def __init__(self):
+        self._epoll = select.epoll()
+        self._handlers = dict()
+        self._wake_r,self._wake_w = os.pipe()
+        self._epoll.register(self._wake_r,select.EPOLLIN)
+        self.need_to_terminate = False
+        self._thread = threading.Thread(target = self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def register(self,fd,events,handler):
+        self._handlers[fd] = handler
+        self._epoll.register(fd,events)
+
+    def modify(self,fd,events):
+        self._epoll.modify(fd,events)
+
+    def unregister(self,fd):
+        self._handlers.pop(fd,None)
+        try:
+            self._epoll.unregister(fd)
+        except (IOError,OSError,ValueError):
+            pass
+
+    def Shutdown(self):
+        self.need_to_terminate = True
+        os.write(self._wake_w,b'\x00')
+        if (threading.current_thread() is not self._thread):
+            self._thread.join()
+        self._epoll.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def _run(self):
+        while not self.need_to_terminate:
+            try:
+                events = self._epoll.poll()
+            except (IOError,OSError) as e:
+                if (e.errno == errno.EINTR):
+                    continue
+                raise
+
+            for fd,mask in events:
+                handler = self._handlers.get(fd)
+                if handler is None:
+                    continue
+                try:
+                    handler(mask)
+                except Exception:
+                    """
+                    One misbehaving endpoint must not take the others down
+                    """
+                    traceback.print_exc()
+
+_reactor = None
+_reactor_mutex = threading.Lock()
+
+def get_io_reactor():
+    """
+    Returns the reactor shared by every link in the process, it is started
+    the first time it is requested
+    """
+    global _reactor
+    with _reactor_mutex:
+        if _reactor is None:
+            _reactor = IoReactor()
+        return _reactor
+
+class IoReactorLink(object):
+    """
+    Drop in replacement for IoEthThread that is serviced by an IoReactor. The
+    transmit queue reader is registered with the reactor so frames are sent
+    as soon as they are queued, frames that do not fit in the socket buffer
+    are kept until the socket is writable. Received frames are passed to
+    rx_callback from the reactor thread when one is given, otherwise they are
+    put on rx_queue exactly like IoEthThread does.
+    """
+    def __init__(self,reactor,remote_address,tx_queue,rx_queue,max_packet_size=1500,rx_callback=None,rx_timestamps=False,local_ip='',capture=None):
+        self.reactor = reactor
+        self.tx_queue = tx_queue
+        self.rx_queue = rx_queue
+        self.max_packet_size = max_packet_size
+        self.remote_address = remote_address
+        self.rx_callback = rx_callback
+        self.rx_timestamps = rx_timestamps
+        self.capture = capture
+        self._pending = collections.deque()
+
+        """
+        Initialize the UDP connection
+        """
+        try:
+            self.conn = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.conn.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            self.conn.setblocking(0)
+            self.conn.bind((local_ip,self.remote_address[1]))
+            self.conn.connect(self.remote_address)
+            self.receiver = BatchReceiver(self.conn,self.max_packet_size,timestamps=self.rx_timestamps)
+        except:
+            try:
+                self.conn.close()
+            except:
+                pass
+            self.link_up = False
+            return
+
+        self._conn_fd = self.conn.fileno()
+        self._tx_fd = self.tx_queue._reader.fileno()
+        self.reactor.register(self._conn_fd,select.EPOLLIN,self._on_socket)
+        self.reactor.register(self._tx_fd,select.EPOLLIN,self._on_tx_queue)
+        self.link_up = True
+
+    def Close(self):
+        if self.link_up:
+            self.reactor.unregister(self._tx_fd)
+            self.reactor.unregister(self._conn_fd)
+            self.conn.close()
+        self.link_up = False
+        self.tx_queue.close()
+        self.rx_queue.close()
+
+    def _on_socket(self,mask):
+        if (mask & (select.EPOLLERR | select.EPOLLHUP)):
+            self._clear_error()
+        if (mask & select.EPOLLIN):
+            self._receive()
+        if (mask & select.EPOLLOUT):
+            self._flush()
+
+    def _clear_error(self):
+        """
+        An ICMP error (port unreachable while the platform is down or
+        rebooting) stays pending on the socket and epoll reports it on every
+        poll until it is read
+        """
+        self.conn.getsockopt(socket.SOL_SOCKET,socket.SO_ERROR)
+
+    def _receive(self):
+        """
+        Drain every datagram that is ready, the socket is non-blocking
+        """
+        for message in self.receiver.recv_batch():
+            if self.capture is not None:
+                self.capture.record(DIR_RX,self.remote_address,message[0],message[1])
+            if self.rx_callback is not None:
+                if self.rx_timestamps:
+                    self.rx_callback(message[0],message[1])
+                else:
+                    self.rx_callback(message[0])
+            elif self.rx_timestamps:
+                self.rx_queue.put(message)
+            else:
+                self.rx_queue.put(message[0])
+
+    def _on_tx_queue(self,mask):
+        data = self.tx_queue._reader.recv()
+        if self.capture is not None:
+            self.capture.record(DIR_TX,self.remote_address,data)
+        if (len(self._pending) > 0) or (False == self._send(data)):
+            self._pending.append(data)
+            self.reactor.modify(self._conn_fd,select.EPOLLIN | select.EPOLLOUT)
+
+    def _send(self,data):
+        try:
+            self.conn.send(data)
+        except socket.error as e:
+            if (e.errno in [errno.EAGAIN,errno.EWOULDBLOCK]):
+                return False
+            if (e.errno != errno.ECONNREFUSED):
+                raise
+        return True
+
+    def _flush(self):
+        while (len(self._pending) > 0):
+            if (False == self._send(self._pending[0])):
+                return
+            self._pending.popleft()
+        self.reactor.modify(self._conn_fd,select.EPOLLIN)
@@ -0,0 +1,276 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   link_monitor.py
+
+ \brief  Link health monitoring and diagnostics for the embedded UDP links
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from diagnostic_msgs.msg import DiagnosticArray,DiagnosticStatus,KeyValue
+import collections
+import threading
+import rospy
+import time
+
+"""
+Upper edges of the inter-arrival jitter histogram in milliseconds, the
+last bin counts everything above the largest edge
+"""
+JITTER_BIN_EDGES_MS = [0.5,1.0,2.0,5.0,10.0,20.0,50.0]
+
+"""
+Default warning thresholds, rates are a fraction of the expected rate
+"""
+DEFAULT_LINK_THRESHOLDS = dict({'min_rate_ratio':0.9,
+                                'max_jitter_ms':5.0,
+                                'max_latency_ms':50.0,
+                                'max_queue_depth':10})
+
+class LinkMonitor(object):
+    """
+    Tracks the health of one UDP endpoint: a sliding window receive rate,
+    a histogram of the deviation of the inter-arrival time from the expected
+    period, invalid frames, the depth and drop counters of the queues and
+    the latency of requests that have a matching response.
+
+    The receive handler calls frame_received and invalid_frame, requests
+    and responses are paired with request_sent and response_received. On
+    the streaming links a command has no reply of its own, it is paired
+    with the next feedback frame, a later command replaces a pending one.
+    Objects added with add_counters report more error counters through a
+    counters() method returning (name, count) pairs, any increase is a
+    warning.
+    """
+    def __init__(self,name,hardware_id='',expected_rate_hz=0.0,window_sec=1.0,queues=dict(),thresholds=dict()):
+        self.name = name
+        self.hardware_id = hardware_id
+        self.expected_rate_hz = expected_rate_hz
+        self.window_sec = window_sec
+        self.queues = queues
+        self.thresholds = dict(DEFAULT_LINK_THRESHOLDS)
+        self.thresholds.update(thresholds)
+
+        self.frames = 0
+        self.invalid_frames = 0
+        self.jitter_histogram = [0]*(len(JITTER_BIN_EDGES_MS)+1)
+        self.max_jitter_ms = 0.0
+        self.last_latency_ms = None
+        self.max_latency_ms = 0.0
+        self._arrivals = collections.deque()
+        self._last_arrival = None
+        self._requests = dict()
+        self._reported = dict()
+        self._counter_sources = []
+        self._mutex = threading.Lock()
+
+    def frame_received(self,stamp=None):
+        """
+        stamp is the receive time in seconds, the kernel timestamp when the
+        link captures it
+        """
+        if stamp is None:
+            stamp = time.time()
+        with self._mutex:
+            self.frames += 1
+            self._arrivals.append(stamp)
+            if (self.expected_rate_hz > 0.0) and (self._last_arrival is not None):
+                jitter_ms = abs((stamp - self._last_arrival) - 1.0/self.expected_rate_hz)*1000.0
+                self.max_jitter_ms = max(self.max_jitter_ms,jitter_ms)
+                i = 0
+                while (i < len(JITTER_BIN_EDGES_MS)) and (jitter_ms > JITTER_BIN_EDGES_MS[i]):
+                    i += 1
+                self.jitter_histogram[i] += 1
+            self._last_arrival = stamp
+
+    def add_counters(self,source):
+        self._counter_sources.append(source)
+
+    def invalid_frame(self):
+        with self._mutex:
+            self.invalid_frames += 1
+
+    def request_sent(self,key):
+        self._requests[key] = time.time()
+
+    def response_received(self,key,stamp=None):
+        sent = self._requests.pop(key,None)
+        if sent is None:
+            return
+        if stamp is None:
+            stamp = time.time()
+        latency_ms = (stamp - sent)*1000.0
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms,latency_ms)
+
+    def rate(self,now=None):
+        if now is None:
+            now = time.time()
+        with self._mutex:
+            while (len(self._arrivals) > 0) and ((now - self._arrivals[0]) > self.window_sec):
+                self._arrivals.popleft()
+            return len(self._arrivals)/self.window_sec
+
+    def _increase(self,key,value):
+        """
+        Returns how much a counter grew since the last report
+        """
+        increase = value - self._reported.get(key,0)
+        self._reported[key] = value
+        return increase
+
+    def status(self):
+        """
+        Builds the DiagnosticStatus of the link and resets the maxima
+        """
+        now = time.time()
+        rate = self.rate(now)
+        with self._mutex:
+            histogram = list(self.jitter_histogram)
+            max_jitter_ms = self.max_jitter_ms
+            self.max_jitter_ms = 0.0
+        max_latency_ms = self.max_latency_ms
+        self.max_latency_ms = 0.0
+
+        level = DiagnosticStatus.OK
+        warnings = []
+        values = [KeyValue('frames',str(self.frames)),
+                  KeyValue('rate_hz','%.1f' % rate),
+                  KeyValue('invalid_frames',str(self.invalid_frames))]
+
+        if (self.expected_rate_hz > 0.0):
+            values.append(KeyValue('expected_rate_hz','%.1f' % self.expected_rate_hz))
+            values.append(KeyValue('max_jitter_ms','%.3f' % max_jitter_ms))
+            edges = ['<=%gms' % edge for edge in JITTER_BIN_EDGES_MS] + ['>%gms' % JITTER_BIN_EDGES_MS[-1]]
+            for edge,count in zip(edges,histogram):
+                values.append(KeyValue('jitter %s' % edge,str(count)))
+            if (0 == rate):
+                level = DiagnosticStatus.ERROR
+                warnings.append('no data')
+            elif (rate < self.thresholds['min_rate_ratio']*self.expected_rate_hz):
+                warnings.append('low rate')
+            if (max_jitter_ms > self.thresholds['max_jitter_ms']):
+                warnings.append('high jitter')
+
+        if (self._increase('invalid_frames',self.invalid_frames) > 0):
+            warnings.append('invalid frames')
+
+        for source in self._counter_sources:
+            for name,count in source.counters():
+                values.append(KeyValue(name,str(count)))
+                if (self._increase(name,count) > 0):
+                    warnings.append(name.replace('_',' '))
+
+        if self.last_latency_ms is not None:
+            values.append(KeyValue('last_latency_ms','%.3f' % self.last_latency_ms))
+            values.append(KeyValue('max_latency_ms','%.3f' % max_latency_ms))
+            if (max_latency_ms > self.thresholds['max_latency_ms']):
+                warnings.append('high latency')
+
+        for name,queue in self.queues.items():
+            try:
+                depth = queue.qsize()
+            except (NotImplementedError,OSError,IOError):
+                continue
+            values.append(KeyValue('%s_queue_depth' % name,str(depth)))
+            if (depth > self.thresholds['max_queue_depth']):
+                warnings.append('%s queue backlog' % name)
+            drops = getattr(queue,'dropped',0) + getattr(queue,'overwritten',0)
+            values.append(KeyValue('%s_queue_drops' % name,str(drops)))
+            if (self._increase('%s_drops' % name,drops) > 0):
+                warnings.append('%s queue drops' % name)
+
+        if (len(warnings) > 0) and (DiagnosticStatus.OK == level):
+            level = DiagnosticStatus.WARN
+
+        msg = DiagnosticStatus()
+        msg.level = level
+        msg.name = self.name
+        msg.hardware_id = self.hardware_id
+        msg.message = ', '.join(warnings) if (len(warnings) > 0) else 'OK'
+        msg.values = values
+        return msg
+
+class LinkDiagnostics(object):
+    """
+    Publishes the status of every registered link on /diagnostics
+    """
+    def __init__(self,rate_hz=1.0):
+        self._monitors = []
+        self._mutex = threading.Lock()
+        self._pub = rospy.Publisher('/diagnostics', DiagnosticArray, queue_size=10)
+        self._timer = rospy.Timer(rospy.Duration(1.0/rate_hz),self._publish)
+
+    def register(self,monitor):
+        with self._mutex:
+            self._monitors.append(monitor)
+
+    def unregister(self,monitor):
+        with self._mutex:
+            if monitor in self._monitors:
+                self._monitors.remove(monitor)
+
+    def _publish(self,event):
+        with self._mutex:
+            monitors = list(self._monitors)
+        if (0 == len(monitors)):
+            return
+        msg = DiagnosticArray()
+        msg.header.stamp = rospy.get_rostime()
+        msg.status = [monitor.status() for monitor in monitors]
+        self._pub.publish(msg)
+
+_diagnostics = None
+_diagnostics_mutex = threading.Lock()
+
+def get_link_diagnostics():
+    """
+    Returns the diagnostics publisher shared by every link in the process,
+    the rate is read from ~link_monitor/publish_rate_hz
+    """
+    global _diagnostics
+    with _diagnostics_mutex:
+        if _diagnostics is None:
+            _diagnostics = LinkDiagnostics(rospy.get_param('~link_monitor/publish_rate_hz',1.0))
+        return _diagnostics
+
+def create_link_monitor(name,remote_address,expected_rate_hz=0.0,queues=dict()):
+    """
+    Creates a monitor for an endpoint and registers it for publishing, the
+    window and thresholds are read from the ~link_monitor parameters
+    """
+    options = rospy.get_param('~link_monitor',dict())
+    monitor = LinkMonitor('%s link' % name,
+                          '%s:%d' % (remote_address[0],remote_address[1]),
+                          expected_rate_hz,
+                          options.get('window_sec',1.0),
+                          queues,
+                          options.get('thresholds',dict()))
+    get_link_diagnostics().register(monitor)
+    return monitor
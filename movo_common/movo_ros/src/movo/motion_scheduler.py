@@ -0,0 +1,113 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   motion_scheduler.py
+
+ \brief  Fixed rate scheduler that coalesces base motion commands
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from system_defines import *
+from cmd_templates import CommandTemplate
+import threading
+import rospy
+
+class MotionCommandScheduler(object):
+    """
+    Keeps only the latest setpoint of every source publishing motion commands
+    and sends the one with the highest priority once per control period. The
+    command latency is bounded by one period regardless of how fast the
+    sources publish and nothing accumulates in the transmit queue.
+
+    Priorities map the caller ID of a source node to an integer, sources that
+    are not listed have priority 0 and the most recent setpoint wins a tie.
+    Sources that have not published for source_timeout seconds are dropped so
+    the base stops receiving commands (and times out on its own) exactly as it
+    would without the scheduler.
+
+    sent_callback is called with no arguments after each frame is queued,
+    the link monitor uses it to time the command stream.
+    """
+    def __init__(self,tx_queue,rate_hz=100.0,source_timeout=0.2,priorities=dict(),sent_callback=None):
+        self._tx_queue = tx_queue
+        self._sent_callback = sent_callback
+        self._source_timeout = source_timeout
+        self._priorities = priorities
+        self._setpoints = dict()
+        self._mutex = threading.Lock()
+
+        """
+        The frame is preallocated with the command ID, only the words that
+        change and the CRC are rewritten for each period
+        """
+        self._cmd = CommandTemplate(MOTION_CMD_ID)
+        self._last_cmd = [None]*self._cmd.num_words
+
+        self._timer = rospy.Timer(rospy.Duration(1.0/rate_hz),self._tick)
+
+    def Shutdown(self):
+        self._timer.shutdown()
+
+    def update(self,source,x_vel,y_vel,yaw_rate):
+        with self._mutex:
+            self._setpoints[source] = (self._priorities.get(source,0),
+                                       rospy.get_time(),
+                                       (x_vel,y_vel,yaw_rate))
+
+    def _select_setpoint(self):
+        now = rospy.get_time()
+        selected = None
+        with self._mutex:
+            for source in list(self._setpoints.keys()):
+                setpoint = self._setpoints[source]
+                if ((now - setpoint[1]) > self._source_timeout):
+                    del self._setpoints[source]
+                elif (selected is None) or (setpoint[:2] > selected[:2]):
+                    selected = setpoint
+        return selected
+
+    def _tick(self,event):
+        setpoint = self._select_setpoint()
+        if setpoint is None:
+            return
+
+        changed = False
+        for i in range(self._cmd.num_words):
+            value = setpoint[2][i]
+            if (value != self._last_cmd[i]):
+                self._cmd.set_float(i,value)
+                self._last_cmd[i] = value
+                changed = True
+
+        if changed:
+            self._cmd.update_crc()
+
+        self._cmd.put(self._tx_queue)
+        if self._sent_callback is not None:
+            self._sent_callback()
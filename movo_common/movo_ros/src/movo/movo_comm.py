@@ -39,17 +39,26 @@ from movo_msgs.msg import *
 from geometry_msgs.msg import Twist
 from movo_ros.cfg import movoConfig
 from dynamic_reconfigure.server import Server
-from dynamic_reconfigure.client import Client
 from dynamic_reconfigure.msg import Config
-from io_eth import IoEthThread
+from io_eth import create_io_queue,create_io_link,rx_stamped
 from movo_data_classes import MOVO_DATA
+from frame_decoder import get_frame_decoder,MOVO_RSP_LAYOUT,FAULTLOG_LAYOUT
 from movo_linear_actuator import LinearActuator
+from motion_scheduler import MotionCommandScheduler
+from startup_sequence import StartupSequence,StartupStep
+from reconfig_manager import ReconfigurationManager
+from flight_recorder import create_flight_recorder
+from fault_store import ingest_faultlog
+from frame_sequencer import FrameSequencer
+from link_monitor import create_link_monitor,get_link_diagnostics
+from std_msgs.msg import String
 import multiprocessing
 import rospy
 import select
 import threading
 import re
 import os
+import time
 """
 Dictionary for all MOVO configuration command ID's
 """
@@ -62,17 +71,36 @@ command_ids = dict({"GENERAL_PURPOSE_CMD_NONE":                   0,
                     "GENERAL_PURPOSE_CMD_SET_YAW_CORRECTION"     :7,
                     "SIC_CMD_RESET_IN_DIAGNOSTIC_MODE":1001})
 
-class MovoDriver:
-    def __init__(self,movo_ip='10.66.171.5'):
+def parse_movo_feedback(movo_data,rsp_decoder,data_bytes,rx_stamp=None):
+    """
+    Decode the whole frame at once, the parsers receive typed fields and
+    publish the feedback. Shared by the driver and the capture replay,
+    returns the decoded words and the stamp of the frame.
+    """
+    rsp_data = rsp_decoder.unpack(data_bytes)
+    config_words = rsp_decoder.unpack_block(data_bytes,START_FRAM_CONFIG_BLOCK,END_FRAM_CONFIG_BLOCK)
+    
+    header_stamp = movo_data.status.parse(rsp_data[START_STATUS_BLOCK:END_STATUS_BLOCK],rx_stamp)
+    wheel_circum = movo_data.config_param.parse(rsp_data[START_APP_CONFIG_BLOCK:END_FRAM_CONFIG_BLOCK],header_stamp,config_words)
+    movo_data.auxiliary_power.parse(rsp_data[START_BATTERY_DATA_BLOCK:END_BATTERY_DATA_BLOCK],header_stamp)
+    movo_data.propulsion.parse(rsp_data[START_PROPULSION_DATA_BLOCK:END_PROPULSION_DATA_BLOCK],header_stamp)
+    movo_data.dynamics.parse(rsp_data[START_DYNAMICS_DATA_BLOCK:END_DYNAMICS_DATA_BLOCK],header_stamp,wheel_circum)            
+    movo_data.imu.parse_data(rsp_data[START_IMU_DATA_BLOCK:END_IMU_DATA_BLOCK],header_stamp)
+    return rsp_data,header_stamp
 
+class MovoDriver:
+    def __init__(self,movo_ip='10.66.171.5',namespace='',io_options=None,rx_dispatch=None):
         """
-        Variables to track communication frequency for debugging
+        The namespace prefixes the topics and TF frames so several drivers can
+        share one process, see movo_fleet.py. io_options replaces the ~io
+        parameter and rx_dispatch wraps the receive callback when frames are
+        handed off from the I/O reactor to another thread.
         """
-        self.summer=0
-        self.samp = 0
-        self.avg_freq = 0.0
-        self.start_frequency_samp = False
+        self.namespace = namespace
+        self.init_success = False
+
         self.need_to_terminate = False
+        self.terminate_mutex = threading.RLock()
         self.flush_rcvd_data=True
         self.update_base_local_planner = False
         self.last_move_base_update = rospy.get_time()
@@ -80,133 +108,186 @@ class MovoDriver:
         """
         Initialize the publishers for MOVO
         """
-        self.movo_data = MOVO_DATA()
+        self.movo_data = MOVO_DATA(namespace)
+        
+        """
+        Decoders for the response frames, compiled once and shared by every driver
+        """
+        self._rsp_decoder = get_frame_decoder(MOVO_RSP_LAYOUT)
+        self._faultlog_decoder = get_frame_decoder(FAULTLOG_LAYOUT)
+
+        """
+        Optionally keep the decoded feedback in the flight recorder
+        """
+        self._recorder = create_flight_recorder(rospy.get_param('~flight_recorder',dict()),namespace)
         
         """
-        Start the thread for the linear actuator commands
+        Start the thread for the linear actuator commands, unless ~linear_actuator
+        is false because another process (movo_jtas_host) owns that link
         """
-        self._linear = LinearActuator(movo_ip)
-        if (False == self._linear.init_success):
-            rospy.logerr("Could not initialize the linear actuator interface! exiting...")
-            return    
+        if io_options is None:
+            io_options = rospy.get_param('~io',dict())
+        self._linear = None
+        if rospy.get_param('~linear_actuator',True):
+            self._linear = LinearActuator(movo_ip,namespace,io_options)
+            if (False == self._linear.init_success):
+                rospy.logerr("Could not initialize the linear actuator interface! exiting...")
+                return    
         
         """
         Initialize faultlog related items
         """
         self.is_init = True
         self.extracting_faultlog = False
+        self._last_frame_time = 0.0
+        self._fault_store = rospy.get_param('~fault_store',None)
         
         """
-        Initialize the dynamic reconfigure server for MOVO
+        The startup handshake, every step moves on as soon as the platform
+        answers and the driver state is published latched. The faultlog is
+        resent no faster than the platform can transfer it (the original
+        driver polled it at 2 Hz), a resend during the transfer would only
+        queue a second copy.
         """
-        self.param_server_initialized = False
-        self.dyn_reconfigure_srv = Server(movoConfig, self._dyn_reconfig_callback)
+        self.driver_state_pub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/driver_state'), String, queue_size=1, latch=True)
+        self._startup = StartupSequence([StartupStep('waiting_for_parameters',None,self._params_received),
+                                         StartupStep('stopping_stream',self._stop_stream,self._stream_quiet,start=self._start_stop_stream),
+                                         StartupStep('extracting_faultlog',self._request_faultlog,self._faultlog_received,start=self._start_faultlog,initial_backoff=0.5,max_backoff=1.0),
+                                         StartupStep('starting_stream',self._start_stream,self._stream_started,start=self._start_stream_step),
+                                         StartupStep('loading_configuration',self._load_config,self._config_loaded,initial_backoff=0.1,max_backoff=0.5)],
+                                        self._publish_driver_state)
+        
+        """
+        Runtime reconfiguration is pushed to the platform and the local planner
+        from its own thread so the reconfigure callback never waits
+        """
+        self._reconfig = ReconfigurationManager(self._add_command_to_queue,
+                                                self._machine_config_feedback,
+                                                namespace_name(namespace,"/move_base/DWAPlannerROS"))
 
         """
-        Wait for the parameter server to set the configs and then set the IP address from that.
-        Note that this must be the current ethernet settings of the platform. If you want to change it
-        set the ethernet settings at launch to the current ethernet settings, power up, change them, power down, set the
-        the ethernet settings at launch to the new ones and relaunch
+        Initialize the dynamic reconfigure server for MOVO
         """
-        r = rospy.Rate(10)
-        start_time = rospy.Time.now().to_sec()
-        while ((rospy.Time.now().to_sec() - start_time) < 3.0) and (False == self.param_server_initialized):
-            r.sleep()
-        
-        if (False == self.param_server_initialized):
-            rospy.logerr("Parameter server not found, you must pass an initial yaml in the launch! exiting...")
-            return            
-        
+        self.param_server_initialized = False
+        if namespace:
+            self.dyn_reconfigure_srv = Server(movoConfig, self._dyn_reconfig_callback, namespace='~' + namespace.strip('/'))
+        else:
+            self.dyn_reconfigure_srv = Server(movoConfig, self._dyn_reconfig_callback)
+
         """
         Create the thread to run MOVO communication
         """
-        self.tx_queue_ = multiprocessing.Queue()
-        self.rx_queue_ = multiprocessing.Queue()
-        self.comm = IoEthThread((movo_ip, 8080),
-                                self.tx_queue_,
-                                self.rx_queue_,
-                                max_packet_size=1248)
+        self._rx_dispatch = io_options.get('reactor',False)
+        self._rx_stamped = rx_stamped(io_options)
+        self.tx_queue_ = create_io_queue(1248,io_options)
+        self.rx_queue_ = create_io_queue(1248,io_options,self._rx_stamped)
+        self.comm = create_io_link((movo_ip, 8080),
+                                   self.tx_queue_,
+                                   self.rx_queue_,
+                                   max_packet_size=1248,
+                                   options=io_options,
+                                   rx_callback=self._rx_callback if rx_dispatch is None else rx_dispatch(self._rx_callback))
                                     
         
         if (False == self.comm.link_up):
             rospy.logerr("Could not open socket for MOVO...")
-            self.comm.close()
+            self.comm.Close()
             return
-        
+
         """
-        Initialize the publishers and subscribers for the node
+        Track the rate, jitter and integrity of the feedback stream
         """
-        self.s = [0]*4
-        self.faultlog_pub = rospy.Publisher('/movo/feedback/faultlog', Faultlog, queue_size=10,latch=True)
-        self.s[0] = rospy.Subscriber("/movo/cmd_vel", Twist, self._add_motion_command_to_queue)
-        self.s[1] = rospy.Subscriber("/movo/gp_command",ConfigCmd,self._add_config_command_to_queue)
-        self.s[2] = rospy.Subscriber("/move_base/DWAPlannerROS/parameter_updates",Config,self._update_move_base_params)
-        self.s[3] = rospy.Subscriber("/movo/motion_test_cmd",MotionTestCmd,self._add_motion_test_command_to_queue)
+        expected_rate_hz = rospy.get_param('~link_monitor/expected_rate_hz',100.0)
+        self._link_monitor = create_link_monitor(namespace_name(namespace,'/movo').strip('/'),(movo_ip,8080),
+                                                 expected_rate_hz,
+                                                 dict({'tx':self.tx_queue_,'rx':self.rx_queue_}))
 
         """
-        Start the receive handler thread
+        Drop duplicate, reordered and late frames before they are parsed, the
+        stream period comes from the expected rate so without one the frames
+        are not sequenced
         """
-        self.terminate_mutex = threading.RLock()
-        self.last_rsp_rcvd = rospy.Time.now().to_sec()
-        self._rcv_thread   = threading.Thread(target = self._run)
-        self._rcv_thread.start()
+        self._sequencer = None
+        if (expected_rate_hz > 0.0):
+            self._sequencer = FrameSequencer(1.0/expected_rate_hz)
+            self._link_monitor.add_counters(self._sequencer)
+        else:
+            rospy.logwarn("~link_monitor/expected_rate_hz is %s, feedback frames are not sequenced" % expected_rate_hz)
         
         """
-        Start streaming continuous data
+        Optionally coalesce the motion commands and send them at a fixed rate
         """
-        rospy.loginfo("Stopping the data stream")
-        if (False == self._continuous_data(False)):
-            rospy.logerr("Could not stop MOVO communication stream")
-            self.Shutdown()
-            return
+        self._motion_scheduler = None
+        motion_options = rospy.get_param('~motion_scheduler',dict())
+        if (motion_options.get('rate_hz',0.0) > 0.0):
+            self._motion_scheduler = MotionCommandScheduler(self.tx_queue_,
+                                                            motion_options['rate_hz'],
+                                                            motion_options.get('source_timeout_sec',0.2),
+                                                            dict(motion_options.get('priorities',[])),
+                                                            self._motion_command_sent)
         
         """
-        Extract the faultlog at startup
+        Initialize the publishers and subscribers for the node
         """
-        self.flush_rcvd_data=False
-        rospy.loginfo("Extracting the faultlog")
-        self.extracting_faultlog = True
-        
-        if (False == self._extract_faultlog()):
-            rospy.logerr("Could not get retrieve MOVO faultlog")
-            self.Shutdown()
-            return          
-        
+        self.s = [0]*4
+        self.faultlog_pub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/faultlog'), Faultlog, queue_size=10,latch=True)
+        self.s[0] = rospy.Subscriber(namespace_name(namespace,"/movo/cmd_vel"), Twist, self._add_motion_command_to_queue)
+        self.s[1] = rospy.Subscriber(namespace_name(namespace,"/movo/gp_command"),ConfigCmd,self._add_config_command_to_queue)
+        self.s[2] = rospy.Subscriber(namespace_name(namespace,"/move_base/DWAPlannerROS/parameter_updates"),Config,self._update_move_base_params)
+        self.s[3] = rospy.Subscriber(namespace_name(namespace,"/movo/motion_test_cmd"),MotionTestCmd,self._add_motion_test_command_to_queue)
+
         """
-        Start streaming continuous data
+        Start the receive handler thread, when the link dispatches frames
+        from the I/O reactor no thread is needed
         """
-        rospy.loginfo("Starting the data stream")
-        if (False == self._continuous_data(True)):
-            rospy.logerr("Could not start MOVO communication stream")
-            self.Shutdown()
-            return
-            
-        self.start_frequency_samp = True
+        if not self._rx_dispatch:
+            self._rcv_thread   = threading.Thread(target = self._run)
+            self._rcv_thread.start()
         
         """
-        Force the configuration to update the first time to ensure that the variables are set to
-        the correct values on the machine
-        """
-        if (False == self._initial_param_force_update()):
-            rospy.logerr("Initial configuration parameteters my not be valid, please check them in the yaml file")
-            rospy.logerr("The ethernet address must be set to the present address at startup, to change it:")
-            rospy.logerr("start the machine; change the address using rqt_reconfigure; shutdown; update the yaml and restart")
+        Wait for the parameter server to set the configs, note that the ethernet settings must be the
+        current ethernet settings of the platform. If you want to change it set the ethernet settings
+        at launch to the current ethernet settings, power up, change them, power down, set the
+        the ethernet settings at launch to the new ones and relaunch.
+
+        Then stop the data stream, extract the faultlog, restart the stream and force the
+        configuration to update to ensure that the variables are set to the correct values on the
+        machine
+        """
+        if (False == self._startup.run()):
+            failed = self._startup.failed_step
+            if ('waiting_for_parameters' == failed):
+                rospy.logerr("Parameter server not found, you must pass an initial yaml in the launch! exiting...")
+            elif ('loading_configuration' == failed):
+                rospy.logerr("Initial configuration parameteters my not be valid, please check them in the yaml file")
+                rospy.logerr("The ethernet address must be set to the present address at startup, to change it:")
+                rospy.logerr("start the machine; change the address using rqt_reconfigure; shutdown; update the yaml and restart")
+            else:
+                rospy.logerr("MOVO did not respond while %s" % failed.replace('_',' '))
             self.Shutdown()
             return
         
-
-        
         rospy.loginfo("Movo Driver is up and running")
+        self.init_success = True
     
     def Shutdown(self):
         with self.terminate_mutex:
             self.need_to_terminate = True
+        self._startup.abort()
+        self._reconfig.Shutdown()
         rospy.loginfo("Movo Driver has called the Shutdown method, terminating")
         for i in range(len(self.s)):
             self.s[i].unregister()
         self.faultlog_pub.unregister()
+        self.driver_state_pub.unregister()
+        get_link_diagnostics().unregister(self._link_monitor)
+        if self._motion_scheduler is not None:
+            self._motion_scheduler.Shutdown()
         self.movo_data.Shutdown()      
-        self._linear.Shutdown()
+        if self._recorder is not None:
+            self._recorder.Shutdown()
+        if self._linear is not None:
+            self._linear.Shutdown()
         self.comm.Close()
         self.tx_queue_.close()
         self.rx_queue_.close()    
@@ -221,10 +302,17 @@ class MovoDriver:
             result = select.select([self.rx_queue_._reader],[],[],0.02)
             if len(result[0]) > 0:
                 data = result[0][0].recv()
-                with self.terminate_mutex:
-                    if not self.need_to_terminate:
-                        self._handle_rsp(data)
+                if self._rx_stamped:
+                    self._rx_callback(data[0],data[1])
+                else:
+                    self._rx_callback(data)
 
+    def _rx_callback(self,data,rx_stamp=None):
+        with self.terminate_mutex:
+            if not self.need_to_terminate:
+                self._handle_rsp(data,rx_stamp)
+        self._startup.notify()
+        self._reconfig.notify()
         
     def _add_command_to_queue(self,command):
         
@@ -238,15 +326,9 @@ class MovoDriver:
         """
         self.tx_queue_.put(cmd_bytes)
         
-    def _update_rcv_frq(self):
-        if (True == self.start_frequency_samp):
-            self.samp+=1
-            self.summer+=1.0/(rospy.Time.now().to_sec() - self.last_rsp_rcvd)
-            self.avg_freq = self.summer/self.samp
-        self.last_rsp_rcvd = rospy.Time.now().to_sec()
-    
-    def _handle_rsp(self,data_bytes):
+    def _handle_rsp(self,data_bytes,rx_stamp=None):
         
+        self._last_frame_time = time.time()
         if (True == self.flush_rcvd_data) or (True == rospy.is_shutdown()):
             return
            
@@ -256,31 +338,44 @@ class MovoDriver:
             valid_data = validate_response(data_bytes,((NUMBER_OF_MOVO_RSP_WORDS+1)*4))
         
         if (False == valid_data):
+            self._link_monitor.invalid_frame()
             rospy.logerr("bad movo data packet")
             return
 
-        rsp_data = array.array('I',data_bytes.tostring()).tolist()       
-        rsp_data = rsp_data[:(len(rsp_data)-1)]
-
         if (self.extracting_faultlog):
+            self._link_monitor.response_received('faultlog',rx_stamp)
             self.extracting_faultlog = False
             faultlog_msg = Faultlog()
-            faultlog_msg.data = rsp_data
+            faultlog_msg.data = list(self._faultlog_decoder.unpack(data_bytes))
             self.faultlog_pub.publish(faultlog_msg)
+            if self._fault_store:
+                threading.Thread(target=self._store_faultlog,args=(faultlog_msg.data,)).start()
         else:
-            
-            header_stamp = self.movo_data.status.parse(rsp_data[START_STATUS_BLOCK:END_STATUS_BLOCK])
-            wheel_circum = self.movo_data.config_param.parse(rsp_data[START_APP_CONFIG_BLOCK:END_FRAM_CONFIG_BLOCK],header_stamp)
-            self.movo_data.auxiliary_power.parse(rsp_data[START_BATTERY_DATA_BLOCK:END_BATTERY_DATA_BLOCK],header_stamp)
-            self.movo_data.propulsion.parse(rsp_data[START_PROPULSION_DATA_BLOCK:END_PROPULSION_DATA_BLOCK],header_stamp)
-            self.movo_data.dynamics.parse(rsp_data[START_DYNAMICS_DATA_BLOCK:END_DYNAMICS_DATA_BLOCK],header_stamp,wheel_circum)            
-            self.movo_data.imu.parse_data(rsp_data[START_IMU_DATA_BLOCK:END_IMU_DATA_BLOCK],header_stamp)
-            self._update_rcv_frq()
+            if (self._sequencer is not None) and not self._sequencer.accept(self._rsp_decoder.unpack_word(data_bytes,ROS_OPERATIONAL_TIME_INDEX)):
+                rospy.logdebug("dropped a stale movo data packet")
+                return
+            rsp_data,header_stamp = parse_movo_feedback(self.movo_data,self._rsp_decoder,data_bytes,rx_stamp)
+            if self._recorder is not None:
+                self._recorder.record(rsp_data,header_stamp.to_sec())
+            self._link_monitor.frame_received(rx_stamp)
+            self._link_monitor.response_received('command',rx_stamp)
             
             rospy.logdebug("feedback received from movo")
         
     def _add_motion_command_to_queue(self,command):
         
+        """
+        With the scheduler only the latest setpoint of each publishing node is
+        kept, it is sent on the next control period
+        """
+        if self._motion_scheduler is not None:
+            source = getattr(command,'_connection_header',dict()).get('callerid','')
+            self._motion_scheduler.update(source,
+                                          command.linear.x,
+                                          command.linear.y,
+                                          command.angular.z)
+            return
+        
         """
         Add the command to the queue, platform does command limiting and mapping
         """
@@ -288,6 +383,14 @@ class MovoDriver:
                                convert_float_to_u32(command.linear.y),
                                convert_float_to_u32(command.angular.z)]]
         self._add_command_to_queue(cmds)
+        self._motion_command_sent()
+
+    def _motion_command_sent(self):
+        """
+        The base answers motion commands only through the feedback stream, the
+        latency is measured up to the next feedback frame
+        """
+        self._link_monitor.request_sent('command')
             
     def _add_config_command_to_queue(self,command):
         try:
@@ -393,38 +496,28 @@ class MovoDriver:
         """
         Update the linear actuator velocity limit
         """
-        self._linear.UpdateVelLimit(config.linear_actuator_vel_limit_mps)
+        if self._linear is not None:
+            self._linear.UpdateVelLimit(config.linear_actuator_vel_limit_mps)
         
+        """
+        Hand the changes to the reconfiguration manager, it only loads the
+        machine configuration when it differs from what the platform reports.
+        The first set of parameters is loaded by the startup sequence.
+        """
         if self.param_server_initialized:
             if ((1<<4) == (level & (1<<4))):
-                rospy.sleep(0.1)
-                cmds = [GENERAL_PURPOSE_CMD_ID,
-                        [6,convert_float_to_u32(config.strafe_correction_factor)]]
-                self._add_command_to_queue(cmds)
-                rospy.sleep(0.1)
+                self._reconfig.set_general_purpose(6,[GENERAL_PURPOSE_CMD_ID,
+                                                      [6,convert_float_to_u32(config.strafe_correction_factor)]])
 
             if ((1<<5) == (level & (1<<5))):
-                rospy.sleep(0.1)
-                cmds = [GENERAL_PURPOSE_CMD_ID,
-                        [7,convert_float_to_u32(config.yaw_correction_factor)]]
-                self._add_command_to_queue(cmds)
-                rospy.sleep(0.1)
-        
-        """
-        Check and see if we need to store the parameters in NVM before we try, although the NVM is F-RAM
-        with unlimited read/write, uneccessarily setting the parameters only introduces risk for error 
-        """
-        if self.param_server_initialized:
-            load_params = False
-            for i in range(NUMBER_OF_CONFIG_PARAM_VARIABLES):
-                if (self.movo_data.config_param.configuration_feedback[i] != self.valid_config_cmd[1][i]):
-                    load_params = True
-            if (True == load_params):
-                self._add_command_to_queue(self.valid_config_cmd)
-                rospy.loginfo("Sent config update command")
+                self._reconfig.set_general_purpose(7,[GENERAL_PURPOSE_CMD_ID,
+                                                      [7,convert_float_to_u32(config.yaw_correction_factor)]])
+
+            self._reconfig.set_machine_config(self.valid_config_cmd)
         
         self.param_server_initialized = True
         self.valid_config = config
+        self._startup.notify()
         self.update_base_local_planner = True
         self._update_move_base_params(None)
         return config
@@ -438,81 +531,86 @@ class MovoDriver:
         if ((rospy.Time.now().to_sec()-self.last_move_base_update) > 5.0):
             self.update_base_local_planner = True
             
-        if self.update_base_local_planner:
+        if self.update_base_local_planner and hasattr(self,'valid_config'):
             self.update_base_local_planner = False
             self.last_move_base_update = rospy.Time.now().to_sec()
             
-            try:
-                dyn_reconfigure_client= Client("/move_base/DWAPlannerROS",timeout=1.0)
-                changes = dict()
-                changes['acc_lim_x'] = maximum_f(self.valid_config.accel_limit_mps2, self.valid_config.decel_limit_mps2)
-                changes['acc_lim_y'] = maximum_f(self.valid_config.accel_limit_mps2, self.valid_config.decel_limit_mps2)
-                changes['acc_lim_th'] = self.valid_config.yaw_accel_limit_rps2
-                changes['max_vel_x'] = self.valid_config.x_vel_limit_mps
-                changes['max_vel_y'] = self.valid_config.y_vel_limit_mps
-                changes['max_rot_vel'] = self.valid_config.yaw_rate_limit_rps
-                dyn_reconfigure_client.update_configuration(changes)
-                dyn_reconfigure_client.close()
-            except:
-                pass
-            
-            
-            rospy.loginfo("Movo Driver updated move_base parameters to match machine parameters")   
+            changes = dict()
+            changes['acc_lim_x'] = maximum_f(self.valid_config.accel_limit_mps2, self.valid_config.decel_limit_mps2)
+            changes['acc_lim_y'] = maximum_f(self.valid_config.accel_limit_mps2, self.valid_config.decel_limit_mps2)
+            changes['acc_lim_th'] = self.valid_config.yaw_accel_limit_rps2
+            changes['max_vel_x'] = self.valid_config.x_vel_limit_mps
+            changes['max_vel_y'] = self.valid_config.y_vel_limit_mps
+            changes['max_rot_vel'] = self.valid_config.yaw_rate_limit_rps
+            self._reconfig.update_planner(changes)
 
-    def _continuous_data(self,start_cont):
-        set_continuous = [GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_CONTINUOUS_DATA,start_cont]]
-        ret = False
-        
-        if (True == start_cont):
-            r = rospy.Rate(10)
-            start_time = rospy.Time.now().to_sec()
-            while ((rospy.Time.now().to_sec() - start_time) < 3.0) and (True == self.movo_data.status.init):
-                self._add_command_to_queue(set_continuous)
-                r.sleep()
-            ret = not self.movo_data.status.init
-        else:
-            r = rospy.Rate(5)
-            start_time = rospy.Time.now().to_sec()
-            while ((rospy.Time.now().to_sec() - start_time) < 3.0) and (False == ret):
-                self._add_command_to_queue(set_continuous)
-                rospy.sleep(0.6)
-                if ((rospy.Time.now().to_sec() - self.last_rsp_rcvd) > 0.5):
-                    ret = True
-                r.sleep()
-            self.movo_data.status.init = True
-
-        return ret
-    
-    def _extract_faultlog(self):
-        r = rospy.Rate(2)        
-        start_time = rospy.Time.now().to_sec()
-        while ((rospy.Time.now().to_sec() - start_time) < 3.0) and (True == self.extracting_faultlog):
-            self._add_command_to_queue([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_FAULTLOG,0]]) 
-            r.sleep()
-            
-        return not self.extracting_faultlog
-    
-    def _initial_param_force_update(self):
+    def _machine_config_feedback(self):
+        return self.movo_data.config_param.configuration_feedback
+
+    def _publish_driver_state(self,state):
+        rospy.loginfo("Movo Driver startup: %s" % state.replace('_',' '))
+        self.driver_state_pub.publish(String(state))
+
+    def _params_received(self):
+        return self.param_server_initialized
+
+    def _start_stop_stream(self):
+        self._last_frame_time = time.time()
+
+    def _stop_stream(self):
+        self._add_command_to_queue([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_CONTINUOUS_DATA,0]])
+
+    def _stream_quiet(self):
         """
-        Load all the parameters on the machine at startup; first check if they match, if they do continue.
-        Otherwise load them and check again.
+        There is no acknowledgement for stopping the stream, it is stopped
+        once no frame has arrived for a few stream periods
         """
-        r = rospy.Rate(2)
-        start_time = rospy.get_time()
-        params_loaded = False
+        return ((time.time() - self._last_frame_time) > 0.1)
 
-        while ((rospy.get_time() - start_time) < 3.0) and (False == params_loaded):
-            load_params = False
+    def _start_faultlog(self):
+        self.flush_rcvd_data = False
+        self.extracting_faultlog = True
 
-            for i in range(NUMBER_OF_CONFIG_PARAM_VARIABLES):
-                if (self.movo_data.config_param.configuration_feedback[i] != self.valid_config_cmd[1][i]):
-                    load_params = True
-            if (True == load_params):
-                self._add_command_to_queue(self.valid_config_cmd)
-                r.sleep()
-            else:
-                params_loaded = True
-        
-        return params_loaded
-    
+    def _store_faultlog(self,data):
+        """
+        Runs off the receive thread, the store is opened for this log only
+        """
+        try:
+            added = ingest_faultlog(self._fault_store,data)
+        except Exception as e:
+            rospy.logwarn("Could not store the faultlog in %s: %s" % (self._fault_store,e))
+            return
+        if added is not None:
+            rospy.loginfo("Stored %d new faultlog entries in %s" % (added,self._fault_store))
+
+    def _request_faultlog(self):
+        self._link_monitor.request_sent('faultlog')
+        self._add_command_to_queue([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_FAULTLOG,0]])
+
+    def _faultlog_received(self):
+        return not self.extracting_faultlog
+
+    def _start_stream_step(self):
+        if self._sequencer is not None:
+            self._sequencer.restart()
+        self.movo_data.status.init = True
 
+    def _start_stream(self):
+        self._add_command_to_queue([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_CONTINUOUS_DATA,1]])
+
+    def _stream_started(self):
+        if (False == self.movo_data.status.init):
+            return True
+        return False
+
+    def _load_config(self):
+        self._add_command_to_queue(self.valid_config_cmd)
+
+    def _config_loaded(self):
+        """
+        The configuration stored on the machine must match the parameters
+        """
+        for i in range(NUMBER_OF_CONFIG_PARAM_VARIABLES):
+            if (self.movo_data.config_param.configuration_feedback[i] != self.valid_config_cmd[1][i]):
+                return False
+        return True
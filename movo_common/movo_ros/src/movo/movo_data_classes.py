@@ -33,36 +33,53 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
  \Platform: Linux/ROS Indigo
 --------------------------------------------------------------------"""
-from utils import convert_u32_to_float,numToDottedQuad
+from utils import numToDottedQuad,namespace_name,namespace_frame
+from publish_policy import get_publish_policy
+from odometry_publisher import OdometryPublisher,quaternion_to_yaw
+from shm_feedback import create_shm_feedback,BASE_FEEDBACK_FIELDS
 from movo_msgs.msg import *
-from nav_msgs.msg import Odometry
 from geometry_msgs.msg import PoseWithCovarianceStamped
 from sensor_msgs.msg import Imu,MagneticField,JointState
 import rospy
 import math
-import tf
 import os
 
 class Movo_Status:
-    def __init__(self):
+    def __init__(self,namespace=''):
         self._MsgData = Status()
-        self._MsgPub = rospy.Publisher('/movo/feedback/status', Status, queue_size=10)
+        self._MsgPub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/status'), Status, queue_size=10)
         self._MsgData.header.frame_id = ''
         self._seq = 0
+        self._policy = get_publish_policy('status')
         self.op_mode = 0
         self.init=True
         
-    def parse(self,data):
+    def parse(self,data,rx_stamp=None):
 
-        header_stamp = rospy.get_rostime()
+        """
+        The kernel receive time is used when the link captures it, the other
+        feedback messages share this stamp
+        """
+        if rx_stamp is None:
+            header_stamp = rospy.get_rostime()
+        else:
+            header_stamp = rospy.Time.from_sec(rx_stamp)
         self.init=False
+        self.op_mode = data[5]
+
+        """
+        The operational time changes every frame so it is left out of the
+        change detection
+        """
+        if not self._policy.should_publish((data[0],data[1],data[2],data[3],data[5],data[6],data[8])):
+            return header_stamp
+
         self._MsgData.header.stamp = header_stamp
         self._MsgData.header.seq = self._seq
         temp = [data[0],data[1],data[2],data[3]]
         self._MsgData.fault_status_words = temp
-        self._MsgData.operational_time = convert_u32_to_float(data[4])
+        self._MsgData.operational_time = data[4]
         self._MsgData.operational_state = data[5]
-        self.op_mode = data[5]
         self._MsgData.dynamic_response = data[6]
         self._MsgData.machine_id = data[8]
         
@@ -72,72 +89,70 @@ class Movo_Status:
         return header_stamp
     
 class Movo_Battery:
-    def __init__(self):
+    def __init__(self,namespace=''):
         self._MsgData = Battery()
-        self._MsgPub = rospy.Publisher('/movo/feedback/battery', Battery, queue_size=10)
+        self._MsgPub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/battery'), Battery, queue_size=10)
         self._MsgData.header.frame_id = ''
         self._seq = 0
+        self._policy = get_publish_policy('battery')
         
     def parse(self,data,header_stamp):
+        if not self._policy.should_publish(data):
+            return
+
         self._MsgData.header.stamp = header_stamp
         self._MsgData.header.seq = self._seq
 
         self._MsgData.battery_status = data[0]
-        self._MsgData.battery_soc = convert_u32_to_float(data[1])
-        self._MsgData.battery_voltage_VDC = convert_u32_to_float(data[2])
-        self._MsgData.battery_current_A0pk = convert_u32_to_float(data[3])
-        self._MsgData.battery_temperature_degC = convert_u32_to_float(data[4])
+        self._MsgData.battery_soc = data[1]
+        self._MsgData.battery_voltage_VDC = data[2]
+        self._MsgData.battery_current_A0pk = data[3]
+        self._MsgData.battery_temperature_degC = data[4]
         
         self._MsgPub.publish(self._MsgData)
         self._seq += 1
     
 class Movo_Propulsion:
-    def __init__(self):
+    def __init__(self,namespace=''):
         self._MsgData = Propulsion()
-        self._MsgPub = rospy.Publisher('/movo/feedback/propulsion', Propulsion, queue_size=10)
+        self._MsgPub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/propulsion'), Propulsion, queue_size=10)
         self._MsgData.header.frame_id = ''
         self._seq = 0
+        self._policy = get_publish_policy('propulsion')
         
     def parse(self,data,header_stamp):
+        if not self._policy.should_publish(data):
+            return
+
         self._MsgData.header.stamp = header_stamp
         self._MsgData.header.seq = self._seq
         temp = [data[0],data[1],data[2],data[3]]
         self._MsgData.wheel_motor_status = temp            
-        temp = [convert_u32_to_float(data[4]),
-                convert_u32_to_float(data[5]),
-                convert_u32_to_float(data[6]),
-                convert_u32_to_float(data[7])]
-        self._MsgData.wheel_motor_current_A0pk = temp
-
-        temp = [convert_u32_to_float(data[8]),
-                convert_u32_to_float(data[9]),
-                convert_u32_to_float(data[10]),
-                convert_u32_to_float(data[11])]
-        self._MsgData.wheel_motor_speed_rps = temp
-
-        temp = [convert_u32_to_float(data[12]),
-                convert_u32_to_float(data[13]),
-                convert_u32_to_float(data[14]),
-                convert_u32_to_float(data[15])]
-        self._MsgData.wheel_motor_position_rad = temp
+        self._MsgData.wheel_motor_current_A0pk = list(data[4:8])
+        self._MsgData.wheel_motor_speed_rps = list(data[8:12])
+        self._MsgData.wheel_motor_position_rad = list(data[12:16])
         
         self._MsgData.linear_motor_status       = data[16]
-        self._MsgData.linear_motor_current_A0pk = convert_u32_to_float(data[17])
-        self._MsgData.linear_motor_speed_rps    = convert_u32_to_float(data[18])
-        self._MsgData.linear_motor_position_rad = convert_u32_to_float(data[19])
+        self._MsgData.linear_motor_current_A0pk = data[17]
+        self._MsgData.linear_motor_speed_rps    = data[18]
+        self._MsgData.linear_motor_position_rad = data[19]
          
 
         self._MsgPub.publish(self._MsgData)
         self._seq += 1      
         
 class Movo_IMU(object):
-    def __init__(self):
+    def __init__(self,namespace=''):
         self._MsgData = Imu()
-        self._MsgPub = rospy.Publisher('/movo/feedback/sic_imu', Imu, queue_size=10)
-        self._MsgData.header.frame_id = 'sic_imu_frame'
+        self._MsgPub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/sic_imu'), Imu, queue_size=10)
+        self._MsgData.header.frame_id = namespace_frame(namespace,'sic_imu_frame')
         self._seq = 0
+        self._policy = get_publish_policy('sic_imu')
 
     def parse_data(self,data,header_stamp):
+        if not self._policy.should_publish(data):
+            return
+
         self._MsgData.header.stamp = header_stamp
         self._MsgData.header.seq = self._seq
         self._MsgData.orientation.w = 0
@@ -148,16 +163,16 @@ class Movo_IMU(object):
         self._MsgData.orientation_covariance[4] = 99999999.0
         self._MsgData.orientation_covariance[8] = 99999999.0
         
-        self._MsgData.linear_acceleration.x =  convert_u32_to_float(data[0])
-        self._MsgData.linear_acceleration.y =  convert_u32_to_float(data[1]) 
-        self._MsgData.linear_acceleration.z =  convert_u32_to_float(data[2])       
+        self._MsgData.linear_acceleration.x =  data[0]
+        self._MsgData.linear_acceleration.y =  data[1] 
+        self._MsgData.linear_acceleration.z =  data[2]       
         self._MsgData.linear_acceleration_covariance[0] = 0.098 * 0.098
         self._MsgData.linear_acceleration_covariance[4] = 0.098 * 0.098
         self._MsgData.linear_acceleration_covariance[8] = 0.098 * 0.098
 
-        self._MsgData.angular_velocity.x =  convert_u32_to_float(data[3])
-        self._MsgData.angular_velocity.y =  convert_u32_to_float(data[4])
-        self._MsgData.angular_velocity.z =  convert_u32_to_float(data[5])       
+        self._MsgData.angular_velocity.x =  data[3]
+        self._MsgData.angular_velocity.y =  data[4]
+        self._MsgData.angular_velocity.z =  data[5]       
         self._MsgData.angular_velocity_covariance[0] = 0.012 * 0.012
         self._MsgData.angular_velocity_covariance[4] = 0.012 * 0.012
         self._MsgData.angular_velocity_covariance[8] = 0.012 * 0.012
@@ -169,198 +184,125 @@ class Movo_IMU(object):
         self._seq += 1
 
 class Movo_Dynamics:
-    def __init__(self):
+    def __init__(self,namespace=''):
         self._use_lsm_for_odom = rospy.get_param('~use_lsm_for_odom',False)
         self._MsgData = Dynamics()
-        self._MsgPub = rospy.Publisher('/movo/feedback/dynamics', Dynamics, queue_size=10)
-        self._jointStatePub = rospy.Publisher('/movo/linear_actuator/joint_states', JointState, queue_size=10)
+        self._MsgPub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/dynamics'), Dynamics, queue_size=10)
+        self._jointStatePub = rospy.Publisher(namespace_name(namespace,'/movo/linear_actuator/joint_states'), JointState, queue_size=10)
         self._jointStateMsg = JointState()
         self._jointStateMsg.name = ['linear_joint']
+        self._jointStateMsg.velocity = [0.0]
+        self._jointStateMsg.position = [0.0]
         self._MsgData.header.frame_id = ''
         self._jointStateMsg.header.frame_id = ''
 
-        self._OdomData1 = Odometry()
-        self._OdomData2 = Odometry()
-        self._OdomPub1 = rospy.Publisher('/movo/feedback/wheel_odometry', Odometry, queue_size=10)
-        if (False == self._use_lsm_for_odom):
-            rospy.Subscriber('/movo/odometry/local_filtered', Odometry, self._update_odom_yaw)
-        else:
-            self._OdomPub2 = rospy.Publisher('/movo/odometry/local_filtered', Odometry, queue_size=10)
-            self.has_recved_lsm = False
-            rospy.Subscriber('/movo/lsm/pose', PoseWithCovarianceStamped, self._update_lsm_odom)     
-        
-        self._OdomData1.header.frame_id = 'odom'
-        self._OdomData1.child_frame_id  = 'base_link'
-        
-        
-        self._OdomData1.pose.covariance = [0.00017,0.0,0.0,0.0,0.0,0.0,
-                                          0.0,0.00017,0.0,0.0,0.0,0.0,
-                                          0.0,0.0,0.00017,0.0,0.0,0.0,
-                                          0.0,0.0,0.0,0.00000,0.0,0.0,
-                                          0.0,0.0,0.0,0.0,0.00000,0.0,
-                                          0.0,0.0,0.0,0.0,0.0,0.00017]
-             
-        self._OdomData1.twist.covariance = [0.00017,0.0,0.0,0.0,0.0,0.0,
-                                           0.0,0.00017,0.0,0.0,0.0,0.0,
-                                           0.0,0.0,0.00017,0.0,0.0,0.0,
-                                           0.0,0.0,0.0,0.00000,0.0,0.0,
-                                           0.0,0.0,0.0,0.0,0.00000,0.0,
-                                           0.0,0.0,0.0,0.0,0.0,0.00017]
-                                           
-                                           
-        self._OdomData2.header.frame_id = self._OdomData1.header.frame_id
-        self._OdomData2.child_frame_id = self._OdomData1.child_frame_id
-        self._OdomData2.pose.covariance = self._OdomData1.pose.covariance
-        self._OdomData2.twist.covariance = self._OdomData1.twist.covariance
+        odom_covariance = [0.00017,0.0,0.0,0.0,0.0,0.0,
+                           0.0,0.00017,0.0,0.0,0.0,0.0,
+                           0.0,0.0,0.00017,0.0,0.0,0.0,
+                           0.0,0.0,0.0,0.00000,0.0,0.0,
+                           0.0,0.0,0.0,0.0,0.00000,0.0,
+                           0.0,0.0,0.0,0.0,0.0,0.00017]
+
+        """
+        The wheel odometry and the odometry used for navigation have their
+        own buffers, the navigation odometry comes from the wheels or from
+        the LSM pose and carries the odom->base_link transform
+        """
+        odom_frame = namespace_frame(namespace,'odom')
+        base_frame = namespace_frame(namespace,'base_link')
+        self._wheel_odom = OdometryPublisher(namespace_name(namespace,'/movo/feedback/wheel_odometry'),odom_frame,base_frame,odom_covariance)
+        self._nav_odom = OdometryPublisher(namespace_name(namespace,'/movo/odometry/local_filtered'),odom_frame,base_frame,odom_covariance,send_tf=True)
+        if (True == self._use_lsm_for_odom):
+            rospy.Subscriber(namespace_name(namespace,'/movo/lsm/pose'), PoseWithCovarianceStamped, self._update_lsm_odom)     
         
         self._seq = 0
+        self._dynamics_policy = get_publish_policy('dynamics')
+        self._odom_policy = get_publish_policy('wheel_odometry')
+        self._joint_state_policy = get_publish_policy('linear_actuator_joint_states')
+
+        """
+        Optional shared memory copy of the odometry for co-located consumers
+        """
+        self._shm = create_shm_feedback(namespace_frame(namespace,'base'),BASE_FEEDBACK_FIELDS,rospy.get_param('~shm_feedback',False))
         
     def _update_lsm_odom(self,msg):
-        self._OdomData2.header.stamp = msg.header.stamp
-        self._OdomData2.header.seq += 1
-        
-        (r, p, w) = tf.transformations.euler_from_quaternion([msg.pose.pose.orientation.x, msg.pose.pose.orientation.y, msg.pose.pose.orientation.z, msg.pose.pose.orientation.w])
-        self._MsgData.odom_yaw_angle_rad = ( w + math.pi) % (2 * math.pi ) - math.pi
-        
-        rot = (msg.pose.pose.orientation.x, msg.pose.pose.orientation.y, msg.pose.pose.orientation.z, msg.pose.pose.orientation.w)
-        pos = (msg.pose.pose.position.x,msg.pose.pose.position.y,0.0)
-        
-        if (False == self.has_recved_lsm):
-            self._prev_lsm_update_time = msg.header.stamp.to_sec()
-            self._prev_lsm_x = msg.pose.pose.orientation.x
-            self._prev_lsm_y = msg.pose.pose.orientation.y
-            self._prev_lsm_w = w
-            self.has_recved_lsm = True
-            dxdt=0.0
-            dydt=0.0
-            dwdt=0.0 
-        else:
-            dt = (msg.header.stamp.to_sec() - self._prev_lsm_update_time)
-            dxdt= (msg.pose.pose.position.x - self._prev_lsm_x)/dt
-            dydt= (msg.pose.pose.position.y - self._prev_lsm_y)/dt
-            dwdt= (w - self._prev_lsm_w)/dt
-            self._prev_lsm_x = msg.pose.pose.position.x
-            self._prev_lsm_y = msg.pose.pose.position.y
-            self._prev_lsm_w = w
-            self._prev_lsm_update_time = msg.header.stamp.to_sec()
-            
-            dxdt = (dxdt+self._OdomData1.twist.twist.linear.x)/2.0
-            dydt = (dydt+self._OdomData1.twist.twist.linear.y)/2.0
-            dwdt = (dwdt+self._OdomData1.twist.twist.angular.z)/2.0
-        
-        self._OdomData2.twist.twist.linear.x = self._OdomData1.twist.twist.linear.x #dxdt
-        self._OdomData2.twist.twist.linear.y = self._OdomData1.twist.twist.linear.y #dydt
-        self._OdomData2.twist.twist.linear.z = 0.0
-        self._OdomData2.twist.twist.angular.x = 0.0
-        self._OdomData2.twist.twist.angular.y = 0.0
-        self._OdomData2.twist.twist.angular.z = self._OdomData1.twist.twist.angular.z #dwdt
-        self._OdomData2.pose = msg.pose
-        
-        
-        self._OdomPub2.publish(self._OdomData2)        
-        br = tf.TransformBroadcaster()
-        br.sendTransform(pos,
-                         rot,
-                         msg.header.stamp,
-                         "base_link",
-                         "odom") 
-
-    def _update_odom_yaw(self,msg):
-        (r, p, y) = tf.transformations.euler_from_quaternion([msg.pose.pose.orientation.x, msg.pose.pose.orientation.y, msg.pose.pose.orientation.z, msg.pose.pose.orientation.w])
-        self._MsgData.odom_yaw_angle_rad = ( y + math.pi) % (2 * math.pi ) - math.pi
+        self._MsgData.odom_yaw_angle_rad = quaternion_to_yaw(msg.pose.pose.orientation)
+
+        self._nav_odom.copy_pose(msg.pose)
+        twist = self._wheel_odom.msg.twist.twist
+        self._nav_odom.set_twist(twist.linear.x,twist.linear.y,twist.angular.z)
+        self._nav_odom.publish(msg.header.stamp)
+        self._nav_odom.send_transform(msg.header.stamp)
 
     def parse(self,data,header_stamp,wheel_circum):
         
-        self._MsgData.header.stamp = header_stamp
-        self._MsgData.header.seq = self._seq
-        
-        self._OdomData1.header.stamp = header_stamp
-        self._OdomData1.header.seq = self._seq
-        
-        self._jointStateMsg.header.stamp = header_stamp
-        self._jointStateMsg.header.seq = self._seq
-
-        self._MsgData.x_vel_target_mps = convert_u32_to_float(data[0])
-        self._MsgData.y_vel_target_mps = convert_u32_to_float(data[1])
-        self._MsgData.yaw_rate_target_rps = convert_u32_to_float(data[2])
-        self._MsgData.linear_actuator_target_m = convert_u32_to_float(data[3])
-        self._MsgData.x_vel_limit_mps = convert_u32_to_float(data[4])
-        self._MsgData.y_vel_limit_mps = convert_u32_to_float(data[5])
-        self._MsgData.yaw_rate_limit_rps = convert_u32_to_float(data[6])
-        self._MsgData.linear_actuator_vel_limit_mps = convert_u32_to_float(data[7])
-        
-        
-        temp = [convert_u32_to_float(data[8]),
-                convert_u32_to_float(data[9]),
-                convert_u32_to_float(data[10]),
-                convert_u32_to_float(data[11])]
-        self._MsgData.wheel_vel_mps = temp
-        temp = [convert_u32_to_float(data[12]),
-                convert_u32_to_float(data[13]),
-                convert_u32_to_float(data[14]),
-                convert_u32_to_float(data[15])]
-        self._MsgData.wheel_pos_m = temp
-        
-        joint_vel = [convert_u32_to_float(data[16])]
-        joint_pos = [convert_u32_to_float(data[17])]
-        self._MsgData.linear_actuator_vel_mps = convert_u32_to_float(data[16])
-        self._MsgData.linear_actuator_position_m = convert_u32_to_float(data[17])
-        
-        self._MsgData.x_accel_mps2 = convert_u32_to_float(data[18])
-        self._MsgData.y_accel_mps2 = convert_u32_to_float(data[19])
-        self._MsgData.yaw_accel_mps2 = convert_u32_to_float(data[20])
-        self._OdomData1.twist.twist.linear.x = convert_u32_to_float(data[21])
-        self._OdomData1.twist.twist.linear.y = convert_u32_to_float(data[22])
-        self._OdomData1.twist.twist.linear.z = 0.0
-        self._OdomData1.twist.twist.angular.x = 0.0
-        self._OdomData1.twist.twist.angular.y = 0.0
-        self._OdomData1.twist.twist.angular.z = convert_u32_to_float(data[23])
-        self._OdomData1.pose.pose.position.x = convert_u32_to_float(data[24])
-        self._OdomData1.pose.pose.position.y = convert_u32_to_float(data[25])
-        self._OdomData1.pose.pose.position.z = 0.0
-        
-        y = convert_u32_to_float(data[26]) 
-        y = ( y + math.pi) % (2 * math.pi ) - math.pi
-        self._MsgData.yaw_angle_rad = y
-        rot = tf.transformations.quaternion_from_euler(0,0,convert_u32_to_float(data[26]))
-        self._OdomData1.pose.pose.orientation.x = rot[0]
-        self._OdomData1.pose.pose.orientation.y = rot[1]
-        self._OdomData1.pose.pose.orientation.z = rot[2]
-        self._OdomData1.pose.pose.orientation.w = rot[3]
-        
-        x = self._OdomData1.pose.pose.position.x
-        y = self._OdomData1.pose.pose.position.y
-        z = self._OdomData1.pose.pose.position.z             
+        """
+        The wheel odometry is always updated, it feeds the navigation
+        odometry and the LSM odometry
+        """
+        self._wheel_odom.set_twist(data[21],data[22],data[23])
+        self._wheel_odom.set_pose(data[24],data[25],data[26])
+        yaw = ( data[26] + math.pi) % (2 * math.pi ) - math.pi
 
-        
-        self._jointStateMsg.velocity = joint_vel
-        self._jointStateMsg.position = joint_pos
+        if self._shm is not None:
+            self._shm.write((header_stamp.to_sec(),data[21],data[22],data[23],data[24],data[25],yaw,data[16],data[17]))
+
+        if self._odom_policy.should_publish(data[21:27]):
+            self._wheel_odom.publish(header_stamp)
+
+        if self._dynamics_policy.should_publish(data):
+            self._MsgData.header.stamp = header_stamp
+            self._MsgData.header.seq = self._seq
+
+            self._MsgData.x_vel_target_mps = data[0]
+            self._MsgData.y_vel_target_mps = data[1]
+            self._MsgData.yaw_rate_target_rps = data[2]
+            self._MsgData.linear_actuator_target_m = data[3]
+            self._MsgData.x_vel_limit_mps = data[4]
+            self._MsgData.y_vel_limit_mps = data[5]
+            self._MsgData.yaw_rate_limit_rps = data[6]
+            self._MsgData.linear_actuator_vel_limit_mps = data[7]
+            
+            self._MsgData.wheel_vel_mps = list(data[8:12])
+            self._MsgData.wheel_pos_m = list(data[12:16])
+            
+            self._MsgData.linear_actuator_vel_mps = data[16]
+            self._MsgData.linear_actuator_position_m = data[17]
+            
+            self._MsgData.x_accel_mps2 = data[18]
+            self._MsgData.y_accel_mps2 = data[19]
+            self._MsgData.yaw_accel_mps2 = data[20]
+            self._MsgData.yaw_angle_rad = yaw
+            if (False == self._use_lsm_for_odom):
+                self._MsgData.odom_yaw_angle_rad = yaw
+            self._MsgPub.publish(self._MsgData)
+
+        if self._joint_state_policy.should_publish(data[16:18]):
+            self._jointStateMsg.header.stamp = header_stamp
+            self._jointStateMsg.header.seq = self._seq
+            self._jointStateMsg.velocity[0] = data[16]
+            self._jointStateMsg.position[0] = data[17]
+            self._jointStatePub.publish(self._jointStateMsg)
 
-        self._OdomPub1.publish(self._OdomData1)
-        self._MsgPub.publish(self._MsgData)
-        self._jointStatePub.publish(self._jointStateMsg)
         if (False == self._use_lsm_for_odom):
-            self._update_odom_yaw(self._OdomData1)
-            self._OdomData2 = self._OdomData1
-            self._OdomPub2.publish(self._OdomData2)        
-            br = tf.TransformBroadcaster()
-            br.sendTransform((x,y,z),
-                             rot,
-                             header_stamp,
-                             "base_link",
-                             "odom") 
-
-            self._seq += 1  
+            self._nav_odom.set_twist(data[21],data[22],data[23])
+            self._nav_odom.set_pose(data[24],data[25],data[26])
+            self._nav_odom.publish(header_stamp)
+            self._nav_odom.send_transform(header_stamp)
+
+        self._seq += 1
 
 class Movo_Configuration:
-    def __init__(self):   
+    def __init__(self,namespace=''):   
         self._MsgData = Configuration()
-        self._MsgPub = rospy.Publisher('/movo/feedback/stored_configuration', Configuration, queue_size=10)
+        self._MsgPub = rospy.Publisher(namespace_name(namespace,'/movo/feedback/stored_configuration'), Configuration, queue_size=10)
         self._MsgData.header.frame_id = ''
         self._MsgData1 = Configuration()
-        self._MsgPub1 = rospy.Publisher('/movo/feedback/active_configuration', Configuration, queue_size=10)
+        self._MsgPub1 = rospy.Publisher(namespace_name(namespace,'/movo/feedback/active_configuration'), Configuration, queue_size=10)
         self._MsgData1.header.frame_id = ''
         self._seq = 0 
+        self._stored_policy = get_publish_policy('stored_configuration')
+        self._active_policy = get_publish_policy('active_configuration')
         self.configuration_feedback = [0]*16
 
     def SetTeleopConfig(self,data):
@@ -382,70 +324,76 @@ class Movo_Configuration:
         self._MsgData1.teleop_pan_tilt_vel_limit = data[6]
         self._MsgData1.teleop_linear_actuator_vel_limit = data[7]            
 
-    def parse(self,data,header_stamp):
-        self._MsgData.header.stamp = header_stamp
-        self._MsgData.header.seq = self._seq 
-        self._MsgData1.header.stamp = header_stamp
-        self._MsgData1.header.seq = self._seq 
-                
+    def parse(self,data,header_stamp,config_words):
         """
-        This is the data presently being used by the application
+        The raw words stored in FRAM are kept to compare against the
+        configuration command whether or not the topics are published
         """
-        self._MsgData1.x_vel_limit_mps = convert_u32_to_float(data[0])
-        self._MsgData1.y_vel_limit_mps = convert_u32_to_float(data[1])
-        self._MsgData1.accel_limit_mps2 = convert_u32_to_float(data[2])
-        self._MsgData1.decel_limit_mps2 = convert_u32_to_float(data[3])
-        self._MsgData1.dtz_decel_limit_mps2 = convert_u32_to_float(data[4])
-        self._MsgData1.yaw_rate_limit_rps = convert_u32_to_float(data[5])
-        self._MsgData1.yaw_accel_limit_rps2 = convert_u32_to_float(data[6])
-        self._MsgData1.wheel_diameter_m = convert_u32_to_float(data[7])
-        self._MsgData1.wheelbase_length_m = convert_u32_to_float(data[8])
-        self._MsgData1.wheel_track_width_m = convert_u32_to_float(data[9])
-        self._MsgData1.gear_ratio = convert_u32_to_float(data[10])
-        self._MsgData1.config_bitmap = data[11]
-        self._MsgData1.eth_ip_address = numToDottedQuad(data[12])
-        self._MsgData1.eth_port_number = data[13]
-        self._MsgData1.eth_subnet_mask = numToDottedQuad(data[14])
-        self._MsgData1.eth_gateway = numToDottedQuad(data[15])
+        self.configuration_feedback = config_words
+        wheel_circum = data[7] * math.pi
+
+        if self._active_policy.should_publish(data[0:16]):
+            self._MsgData1.header.stamp = header_stamp
+            self._MsgData1.header.seq = self._seq
+
+            """
+            This is the data presently being used by the application
+            """
+            self._MsgData1.x_vel_limit_mps = data[0]
+            self._MsgData1.y_vel_limit_mps = data[1]
+            self._MsgData1.accel_limit_mps2 = data[2]
+            self._MsgData1.decel_limit_mps2 = data[3]
+            self._MsgData1.dtz_decel_limit_mps2 = data[4]
+            self._MsgData1.yaw_rate_limit_rps = data[5]
+            self._MsgData1.yaw_accel_limit_rps2 = data[6]
+            self._MsgData1.wheel_diameter_m = data[7]
+            self._MsgData1.wheelbase_length_m = data[8]
+            self._MsgData1.wheel_track_width_m = data[9]
+            self._MsgData1.gear_ratio = data[10]
+            self._MsgData1.config_bitmap = data[11]
+            self._MsgData1.eth_ip_address = numToDottedQuad(data[12])
+            self._MsgData1.eth_port_number = data[13]
+            self._MsgData1.eth_subnet_mask = numToDottedQuad(data[14])
+            self._MsgData1.eth_gateway = numToDottedQuad(data[15])
+            self._MsgPub1.publish(self._MsgData1)
+
+        if self._stored_policy.should_publish(data[16:32]):
+            self._MsgData.header.stamp = header_stamp
+            self._MsgData.header.seq = self._seq
+
+            """
+            This is the data stored in FRAM
+            """
+            self._MsgData.x_vel_limit_mps = data[16]
+            self._MsgData.y_vel_limit_mps = data[17]
+            self._MsgData.accel_limit_mps2 = data[18]
+            self._MsgData.decel_limit_mps2 = data[19]
+            self._MsgData.dtz_decel_limit_mps2 = data[20]
+            self._MsgData.yaw_rate_limit_rps = data[21]
+            self._MsgData.yaw_accel_limit_rps2 = data[22]
+            self._MsgData.wheel_diameter_m = data[23]
+            self._MsgData.wheelbase_length_m = data[24]
+            self._MsgData.wheel_track_width_m = data[25]
+            self._MsgData.gear_ratio = data[26]
+            self._MsgData.config_bitmap = data[27]
+            self._MsgData.eth_ip_address = numToDottedQuad(data[28])
+            self._MsgData.eth_port_number = data[29]
+            self._MsgData.eth_subnet_mask = numToDottedQuad(data[30])
+            self._MsgData.eth_gateway = numToDottedQuad(data[31])
+            self._MsgPub.publish(self._MsgData)
 
-        """
-        This is the data stored in FRAM
-        """
-        self.configuration_feedback = data[16:]
-        self._MsgData.x_vel_limit_mps = convert_u32_to_float(data[16])
-        self._MsgData.y_vel_limit_mps = convert_u32_to_float(data[17])
-        self._MsgData.accel_limit_mps2 = convert_u32_to_float(data[18])
-        self._MsgData.decel_limit_mps2 = convert_u32_to_float(data[19])
-        self._MsgData.dtz_decel_limit_mps2 = convert_u32_to_float(data[20])
-        self._MsgData.yaw_rate_limit_rps = convert_u32_to_float(data[21])
-        self._MsgData.yaw_accel_limit_rps2 = convert_u32_to_float(data[22])
-        self._MsgData.wheel_diameter_m = convert_u32_to_float(data[23])
-        self._MsgData.wheelbase_length_m = convert_u32_to_float(data[24])
-        self._MsgData.wheel_track_width_m = convert_u32_to_float(data[25])
-        self._MsgData.gear_ratio = convert_u32_to_float(data[26])
-        self._MsgData.config_bitmap = data[27]
-        self._MsgData.eth_ip_address = numToDottedQuad(data[28])
-        self._MsgData.eth_port_number = data[29]
-        self._MsgData.eth_subnet_mask = numToDottedQuad(data[30])
-        self._MsgData.eth_gateway = numToDottedQuad(data[31])
-
-        wheel_circum = self._MsgData1.wheel_diameter_m * math.pi
-        
-        
-        self._MsgPub.publish(self._MsgData)
-        self._MsgPub1.publish(self._MsgData1)
         self._seq += 1
-    
+
         return wheel_circum
 
 class MOVO_DATA:
-    def __init__(self):
-        self.status = Movo_Status()
-        self.propulsion = Movo_Propulsion()
-        self.auxiliary_power = Movo_Battery()
-        self.config_param = Movo_Configuration()
-        self.dynamics = Movo_Dynamics()
-        self.imu = Movo_IMU()
+    def __init__(self,namespace=''):
+        self.status = Movo_Status(namespace)
+        self.propulsion = Movo_Propulsion(namespace)
+        self.auxiliary_power = Movo_Battery(namespace)
+        self.config_param = Movo_Configuration(namespace)
+        self.dynamics = Movo_Dynamics(namespace)
+        self.imu = Movo_IMU(namespace)
     def Shutdown(self):
         self.status._MsgPub.unregister()
         self.propulsion._MsgPub.unregister()
@@ -454,8 +402,10 @@ class MOVO_DATA:
         self.config_param._MsgPub1.unregister()
         self.dynamics._jointStatePub.unregister()
         self.dynamics._MsgPub.unregister()
-        self.dynamics._OdomPub1.unregister()
-        self.dynamics._OdomPub2.unregister()
+        self.dynamics._wheel_odom.unregister()
+        self.dynamics._nav_odom.unregister()
+        if self.dynamics._shm is not None:
+            self.dynamics._shm.close()
 
 
         
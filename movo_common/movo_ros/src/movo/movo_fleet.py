@@ -0,0 +1,136 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   movo_fleet.py
+
+ \brief  Hosts the drivers of several MOVO bases in one process
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from movo_comm import MovoDriver
+import Queue
+import os
+import rospy
+import threading
+
+def resident_memory():
+    """
+    Resident set size of the process in bytes
+    """
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1])*os.sysconf('SC_PAGE_SIZE')
+
+class RxDispatchPool(object):
+    """
+    Worker threads that parse and publish the received frames of every robot
+    so the I/O reactor thread only receives. Each robot is pinned to one
+    worker so its frames are handled in order.
+    """
+    def __init__(self,num_threads=2):
+        self._queues = [Queue.Queue() for i in range(num_threads)]
+        self._threads = []
+        self._next = 0
+        for q in self._queues:
+            thread = threading.Thread(target = self._run,args = (q,))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def __call__(self,callback):
+        """
+        Wraps the receive callback of one robot
+        """
+        q = self._queues[self._next % len(self._queues)]
+        self._next += 1
+        def dispatch(data,rx_stamp=None):
+            q.put((callback,data,rx_stamp))
+        return dispatch
+
+    def Shutdown(self):
+        for q in self._queues:
+            q.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self,q):
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            callback,data,rx_stamp = item
+            try:
+                callback(data,rx_stamp)
+            except Exception as e:
+                rospy.logerr("Movo fleet receive handler failed: %s" % e)
+
+class MovoFleet(object):
+    """
+    Creates one MovoDriver per robot in a single process. The topics and TF
+    frames of every robot are prefixed with its name, the links share the
+    I/O reactor and the receive pool, and the frame decoders and diagnostics
+    are shared process wide.
+
+    robots is a list of dictionaries with the keys
+        name:     namespace of the robot
+        movo_ip:  address of its platform
+        local_ip: local address its links bind, every robot needs its own
+                  since the links bind the platform ports
+    io_options are the ~io settings applied to every robot, the reactor is
+    always used. The resident memory added by each driver is logged and
+    kept in memory_per_robot.
+    """
+    def __init__(self,robots,io_options=dict(),rx_threads=2):
+        self.drivers = dict()
+        self.memory_per_robot = dict()
+        self._pool = RxDispatchPool(rx_threads)
+
+        for robot in robots:
+            name = robot['name']
+            options = dict(io_options)
+            options['reactor'] = True
+            if ('local_ip' in robot):
+                options['local_ip'] = robot['local_ip']
+
+            before = resident_memory()
+            driver = MovoDriver(robot.get('movo_ip','10.66.171.5'),name,options,self._pool)
+            self.memory_per_robot[name] = resident_memory() - before
+
+            if (False == driver.init_success):
+                rospy.logerr("Movo fleet could not start the driver of %s" % name)
+                continue
+            self.drivers[name] = driver
+            rospy.loginfo("Movo fleet started %s, %.1f MB resident" % (name,self.memory_per_robot[name]/1e6))
+
+        rospy.loginfo("Movo fleet is running %d of %d robots, %.1f MB resident" % (len(self.drivers),len(robots),resident_memory()/1e6))
+
+    def Shutdown(self):
+        for driver in self.drivers.values():
+            driver.Shutdown()
+        self.drivers = dict()
+        self._pool.Shutdown()
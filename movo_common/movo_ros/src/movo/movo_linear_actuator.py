@@ -36,26 +36,37 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 from system_defines import *
 from utils import *
 from movo_msgs.msg import LinearActuatorCmd
-from io_eth import IoEthThread
+from io_eth import create_io_queue,create_io_link
+from link_monitor import create_link_monitor,get_link_diagnostics
 import multiprocessing
 import re
 import os
 import rospy
 
 class LinearActuator(object):
-    def __init__(self,movo_ip='10.66.171.5'):        
+    def __init__(self,movo_ip='10.66.171.5',namespace='',io_options=None):        
         self.init_success = False
+        self.s = None
         
         """
         Create the thread to run MOVO Linear actuator command interface
         """
-        self.tx_queue_ = multiprocessing.Queue()
-        self.rx_queue_ = multiprocessing.Queue()
+        if io_options is None:
+            io_options = rospy.get_param('~io',dict())
+        self.tx_queue_ = create_io_queue(1248,io_options)
+        self.rx_queue_ = create_io_queue(1248,io_options)
+
+        """
+        There is no feedback on this link, only the command queue is tracked
+        """
+        self._link_monitor = create_link_monitor(namespace_name(namespace,'/linear_actuator').strip('/'),(movo_ip,6236),
+                                                 0.0,dict({'tx':self.tx_queue_}))
         
-        self.comm = IoEthThread((movo_ip,6236),
-                                self.tx_queue_,
-                                self.rx_queue_,
-                                max_packet_size=1248)
+        self.comm = create_io_link((movo_ip,6236),
+                                   self.tx_queue_,
+                                   self.rx_queue_,
+                                   max_packet_size=1248,
+                                   options=io_options)
                                     
         
         if (False == self.comm.link_up):
@@ -67,12 +78,14 @@ class LinearActuator(object):
         Initialize the publishers and subscribers for the node
         """
         self.cmd_data = LinearActuatorCmd()
-        self.s = rospy.Subscriber("/movo/linear_actuator_cmd", LinearActuatorCmd, self._add_motion_command_to_queue)
+        self.s = rospy.Subscriber(namespace_name(namespace,"/movo/linear_actuator_cmd"), LinearActuatorCmd, self._add_motion_command_to_queue)
         self.init_success = True
     
     def Shutdown(self):
         rospy.loginfo("Shutting down the linear actuator command driver...")
-        self.s.unregister()
+        if self.s is not None:
+            self.s.unregister()
+        get_link_diagnostics().unregister(self._link_monitor)
         self.comm.Close()
         self.tx_queue_.close()
         self.rx_queue_.close()
@@ -98,8 +111,11 @@ class LinearActuator(object):
     def _add_motion_command_to_queue(self,command):
         if (rospy.is_shutdown()):
             return        
+        self.command_position(command.desired_position_m)
+
+    def command_position(self,desired_position_m):
         """
         Add the command to the queue, platform does command limiting and mapping
         """
-        cmds = [LINEAR_ACTUATOR_POSITION_CMD_ID,[convert_float_to_u32(command.desired_position_m)]]
+        cmds = [LINEAR_ACTUATOR_POSITION_CMD_ID,[convert_float_to_u32(desired_position_m)]]
         self._add_command_to_queue(cmds)
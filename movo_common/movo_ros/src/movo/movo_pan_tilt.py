@@ -40,33 +40,42 @@ from sensor_msgs.msg import JointState
 from trajectory_msgs.msg import JointTrajectory,JointTrajectoryPoint
 from control_msgs.msg import JointTrajectoryControllerState
 from control_msgs.srv import QueryTrajectoryState,QueryTrajectoryStateResponse
-from io_eth import IoEthThread
-import multiprocessing
+from io_eth import create_io_queue,create_io_link,rx_stamped
+from link_monitor import create_link_monitor,get_link_diagnostics
+from shm_feedback import create_shm_feedback,HEAD_FEEDBACK_FIELDS
+from trajectory_streamer import TrajectoryStreamer
+from frame_decoder import get_frame_decoder,PAN_TILT_RSP_LAYOUT,PAN_TILT_RSP_HEADER_BYTES
+from publish_policy import get_publish_policy
 import threading
 import select
 import rospy
-import operator
+
+PAN_TILT_JOINTS = ['pan_joint','tilt_joint']
 
 class PanTiltIO(object):
-    def __init__(self,movo_ip='10.66.171.5'):        
+    """
+    Pan-tilt head driver. With open_link False no link to the platform is
+    opened and nothing is sent, the feedback handler and publishers are set
+    up so recorded frames can be fed to _handle_rsp (movo_packet_replay).
+
+    A control_loop (SharedControlLoop of a trajectory server host) replaces
+    the command timer, trajectories are streamed on its tick and setpoints
+    from command_setpoint are sent right away.
+    """
+    def __init__(self,movo_ip='10.66.171.5',open_link=True,control_loop=None):        
         self.init_success = False
+        self._control_loop = control_loop
+        self._cmd_mutex = threading.Lock()
         
         """
         Create the thread to run MOVO Linear actuator command interface
         """
-        self._cmd_buffer = multiprocessing.Queue()
-        self.tx_queue_ = multiprocessing.Queue()
-        self.rx_queue_ = multiprocessing.Queue()
-        self.comm = IoEthThread((movo_ip,6237),
-                                self.tx_queue_,
-                                self.rx_queue_,
-                                max_packet_size=KINOVA_ACTUATOR_RSP_SIZE_BYTES)
-                                    
-        
-        if (False == self.comm.link_up):
-            rospy.logerr("Could not open socket for MOVO pan_tilt...exiting")
-            self.Shutdown()
-            return
+        self._streamer = TrajectoryStreamer(2,rospy.get_param('~command_deadband',1e-4))
+        io_options = rospy.get_param('~io',dict())
+        self._rx_dispatch = io_options.get('reactor',False)
+        self._rx_stamped = rx_stamped(io_options)
+        self.tx_queue_ = create_io_queue(KINOVA_ACTUATOR_RSP_SIZE_BYTES,io_options)
+        self.rx_queue_ = create_io_queue(KINOVA_ACTUATOR_RSP_SIZE_BYTES,io_options,self._rx_stamped)
 
         """
         Initialize the publishers and subscribers for the node
@@ -77,25 +86,75 @@ class PanTiltIO(object):
         self.s = rospy.Subscriber("/movo/head/cmd", PanTiltCmd, self._add_motion_command_to_queue)
         self._jcc = rospy.Subscriber("/movo/head_controller/command",JointTrajectory,self._add_traj_command_to_queue)
         
+        """
+        The feedback messages are created once and updated in place for every
+        frame, each topic is decimated by its own ~publish_policies entry
+        (data, joint_states and controller_state)
+        """
+        self._rsp_decoder = get_frame_decoder(PAN_TILT_RSP_LAYOUT,PAN_TILT_RSP_HEADER_BYTES)
         self.actuator_data = PanTiltFdbk()
         self.actuator_pub = rospy.Publisher("/movo/head/data", PanTiltFdbk, queue_size=10)
+        self._data_policy = get_publish_policy('data')
         self.js = JointState()
+        self.js.name = PAN_TILT_JOINTS
+        self.js.position = [0.0,0.0]
+        self.js.velocity = [0.0,0.0]
+        self.js.effort = [0.0,0.0]
         self.js_pub = rospy.Publisher("/movo/head/joint_states", JointState, queue_size=10)
+        self._js_policy = get_publish_policy('joint_states')
         self._jcs = JointTrajectoryControllerState()
+        self._jcs.joint_names = PAN_TILT_JOINTS
+        self._jcs.actual.positions = self.js.position
+        self._jcs.actual.velocities = self.js.velocity
+        self._jcs.actual.accelerations = [0.0,0.0]
+        self._jcs.error.positions = [0.0,0.0]
+        self._jcs.error.velocities = [0.0,0.0]
+        self._jcs.error.accelerations = [0.0,0.0]
         self._jcs_pub = rospy.Publisher("/movo/head_controller/state",JointTrajectoryControllerState,queue_size=10)
+        self._jcs_policy = get_publish_policy('controller_state')
         
         self._jc_srv = rospy.Service('/movo/head_controller/query_state', QueryTrajectoryState, self._handle_state_query)
+        self._shm = create_shm_feedback('head',HEAD_FEEDBACK_FIELDS,rospy.get_param('~shm_feedback',False))
 
         """
-        Start the receive handler thread
+        Open the link once everything the receive handler uses exists, with the
+        I/O reactor frames are dispatched as soon as the link is up
         """
         self.need_to_terminate = False
+        self._first_frame = threading.Event()
         self.terminate_mutex = threading.RLock()
         self.last_rsp_rcvd = rospy.get_time()
-        self._rcv_thread   = threading.Thread(target = self._run)
-        self._rcv_thread.start()
+        self._link_monitor = create_link_monitor('pan_tilt',(movo_ip,6237),
+                                                 rospy.get_param('~link_monitor/expected_rate_hz',100.0),
+                                                 dict({'tx':self.tx_queue_,'rx':self.rx_queue_}))
+        self.comm = None
+        if not open_link:
+            self.init_success = True
+            return
+        self.comm = create_io_link((movo_ip,6237),
+                                   self.tx_queue_,
+                                   self.rx_queue_,
+                                   max_packet_size=KINOVA_ACTUATOR_RSP_SIZE_BYTES,
+                                   options=io_options,
+                                   rx_callback=self._rx_callback)
+                                    
+        
+        if (False == self.comm.link_up):
+            rospy.logerr("Could not open socket for MOVO pan_tilt...exiting")
+            self.Shutdown()
+            return
+
+        """
+        Start the receive handler thread
+        """
+        if not self._rx_dispatch:
+            self._rcv_thread   = threading.Thread(target = self._run)
+            self._rcv_thread.start()
         
-        self._t1 = rospy.Timer(rospy.Duration(0.01),self._update_command_queue)
+        if self._control_loop is None:
+            self._t1 = rospy.Timer(rospy.Duration(0.01),self._update_command_queue)
+        else:
+            self._control_loop.add_tick_callback(self._update_command_queue)
         
         """
         Start streaming continuous data
@@ -122,13 +181,19 @@ class PanTiltIO(object):
         with self.terminate_mutex:
             self.need_to_terminate = True
         rospy.loginfo("Movo pan_tilt has called the Shutdown method, terminating")
+        if self._control_loop is not None:
+            self._control_loop.remove_tick_callback(self._update_command_queue)
         self.js_pub.unregister()
         self.actuator_pub.unregister()
         self.s.unregister()
         self._jcs_pub.unregister()
         self._jcc.unregister()
         self._jc_srv.shutdown()
-        self.comm.Close()
+        get_link_diagnostics().unregister(self._link_monitor)
+        if self._shm is not None:
+            self._shm.close()
+        if self.comm is not None:
+            self.comm.Close()
         self.tx_queue_.close()
         self.rx_queue_.close()    
     
@@ -142,9 +207,15 @@ class PanTiltIO(object):
             result = select.select([self.rx_queue_._reader],[],[],0.02)
             if len(result[0]) > 0:
                 data = result[0][0].recv()
-                with self.terminate_mutex:
-                    if not self.need_to_terminate:
-                        self._handle_rsp(data)
+                if self._rx_stamped:
+                    self._rx_callback(data[0],data[1])
+                else:
+                    self._rx_callback(data)
+
+    def _rx_callback(self,data,rx_stamp=None):
+        with self.terminate_mutex:
+            if not self.need_to_terminate:
+                self._handle_rsp(data,rx_stamp)
                         
     def _handle_state_query(self,req):
         tmp = QueryTrajectoryStateResponse()
@@ -156,37 +227,121 @@ class PanTiltIO(object):
     
     def _update_command_queue(self,event):
         """
-        Send it
+        Sample the active trajectory for the current time and send the
+        setpoint when it moved more than the deadband
         """
-        if not self._cmd_buffer.empty():
-            tmp = self._cmd_buffer.get_nowait()
-            
-            cmds = [KINOVA_ACTUATOR_CMD_ID,[convert_float_to_u32(tmp.positions[0]),
-                                            convert_float_to_u32(tmp.velocities[0]),
-                                            convert_float_to_u32(tmp.accelerations[0]),
-                                            convert_float_to_u32(tmp.positions[1]),
-                                            convert_float_to_u32(tmp.velocities[1]),
-                                            convert_float_to_u32(tmp.accelerations[1])]]
-            
-            self._last_cmd = tmp
-            
-            cmd_bytes = generate_cmd_bytes(cmds)
-            self.tx_queue_.put(cmd_bytes)
+        with self._cmd_mutex:
+            self._send_setpoint()
+
+    def _send_setpoint(self):
+        setpoint = self._streamer.sample(rospy.get_time())
+        if setpoint is None:
+            return
+        positions,velocities,accelerations = setpoint
+        cmd_velocities,cmd_accelerations = velocities,accelerations
+        if self._streamer.timed():
+            """
+            The actuators track the streamed positions at their velocity
+            limit, the desired state keeps the sampled velocities
+            """
+            cmd_velocities = [STREAM_VELOCITY_LIMIT]*2
+            cmd_accelerations = [0.0]*2
+
+        cmd = [positions[0],cmd_velocities[0],cmd_accelerations[0],positions[1],cmd_velocities[1],cmd_accelerations[1]]
+        if not self._streamer.changed(cmd):
+            return
+
+        cmds = [KINOVA_ACTUATOR_CMD_ID,[convert_float_to_u32(value) for value in cmd]]
         
-    def _add_motion_command_to_queue(self,command):
-        tmp = JointTrajectory()
-        tmp.header = command.header
-        tmp.joint_names = ['pan_joint','pan_joint']
-        tmp.points = [JointTrajectoryPoint()]
-        tmp.points[0].positions = [command.pan_cmd.pos_rad,command.tilt_cmd.pos_rad]
-        tmp.points[0].velocities = [command.pan_cmd.vel_rps,command.tilt_cmd.vel_rps]
-        tmp.points[0].accelerations = [command.pan_cmd.acc_rps2,command.tilt_cmd.acc_rps2]
+        tmp = JointTrajectoryPoint()
+        tmp.positions = positions
+        tmp.velocities = velocities
+        tmp.accelerations = accelerations
+        self._last_cmd = tmp
         
-        self._cmd_buffer.put(tmp.points[0])
+        cmd_bytes = generate_cmd_bytes(cmds)
+        self.tx_queue_.put(cmd_bytes)
+        self._link_monitor.request_sent('command')
+        
+    def command_setpoint(self,positions,velocities,accelerations):
+        """
+        A setpoint (pan, tilt) that preempts any trajectory and is held, used
+        directly by trajectory servers hosted in the same process, with a
+        control loop it is sent without waiting for the next tick
+        """
+        with self._cmd_mutex:
+            self._streamer.set_point(positions,velocities,accelerations)
+            self._streamer.reset_sent()
+            if self._control_loop is not None:
+                self._send_setpoint()
+
+    def joint_state(self):
+        """
+        The latest joint states, updated in place with every frame
+        """
+        return self.js
+
+    def wait_for_feedback(self,timeout=None):
+        """
+        True once the first valid feedback frame was decoded, until then the
+        joint states hold placeholders
+        """
+        return self._first_frame.wait(timeout)
+
+    def _add_motion_command_to_queue(self,command):
+        self.command_setpoint([command.pan_cmd.pos_rad,command.tilt_cmd.pos_rad],
+                              [command.pan_cmd.vel_rps,command.tilt_cmd.vel_rps],
+                              [command.pan_cmd.acc_rps2,command.tilt_cmd.acc_rps2])
         
     def _add_traj_command_to_queue(self,msg):
-        for pnt in msg.points:
-            self._cmd_buffer.put(pnt)
+        """
+        A trajectory replaces the active one and is played back on its
+        time_from_start, starting at the header stamp (now when it is zero).
+        An empty trajectory stops at the current setpoint. The first setpoint
+        of a new command is always sent, even inside the deadband.
+        """
+        if (0 == len(msg.points)):
+            with self._cmd_mutex:
+                self._streamer.set_point(self._last_cmd.positions or self._actual_positions(),[STREAM_VELOCITY_LIMIT]*2,[0.0]*2)
+                self._streamer.reset_sent()
+            return
+
+        try:
+            order = [msg.joint_names.index(name) for name in PAN_TILT_JOINTS] if msg.joint_names else [0,1]
+        except ValueError:
+            rospy.logerr("head trajectories must name %s" % ' and '.join(PAN_TILT_JOINTS))
+            return
+
+        start_time = msg.header.stamp.to_sec()
+        if (0.0 == start_time):
+            start_time = rospy.get_time()
+
+        times = [pnt.time_from_start.to_sec() for pnt in msg.points]
+        positions = [[pnt.positions[k] for k in order] for pnt in msg.points]
+        velocities = None
+        if all([len(pnt.velocities) for pnt in msg.points]):
+            velocities = [[pnt.velocities[k] for k in order] for pnt in msg.points]
+        
+        """
+        A trajectory that starts in the future moves there from the current
+        setpoint
+        """
+        if (times[0] > 0.0):
+            times.insert(0,0.0)
+            positions.insert(0,list(self._last_cmd.positions or self._actual_positions()))
+            if velocities is not None:
+                velocities.insert(0,[0.0,0.0])
+
+        with self._cmd_mutex:
+            try:
+                self._streamer.set_trajectory(start_time,times,positions,velocities)
+            except ValueError as e:
+                rospy.logerr("rejected head trajectory: %s" % e)
+                return
+            self._streamer.reset_sent()
+
+    def _actual_positions(self):
+        return [self.actuator_data.pan.pos_rad,self.actuator_data.tilt.pos_rad]
             
     def _add_config_command_to_queue(self,gp_cmd, gp_param):
         try:
@@ -197,75 +352,74 @@ class PanTiltIO(object):
             rospy.logerr("Config param failed, it is probably not known")
             return
 
-    def _handle_rsp(self,data_bytes):
+    def _handle_rsp(self,data_bytes,rx_stamp=None):
         valid_data = validate_response(data_bytes,KINOVA_ACTUATOR_RSP_SIZE_BYTES)
         if (False == valid_data):
             self.last_rsp_rcvd = rospy.get_time()
+            self._link_monitor.invalid_frame()
             rospy.logerr("bad movo pan_tilt data packet")
             return
         
         self.last_rsp_rcvd = rospy.get_time()
+        self._link_monitor.frame_received(rx_stamp)
+        self._link_monitor.response_received('command',rx_stamp)
+        if not self._first_frame.is_set():
+            self._first_frame.set()
         
-        data_bytes = data_bytes[2:]
-
-        rsp_data  = array.array('I',data_bytes.tostring()).tolist()       
-        rsp_data = rsp_data[:(len(rsp_data)-1)]
-        
-        rsp = [convert_u32_to_float(i) for i in rsp_data]
-        
-        self.actuator_data.header.stamp = rospy.get_rostime()
+        """
+        One unpack decodes both actuators straight into the feedback message
+        """
+        if rx_stamp is None:
+            stamp = rospy.get_rostime()
+        else:
+            stamp = rospy.Time.from_sec(rx_stamp)
+        self.actuator_data.header.stamp = stamp
         self.actuator_data.header.seq +=1
-        for i in range(2):
-            if (i==0):
-                self.actuator_data.pan.current =  (rsp[10*i])
-                self.actuator_data.pan.pos_rad =  (rsp[10*i+1])
-                self.actuator_data.pan.vel_rps =  (rsp[10*i+2])
-                self.actuator_data.pan.torque_nm =  (rsp[10*i+3])
-                self.actuator_data.pan.pwm =  (rsp[10*i+4])
-                self.actuator_data.pan.encoder_rad =  (rsp[10*i+5])
-                self.actuator_data.pan.accel.x =  (rsp[10*i+6])
-                self.actuator_data.pan.accel.y =  (rsp[10*i+7])
-                self.actuator_data.pan.accel.z =  (rsp[10*i+8])
-                self.actuator_data.pan.temperature_degC =  (rsp[10*i+9])
-            else:
-                self.actuator_data.tilt.current =  (rsp[10*i])
-                self.actuator_data.tilt.pos_rad =  (rsp[10*i+1])
-                self.actuator_data.tilt.vel_rps =  (rsp[10*i+2])
-                self.actuator_data.tilt.torque_nm =  (rsp[10*i+3])
-                self.actuator_data.tilt.pwm =  (rsp[10*i+4])
-                self.actuator_data.tilt.encoder_rad =  (rsp[10*i+5])
-                self.actuator_data.tilt.accel.x =  (rsp[10*i+6])
-                self.actuator_data.tilt.accel.y =  (rsp[10*i+7])
-                self.actuator_data.tilt.accel.z =  (rsp[10*i+8])
-                self.actuator_data.tilt.temperature_degC =  (rsp[10*i+9])
+        pan = self.actuator_data.pan
+        tilt = self.actuator_data.tilt
+        (pan.current,pan.pos_rad,pan.vel_rps,pan.torque_nm,pan.pwm,pan.encoder_rad,
+         pan.accel.x,pan.accel.y,pan.accel.z,pan.temperature_degC,
+         tilt.current,tilt.pos_rad,tilt.vel_rps,tilt.torque_nm,tilt.pwm,tilt.encoder_rad,
+         tilt.accel.x,tilt.accel.y,tilt.accel.z,tilt.temperature_degC) = self._rsp_decoder.unpack(data_bytes)
+
+        if self._shm is not None:
+            self._shm.write((stamp.to_sec(),
+                             pan.pos_rad,pan.vel_rps,pan.torque_nm,
+                             tilt.pos_rad,tilt.vel_rps,tilt.torque_nm))
 
-        if not rospy.is_shutdown():
+        if rospy.is_shutdown():
+            return
+
+        if self._data_policy.should_publish():
             self.actuator_pub.publish(self.actuator_data)
             
-            self.js.header.stamp = self.actuator_data.header.stamp
-            self.js.name = ['pan_joint','tilt_joint']
-            self.js.position = [self.actuator_data.pan.pos_rad,self.actuator_data.tilt.pos_rad]
-            self.js.velocity = [self.actuator_data.pan.vel_rps,self.actuator_data.tilt.vel_rps]
-            self.js.effort = [self.actuator_data.pan.torque_nm,self.actuator_data.tilt.torque_nm]
-            
+        """
+        The controller state shares the position and velocity lists of the
+        joint states
+        """
+        self.js.header.stamp = stamp
+        self.js.position[0] = pan.pos_rad
+        self.js.position[1] = tilt.pos_rad
+        self.js.velocity[0] = pan.vel_rps
+        self.js.velocity[1] = tilt.vel_rps
+        self.js.effort[0] = pan.torque_nm
+        self.js.effort[1] = tilt.torque_nm
+        if self._js_policy.should_publish(self.js.position):
             self.js_pub.publish(self.js)
             
-            self._jcs.header.stamp = self.actuator_data.header.stamp
-            self._jcs.joint_names = ['pan_joint','tilt_joint']
-            self._jcs.desired = self._last_cmd
-            self._jcs.actual.positions = self.js.position
-            self._jcs.actual.velocities = self.js.velocity
-            self._jcs.actual.accelerations = [0.0,0.0]
-            try:
-                self._jcs.error.positions = map(operator.sub,self._jcs.desired.positions,self._jcs.actual.positions)
-                self._jcs.error.velocities = map(operator.sub,self._jcs.desired.velocities,self._jcs.actual.velocities)
-            except:
-                self._jcs.error.positions = [0.0]*2
-                self._jcs.error.velocities = [0.0]*2
+        if self._jcs_policy.should_publish(self.js.position):
+            self._jcs.header.stamp = stamp
+            desired = self._last_cmd
+            if (2 == len(desired.positions)) and (2 == len(desired.velocities)):
+                self._jcs.desired = desired
+                self._jcs.error.positions[0] = desired.positions[0] - pan.pos_rad
+                self._jcs.error.positions[1] = desired.positions[1] - tilt.pos_rad
+                self._jcs.error.velocities[0] = desired.velocities[0] - pan.vel_rps
+                self._jcs.error.velocities[1] = desired.velocities[1] - tilt.vel_rps
+            else:
                 self._jcs.desired = self._jcs.actual
-                self._last_cmd = self._jcs.actual 
-                
-            self._jcs.error.accelerations = [0.0,0.0]
+                self._jcs.error.positions[0] = self._jcs.error.positions[1] = 0.0
+                self._jcs.error.velocities[0] = self._jcs.error.velocities[1] = 0.0
             self._jcs_pub.publish(self._jcs)
             
         rospy.logdebug("feedback received from movo")
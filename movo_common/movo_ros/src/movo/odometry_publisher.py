@@ -0,0 +1,146 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   odometry_publisher.py
+
+ \brief  Odometry and transform publisher with preallocated messages
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from nav_msgs.msg import Odometry
+from geometry_msgs.msg import TransformStamped
+import threading
+import rospy
+import math
+import tf
+
+"""
+One transform broadcaster is shared by the whole process, creating one per
+message registers a new publisher each time
+"""
+_tf_broadcaster = None
+_tf_broadcaster_mutex = threading.Lock()
+
+def get_tf_broadcaster():
+    global _tf_broadcaster
+    with _tf_broadcaster_mutex:
+        if _tf_broadcaster is None:
+            _tf_broadcaster = tf.TransformBroadcaster()
+        return _tf_broadcaster
+
+def quaternion_to_yaw(q):
+    """
+    Yaw of a quaternion message, wrapped to [-pi,pi)
+    """
+    yaw = math.atan2(2.0*(q.w*q.z + q.x*q.y),1.0 - 2.0*(q.y*q.y + q.z*q.z))
+    return ( yaw + math.pi) % (2 * math.pi ) - math.pi
+
+class OdometryPublisher(object):
+    """
+    Publishes planar odometry and optionally the matching transform from
+    message objects that are allocated once and updated in place.
+    """
+    def __init__(self,topic,frame_id='odom',child_frame_id='base_link',covariance=None,send_tf=False):
+        self.msg = Odometry()
+        self.msg.header.frame_id = frame_id
+        self.msg.child_frame_id = child_frame_id
+        if covariance is not None:
+            self.msg.pose.covariance = list(covariance)
+            self.msg.twist.covariance = list(covariance)
+        self._pub = rospy.Publisher(topic, Odometry, queue_size=10)
+
+        self._transform = None
+        if send_tf:
+            self._broadcaster = get_tf_broadcaster()
+            self._transform = TransformStamped()
+            self._transform.header.frame_id = frame_id
+            self._transform.child_frame_id = child_frame_id
+
+    def set_pose(self,x,y,yaw):
+        pose = self.msg.pose.pose
+        pose.position.x = x
+        pose.position.y = y
+        pose.position.z = 0.0
+        half_yaw = 0.5*yaw
+        pose.orientation.x = 0.0
+        pose.orientation.y = 0.0
+        pose.orientation.z = math.sin(half_yaw)
+        pose.orientation.w = math.cos(half_yaw)
+
+    def copy_pose(self,pose_with_covariance):
+        """
+        Copies a PoseWithCovariance field by field so the buffer never
+        aliases a received message
+        """
+        src = pose_with_covariance.pose
+        pose = self.msg.pose.pose
+        pose.position.x = src.position.x
+        pose.position.y = src.position.y
+        pose.position.z = src.position.z
+        pose.orientation.x = src.orientation.x
+        pose.orientation.y = src.orientation.y
+        pose.orientation.z = src.orientation.z
+        pose.orientation.w = src.orientation.w
+        self.msg.pose.covariance = pose_with_covariance.covariance
+
+    def set_twist(self,x_vel,y_vel,yaw_rate):
+        twist = self.msg.twist.twist
+        twist.linear.x = x_vel
+        twist.linear.y = y_vel
+        twist.linear.z = 0.0
+        twist.angular.x = 0.0
+        twist.angular.y = 0.0
+        twist.angular.z = yaw_rate
+
+    def publish(self,stamp):
+        self.msg.header.stamp = stamp
+        self.msg.header.seq += 1
+        self._pub.publish(self.msg)
+
+    def send_transform(self,stamp,planar=True):
+        """
+        Broadcasts the pose of the last published message, planar drops the
+        height as the base odometry always has
+        """
+        if self._transform is None:
+            return
+        pose = self.msg.pose.pose
+        transform = self._transform.transform
+        self._transform.header.stamp = stamp
+        transform.translation.x = pose.position.x
+        transform.translation.y = pose.position.y
+        transform.translation.z = 0.0 if planar else pose.position.z
+        transform.rotation.x = pose.orientation.x
+        transform.rotation.y = pose.orientation.y
+        transform.rotation.z = pose.orientation.z
+        transform.rotation.w = pose.orientation.w
+        self._broadcaster.sendTransformMessage(self._transform)
+
+    def unregister(self):
+        self._pub.unregister()
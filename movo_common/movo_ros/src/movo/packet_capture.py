@@ -0,0 +1,316 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   packet_capture.py
+
+ \brief  Raw datagram capture to a memory-mapped log and deterministic replay
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import array
+import atexit
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+
+"""
+The log starts with a file header, every record is a record header followed
+by the datagram. The index file next to it holds the offset of every record
+as a little endian u64 so a reader can seek without scanning the log.
+"""
+CAPTURE_MAGIC        = b'MOVOCAP1'
+CAPTURE_HEADER       = struct.Struct('<8sI')
+CAPTURE_VERSION      = 1
+RECORD_HEADER        = struct.Struct('<IdB4sH')
+INDEX_ENTRY          = struct.Struct('<Q')
+CAPTURE_CHUNK_SIZE   = 16*1024*1024
+
+DIR_TX = 0
+DIR_RX = 1
+
+def index_path(path):
+    return path + '.idx'
+
+class PacketCapture(object):
+    """
+    Records every datagram of the links with its time, endpoint and direction.
+
+    record is called from the I/O threads and only copies the datagram into a
+    preallocated ring slot, it never touches the file and never waits for the
+    writer. When the ring is full the datagram is counted in dropped. The
+    writer thread moves the records to the memory-mapped log and flushes it
+    every flush_period seconds, the log grows chunk_size bytes at a time and
+    is truncated to its content when the capture is closed.
+    """
+    def __init__(self,path,ring_slots=4096,max_packet_size=1500,flush_period=0.1,chunk_size=CAPTURE_CHUNK_SIZE):
+        self.path = path
+        self.max_packet_size = max_packet_size
+        self.flush_period = flush_period
+        self.chunk_size = chunk_size
+        self.records = 0
+        self.dropped = 0
+
+        self._slots = [bytearray(max_packet_size) for i in range(ring_slots)]
+        self._lengths = [0]*ring_slots
+        self._stamps = [0.0]*ring_slots
+        self._directions = [0]*ring_slots
+        self._addresses = [None]*ring_slots
+        self._num_slots = ring_slots
+        self._head = 0
+        self._tail = 0
+        self._mutex = threading.Lock()
+
+        self._file = open(path,'w+b')
+        self._index = open(index_path(path),'wb')
+        self._size = chunk_size
+        self._file.truncate(self._size)
+        self._map = mmap.mmap(self._file.fileno(),self._size)
+        self._map[0:CAPTURE_HEADER.size] = CAPTURE_HEADER.pack(CAPTURE_MAGIC,CAPTURE_VERSION)
+        self._offset = CAPTURE_HEADER.size
+        self._packed_addresses = dict()
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target = self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def record(self,direction,remote_address,data,stamp=None):
+        if stamp is None:
+            stamp = time.time()
+        length = min(len(data),self.max_packet_size)
+        with self._mutex:
+            if ((self._head - self._tail) >= self._num_slots):
+                self.dropped += 1
+                return
+            i = self._head % self._num_slots
+            self._slots[i][0:length] = data[0:length]
+            self._lengths[i] = length
+            self._stamps[i] = stamp
+            self._directions[i] = direction
+            self._addresses[i] = remote_address
+            self._head += 1
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._drain()
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self._offset)
+        self._file.close()
+        self._index.close()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_period):
+            if self._drain():
+                self._map.flush()
+                self._index.flush()
+
+    def _pack_address(self,address):
+        packed = self._packed_addresses.get(address)
+        if packed is None:
+            packed = (socket.inet_aton(socket.gethostbyname(address[0])),address[1])
+            self._packed_addresses[address] = packed
+        return packed
+
+    def _grow(self,needed):
+        self._map.close()
+        while (self._size < needed):
+            self._size += self.chunk_size
+        self._file.truncate(self._size)
+        self._map = mmap.mmap(self._file.fileno(),self._size)
+
+    def _drain(self):
+        """
+        Moves every record in the ring to the log, only the writer thread
+        advances the tail so the slots are copied without holding the lock
+        """
+        head = self._head
+        if (head == self._tail):
+            return False
+        while (self._tail < head):
+            i = self._tail % self._num_slots
+            length = self._lengths[i]
+            ip,port = self._pack_address(self._addresses[i])
+            end = self._offset + RECORD_HEADER.size + length
+            if (end > self._size):
+                self._grow(end)
+            RECORD_HEADER.pack_into(self._map,self._offset,length,self._stamps[i],self._directions[i],ip,port)
+            self._map[self._offset+RECORD_HEADER.size:end] = bytes(self._slots[i][0:length])
+            self._index.write(INDEX_ENTRY.pack(self._offset))
+            self._offset = end
+            self.records += 1
+            with self._mutex:
+                self._tail += 1
+        return True
+
+class CaptureRecord(object):
+    __slots__ = ['stamp','direction','remote_address','data']
+    def __init__(self,stamp,direction,remote_address,data):
+        self.stamp = stamp
+        self.direction = direction
+        self.remote_address = remote_address
+        self.data = data
+
+class CaptureReader(object):
+    """
+    Reads a capture log, records are returned in the order they were captured
+    with the datagram as an array('B') like the receive queues carry it
+    """
+    def __init__(self,path):
+        self.path = path
+        self._file = open(path,'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(),size,access=mmap.ACCESS_READ)
+        magic,version = CAPTURE_HEADER.unpack_from(self._map,0)
+        if (magic != CAPTURE_MAGIC) or (version != CAPTURE_VERSION):
+            self.close()
+            raise ValueError('%s is not a MOVO capture' % path)
+        self._offsets = self._load_index(size)
+
+    def _load_index(self,size):
+        """
+        The index is rebuilt by scanning the log when it is missing or does
+        not match, for example when the capture was not closed
+        """
+        path = index_path(self.path)
+        if os.path.exists(path):
+            with open(path,'rb') as f:
+                raw = f.read()
+            count = len(raw)//INDEX_ENTRY.size
+            offsets = list(struct.unpack('<%dQ' % count,raw[:count*INDEX_ENTRY.size]))
+            if (count > 0) and ((offsets[-1] + RECORD_HEADER.size) <= size):
+                return offsets
+
+        offsets = []
+        offset = CAPTURE_HEADER.size
+        while ((offset + RECORD_HEADER.size) <= size):
+            length = RECORD_HEADER.unpack_from(self._map,offset)[0]
+            if (0 == length) or ((offset + RECORD_HEADER.size + length) > size):
+                break
+            offsets.append(offset)
+            offset += RECORD_HEADER.size + length
+        return offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self,i):
+        offset = self._offsets[i]
+        length,stamp,direction,ip,port = RECORD_HEADER.unpack_from(self._map,offset)
+        start = offset + RECORD_HEADER.size
+        data = array.array('B',self._map[start:start+length])
+        return CaptureRecord(stamp,direction,(socket.inet_ntoa(ip),port),data)
+
+    def __iter__(self):
+        for i in range(len(self._offsets)):
+            yield self[i]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+class ReplayStats(object):
+    def __init__(self):
+        self.frames = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    def rate(self):
+        if (self.elapsed > 0.0):
+            return self.frames/self.elapsed
+        return 0.0
+
+    def __str__(self):
+        return 'frames: %d skipped: %d elapsed: %.3f s rate: %.1f frames/s' % (self.frames,self.skipped,self.elapsed,self.rate())
+
+class PacketReplay(object):
+    """
+    Feeds the datagrams of a capture to the endpoint handlers. handlers maps
+    the remote port of an endpoint to a callable taking (data, stamp), the
+    stamp is the recorded receive time. Only the received datagrams are
+    replayed by default.
+
+    speed 1.0 keeps the recorded timing, a larger speed compresses it and a
+    speed of 0 replays as fast as the handlers run which is a repeatable
+    throughput benchmark of the parse and publish pipeline.
+    """
+    def __init__(self,reader,handlers,speed=1.0,directions=(DIR_RX,)):
+        self.reader = reader
+        self.handlers = handlers
+        self.speed = speed
+        self.directions = directions
+        self.stats = ReplayStats()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        stats = self.stats
+        start = time.time()
+        first_stamp = None
+        for record in self.reader:
+            if self._stop.is_set():
+                break
+            handler = self.handlers.get(record.remote_address[1])
+            if (handler is None) or (record.direction not in self.directions):
+                stats.skipped += 1
+                continue
+            if (self.speed > 0.0):
+                if first_stamp is None:
+                    first_stamp = record.stamp
+                delay = start + (record.stamp - first_stamp)/self.speed - time.time()
+                if (delay > 0.0) and self._stop.wait(delay):
+                    break
+            handler(record.data,record.stamp)
+            stats.frames += 1
+        stats.elapsed = time.time() - start
+        return stats
+
+_captures = dict()
+_captures_mutex = threading.Lock()
+
+def get_packet_capture(path):
+    """
+    Returns the capture writing to path, every link of the process configured
+    with the same path shares it. It is closed when the process exits.
+    """
+    with _captures_mutex:
+        capture = _captures.get(path)
+        if capture is None:
+            capture = PacketCapture(path)
+            _captures[path] = capture
+            atexit.register(capture.close)
+        return capture
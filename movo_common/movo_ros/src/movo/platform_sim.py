@@ -0,0 +1,565 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   platform_sim.py
+
+ \brief  Loopback UDP simulator of the MOVO embedded platform
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from system_defines import *
+from crc32 import calc_crc32,valid_crc32
+from cmd_templates import COMMAND_WORD_COUNTS,CMD_ID_SIZE,CMD_CRC_SIZE
+from movo_gripper_interface.modbus_crc import compute_modbus_rtu_crc,verify_modbus_rtu_crc
+import collections
+import heapq
+import random
+import select
+import socket
+import struct
+import math
+import time
+
+"""
+Ports served by the embedded platform
+"""
+BASE_PORT            = 8080
+LINEAR_ACTUATOR_PORT = 6236
+PAN_TILT_PORT        = 6237
+GRIPPER_PORT         = 6238
+
+DEFAULT_SIM_PORTS = dict({'base':BASE_PORT,
+                          'linear_actuator':LINEAR_ACTUATOR_PORT,
+                          'pan_tilt':PAN_TILT_PORT,
+                          'gripper':GRIPPER_PORT})
+
+"""
+Commands the base stops following after this long without a new one
+"""
+MOTION_CMD_TIMEOUT_SEC = 0.2
+
+STANDBY_STATE = MOVO_MODES_DICT[STANDBY_REQUEST]
+TRACTOR_STATE = MOVO_MODES_DICT[TRACTOR_REQUEST]
+
+GRIPPER_FRAME_SIZE = 72
+PAN_TILT_NUM_WORDS = 20
+
+def _u32_to_float(value):
+    return struct.unpack('<f',struct.pack('<I',value))[0]
+
+def _float_to_u32(value):
+    return struct.unpack('<I',struct.pack('<f',value))[0]
+
+def _approach(value,target,max_step):
+    if (target > value):
+        return min(value + max_step,target)
+    return max(value - max_step,target)
+
+class SimStats(object):
+    def __init__(self):
+        self.rx_frames = 0
+        self.rx_bad_crc = 0
+        self.rx_bad_length = 0
+        self.rx_unknown = 0
+        self.tx_frames = 0
+        self.tx_dropped = 0
+        self.tx_reordered = 0
+
+    def __str__(self):
+        return ("rx %d (bad crc %d, bad length %d, unknown %d) tx %d (dropped %d, reordered %d)" %
+                (self.rx_frames,self.rx_bad_crc,self.rx_bad_length,self.rx_unknown,
+                 self.tx_frames,self.tx_dropped,self.tx_reordered))
+
+class LinkImpairments(object):
+    """
+    Loss, reordering and latency applied to every response. A reordered
+    frame is held back by reorder_delay so the next frame overtakes it.
+    """
+    def __init__(self,loss=0.0,reorder=0.0,latency=0.0,jitter=0.0,reorder_delay=0.01,seed=None):
+        self.loss = loss
+        self.reorder = reorder
+        self.latency = latency
+        self.jitter = jitter
+        self.reorder_delay = reorder_delay
+        self._random = random.Random(seed)
+
+    def delay(self,stats):
+        """
+        Returns the delay before the frame is sent or None to drop it
+        """
+        if (self.loss > 0.0) and (self._random.random() < self.loss):
+            stats.tx_dropped += 1
+            return None
+        delay = self.latency
+        if (self.jitter > 0.0):
+            delay += self._random.uniform(0.0,self.jitter)
+        if (self.reorder > 0.0) and (self._random.random() < self.reorder):
+            stats.tx_reordered += 1
+            delay += self.reorder_delay
+        return delay
+
+class BaseModel(object):
+    """
+    Kinematic model of the omnidirectional base and the linear actuator. The
+    velocities follow the commands within the configured limits and are
+    integrated into the odometry, commands are only followed in tractor.
+    """
+    def __init__(self):
+        self.words = [0]*NUMBER_OF_MOVO_RSP_WORDS
+        self.op_state = STANDBY_STATE
+        self.op_time = 0.0
+        self.cmd = (0.0,0.0,0.0)
+        self.cmd_time = 0.0
+        self.vel = [0.0,0.0,0.0]
+        self.accel = [0.0,0.0,0.0]
+        self.pose = [0.0,0.0,0.0]
+        self.wheel_pos = [0.0]*4
+        self.wheel_vel = [0.0]*4
+        self.lin_target = 0.0
+        self.lin_pos = 0.0
+        self.lin_vel = 0.0
+        self.lin_vel_limit = 0.1
+        self.reset_config()
+
+    def reset_config(self):
+        self.config = [_float_to_u32(DEFAULT_MAXIMUM_VELOCITY_MPS),
+                       _float_to_u32(DEFAULT_MAXIMUM_VELOCITY_MPS),
+                       _float_to_u32(DEFAULT_MAXIMUM_ACCELERATION_MPS2),
+                       _float_to_u32(DEFAULT_MAXIMUM_DECELERATION_MPS2),
+                       _float_to_u32(DEFAULT_MAXIMUM_DTZ_DECEL_RATE_MPS2),
+                       _float_to_u32(DEFAULT_MAXIMUM_YAW_RATE_RPS),
+                       _float_to_u32(DEFAULT_MAX_YAW_ACCEL_RPS2),
+                       _float_to_u32(DEFAULT_WHEEL_DIAMETER_M),
+                       _float_to_u32(DEFAULT_WHEEL_BASE_LENGTH_M),
+                       _float_to_u32(DEFAULT_WHEEL_TRACK_WIDTH_M),
+                       _float_to_u32(DEFAULT_TRANSMISSION_RATIO),
+                       0]
+        self.eth_config = [0x0A42AB01,BASE_PORT,0xFFFFFF00,0x0A42AB01]
+
+    def config_float(self,index):
+        return _u32_to_float(self.config[index])
+
+    def reset_odometry(self,bitmap):
+        if (bitmap & RESET_LINEAR_POSITION):
+            self.lin_pos = 0.0
+        for i,mask in enumerate([RESET_RIGHT_FRONT_POSITION,RESET_LEFT_FRONT_POSITION,
+                                 RESET_RIGHT_REAR_POSITION,RESET_LEFT_REAR_POSITION]):
+            if (bitmap & mask):
+                self.wheel_pos[i] = 0.0
+        if (bitmap & RESET_ODOM_ESTIMATE):
+            self.pose = [0.0,0.0,0.0]
+
+    def step(self,dt,now):
+        self.op_time += dt
+        target = [0.0,0.0,0.0]
+        if (TRACTOR_STATE == self.op_state) and ((now - self.cmd_time) < MOTION_CMD_TIMEOUT_SEC):
+            target = [max(-self.config_float(X_VEL_LIMIT_INDEX),min(self.cmd[0],self.config_float(X_VEL_LIMIT_INDEX))),
+                      max(-self.config_float(Y_VEL_LIMIT_INDEX),min(self.cmd[1],self.config_float(Y_VEL_LIMIT_INDEX))),
+                      max(-self.config_float(YAW_RATE_LIMIT_INDEX),min(self.cmd[2],self.config_float(YAW_RATE_LIMIT_INDEX)))]
+
+        limits = [self.config_float(ACCEL_LIMIT_INDEX),
+                  self.config_float(ACCEL_LIMIT_INDEX),
+                  self.config_float(YAW_ACCEL_LIMIT_INDEX)]
+        for i in range(3):
+            if (abs(target[i]) < abs(self.vel[i])) and (i < 2):
+                limit = self.config_float(DECEL_LIMIT_INDEX)
+            else:
+                limit = limits[i]
+            new_vel = _approach(self.vel[i],target[i],limit*dt)
+            self.accel[i] = (new_vel - self.vel[i])/dt if (dt > 0.0) else 0.0
+            self.vel[i] = new_vel
+
+        yaw = self.pose[2]
+        self.pose[0] += (self.vel[0]*math.cos(yaw) - self.vel[1]*math.sin(yaw))*dt
+        self.pose[1] += (self.vel[0]*math.sin(yaw) + self.vel[1]*math.cos(yaw))*dt
+        self.pose[2] += self.vel[2]*dt
+
+        """
+        Mecanum wheel speeds in the order RF, LF, RR, LR
+        """
+        k = 0.5*(self.config_float(WHEEL_BASE_LENGTH_INDEX) + self.config_float(WHEEL_TRACK_WIDTH_INDEX))
+        self.wheel_vel = [self.vel[0] + self.vel[1] + k*self.vel[2],
+                          self.vel[0] - self.vel[1] - k*self.vel[2],
+                          self.vel[0] - self.vel[1] + k*self.vel[2],
+                          self.vel[0] + self.vel[1] - k*self.vel[2]]
+        for i in range(4):
+            self.wheel_pos[i] += self.wheel_vel[i]*dt
+
+        prev = self.lin_pos
+        self.lin_pos = _approach(self.lin_pos,self.lin_target,self.lin_vel_limit*dt)
+        self.lin_vel = (self.lin_pos - prev)/dt if (dt > 0.0) else 0.0
+
+    def fill_words(self):
+        """
+        Every word is kept as its raw 32-bit value, floats are converted
+        """
+        w = self.words
+        f = _float_to_u32
+        w[ROS_OPERATIONAL_TIME_INDEX] = f(self.op_time)
+        w[ROS_OPERATIONAL_STATE_INDEX] = self.op_state
+        w[ROS_BATT_SOC] = f(80.0)
+        w[ROS_BATT_VOLTAGE] = f(48.0)
+        w[ROS_BATT_CURRENT] = f(1.0 + 2.0*(abs(self.vel[0]) + abs(self.vel[1]) + abs(self.vel[2])))
+        w[ROS_BATT_TEMPERATURE] = f(25.0)
+        for i in range(4):
+            w[ROS_LF_MOTOR_SPEED_INDEX+i] = f(self.wheel_vel[i])
+            w[ROS_LF_MOTOR_POSITION_INDEX+i] = f(self.wheel_pos[i])
+            w[ROS_RF_WHEEL_VEL_INDEX+i] = f(self.wheel_vel[i])
+            w[ROS_RF_WHEEL_POS_INDEX+i] = f(self.wheel_pos[i])
+        w[ROS_LIN_MOTOR_SPEED_INDEX] = f(self.lin_vel)
+        w[ROS_LIN_MOTOR_POSITION_INDEX] = f(self.lin_pos)
+        w[ROS_IMU_X_ACC_INDEX] = f(self.accel[0])
+        w[ROS_IMU_Y_ACC_INDEX] = f(self.accel[1])
+        w[ROS_IMU_Z_ACC_INDEX] = f(9.81)
+        w[ROS_IMU_Z_RATE_INDEX] = f(self.vel[2])
+        w[ROS_X_VEL_TARGET_INDEX] = f(self.cmd[0])
+        w[ROS_Y_VEL_TARGET_INDEX] = f(self.cmd[1])
+        w[ROS_YAW_TARGET_INDEX] = f(self.cmd[2])
+        w[ROS_LIN_ACT_TARGET_INDEX] = f(self.lin_target)
+        w[ROS_X_VELOCITY_LIMIT_INDEX] = self.config[X_VEL_LIMIT_INDEX]
+        w[ROS_Y_VELOCITY_LIMIT_INDEX] = self.config[Y_VEL_LIMIT_INDEX]
+        w[ROS_LIN_ACT_VELOCITY_LIMIT_INDEX] = f(self.lin_vel_limit)
+        w[ROS_YAW_RATE_LIMIT_INDEX] = self.config[YAW_RATE_LIMIT_INDEX]
+        w[ROS_LIN_ACT_VEL_INDEX] = f(self.lin_vel)
+        w[ROS_LIN_ACT_POS_INDEX] = f(self.lin_pos)
+        w[ROS_ODOM_X_ACCEL_INDEX] = f(self.accel[0])
+        w[ROS_ODOM_Y_ACCEL_INDEX] = f(self.accel[1])
+        w[ROS_ODOM_YAW_ACCEL_INDEX] = f(self.accel[2])
+        w[ROS_ODOM_X_VELOCITY_INDEX] = f(self.vel[0])
+        w[ROS_ODOM_Y_VELOCITY_INDEX] = f(self.vel[1])
+        w[ROS_ODOM_YAW_VELOCITY_INDEX] = f(self.vel[2])
+        w[ROS_ODOM_X_POSITION_INDEX] = f(self.pose[0])
+        w[ROS_ODOM_Y_POSITION_INDEX] = f(self.pose[1])
+        w[ROS_ODOM_YAW_POSITION_INDEX] = f(self.pose[2])
+        w[START_APP_CONFIG_BLOCK:START_APP_CONFIG_BLOCK+12] = self.config
+        w[ROS_APP_ETH_IP_ADDRESS_INDEX:END_APP_CONFIG_BLOCK] = self.eth_config
+        w[START_FRAM_CONFIG_BLOCK:START_FRAM_CONFIG_BLOCK+12] = self.config
+        w[ROS_FRAM_ETH_IP_ADDRESS_INDEX:END_FRAM_CONFIG_BLOCK] = self.eth_config
+        return w
+
+class PanTiltModel(object):
+    def __init__(self):
+        self.pos = [0.0,0.0]
+        self.vel = [0.0,0.0]
+        self.target = [0.0,0.0]
+        self.vel_limit = [1.0,1.0]
+
+    def command(self,values):
+        self.target = [values[0],values[3]]
+        self.vel_limit = [abs(values[1]) or 1.0,abs(values[4]) or 1.0]
+
+    def step(self,dt):
+        for i in range(2):
+            prev = self.pos[i]
+            self.pos[i] = _approach(self.pos[i],self.target[i],self.vel_limit[i]*dt)
+            self.vel[i] = (self.pos[i] - prev)/dt if (dt > 0.0) else 0.0
+
+    def values(self):
+        """
+        current, position, velocity, torque, pwm, encoder, accel x/y/z and
+        temperature of the pan and then the tilt actuator
+        """
+        rsp = []
+        for i in range(2):
+            rsp += [0.1,self.pos[i],self.vel[i],0.0,0.0,self.pos[i],0.0,0.0,1.0,30.0]
+        return rsp
+
+class GripperModel(object):
+    """
+    Robotiq 85 registers behind the modbus RTU bridge
+    """
+    def __init__(self):
+        self.act = 0
+        self.gto = 0
+        self.pos_req = 0
+        self.pos = 0.0
+        self.speed = 255
+        self.last_time = None
+
+    def step(self,now):
+        if self.last_time is not None and self.act and self.gto:
+            rate = 20.0 + self.speed
+            self.pos = _approach(self.pos,float(self.pos_req),rate*(now - self.last_time))
+        self.last_time = now
+
+    def transact(self,request,now):
+        self.step(now)
+        if (len(request) < 8) or (False == verify_modbus_rtu_crc(request)):
+            return None
+        if (0x10 == request[1]) and (len(request) >= 13):
+            self.act = request[7] & 0x1
+            self.gto = (request[7] >> 3) & 0x1
+            self.pos_req = request[10]
+            self.speed = request[11]
+            rsp = list(request[:6])
+        elif (0x03 == request[1]):
+            at_target = (abs(self.pos - self.pos_req) < 0.5)
+            obj = 3 if (self.gto and at_target) else 0
+            sta = 3 if self.act else 0
+            status = self.act | (self.gto << 3) | (sta << 4) | (obj << 6)
+            rsp = [request[0],0x03,0x10,status,0,0,self.pos_req,int(round(self.pos)),0] + [0]*10
+        else:
+            return None
+        compute_modbus_rtu_crc(rsp)
+        return rsp
+
+class MovoPlatformSim(object):
+    """
+    Serves the base, linear actuator, pan-tilt and gripper ports like the
+    embedded platform does. Commands are checked for their CRC and length,
+    the base and pan-tilt stream responses at the configured rates once the
+    driver requests continuous data, the faultlog and gripper transactions
+    are answered on request. Responses go to the address the last command
+    came from so the driver has to bind another local address than the
+    simulator, for example 127.0.0.2 with the simulator on 127.0.0.1.
+
+    The simulator is single threaded and needs nothing but the standard
+    library so it can be used to load test the drivers on any Linux host.
+    """
+    def __init__(self,ip='127.0.0.1',ports=DEFAULT_SIM_PORTS,base_rate_hz=100.0,pan_tilt_rate_hz=100.0,impairments=None):
+        self.ip = ip
+        self.base_period = 1.0/base_rate_hz
+        self.pan_tilt_period = 1.0/pan_tilt_rate_hz
+        self.impairments = impairments if impairments is not None else LinkImpairments()
+        self.stats = SimStats()
+        self.base = BaseModel()
+        self.pan_tilt = PanTiltModel()
+        self.gripper = GripperModel()
+
+        self.base_streaming = False
+        self.pan_tilt_streaming = False
+        self._base_struct = struct.Struct('=%dI' % NUMBER_OF_MOVO_RSP_WORDS)
+        self._faultlog_struct = struct.Struct('=%dI' % NUMBER_OF_FAULTLOG_WORDS)
+        self._pan_tilt_struct = struct.Struct('=H%df' % PAN_TILT_NUM_WORDS)
+
+        self._socks = dict()
+        self._peers = dict()
+        self._handlers = dict()
+        for name,handler in [('base',self._handle_base),
+                             ('linear_actuator',self._handle_linear_actuator),
+                             ('pan_tilt',self._handle_pan_tilt),
+                             ('gripper',self._handle_gripper)]:
+            sock = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
+            sock.setblocking(0)
+            sock.bind((ip,ports[name]))
+            self._socks[name] = sock
+            self._handlers[sock.fileno()] = (name,handler)
+
+        self._delayed = []
+        self._delayed_seq = 0
+        self._running = False
+
+    def address(self,name):
+        return self._socks[name].getsockname()
+
+    def close(self):
+        for sock in self._socks.values():
+            sock.close()
+
+    def stop(self):
+        self._running = False
+
+    def run(self,duration=None,stats_period=None):
+        self._running = True
+        start = time.time()
+        last = start
+        next_base = start
+        next_pan_tilt = start
+        next_stats = (start + stats_period) if stats_period else None
+        socks = list(self._socks.values())
+
+        while self._running:
+            now = time.time()
+            if (duration is not None) and ((now - start) >= duration):
+                break
+
+            self.base.step(now - last,now)
+            self.pan_tilt.step(now - last)
+            last = now
+
+            if (now >= next_base):
+                if self.base_streaming:
+                    self._send_base_frame()
+                next_base += self.base_period
+                if (next_base < now):
+                    next_base = now + self.base_period
+            if (now >= next_pan_tilt):
+                if self.pan_tilt_streaming:
+                    self._send_pan_tilt_frame()
+                next_pan_tilt += self.pan_tilt_period
+                if (next_pan_tilt < now):
+                    next_pan_tilt = now + self.pan_tilt_period
+            if next_stats is not None and (now >= next_stats):
+                print(self.stats)
+                next_stats += stats_period
+
+            self._flush_delayed(now)
+
+            deadline = min(next_base,next_pan_tilt)
+            if (len(self._delayed) > 0):
+                deadline = min(deadline,self._delayed[0][0])
+            timeout = max(0.0,deadline - time.time())
+            readable = select.select(socks,[],[],timeout)[0]
+            for sock in readable:
+                self._receive(sock)
+
+    def _receive(self,sock):
+        name,handler = self._handlers[sock.fileno()]
+        while True:
+            try:
+                data,peer = sock.recvfrom(2048)
+            except socket.error:
+                return
+            self._peers[name] = peer
+            frame = bytearray(data)
+            if (False == valid_crc32(frame)):
+                self.stats.rx_bad_crc += 1
+                continue
+            self.stats.rx_frames += 1
+            handler(frame)
+
+    def _parse_command(self,frame):
+        """
+        Returns the command ID and the words of a command frame or None when
+        the ID is unknown or the length does not match it
+        """
+        cmd_id = struct.unpack_from('<H',frame,0)[0]
+        num_words = COMMAND_WORD_COUNTS.get(cmd_id)
+        if num_words is None:
+            self.stats.rx_unknown += 1
+            return None
+        if (len(frame) != (CMD_ID_SIZE + 4*num_words + CMD_CRC_SIZE)):
+            self.stats.rx_bad_length += 1
+            return None
+        return cmd_id,struct.unpack_from('<%dI' % num_words,frame,CMD_ID_SIZE)
+
+    def _send(self,name,frame):
+        peer = self._peers.get(name)
+        if peer is None:
+            return
+        delay = self.impairments.delay(self.stats)
+        if delay is None:
+            return
+        if (delay <= 0.0):
+            self._transmit(name,peer,frame)
+        else:
+            heapq.heappush(self._delayed,(time.time() + delay,self._delayed_seq,name,peer,frame))
+            self._delayed_seq += 1
+
+    def _transmit(self,name,peer,frame):
+        try:
+            self._socks[name].sendto(frame,peer)
+            self.stats.tx_frames += 1
+        except socket.error:
+            self.stats.tx_dropped += 1
+
+    def _flush_delayed(self,now):
+        while (len(self._delayed) > 0) and (self._delayed[0][0] <= now):
+            due,seq,name,peer,frame = heapq.heappop(self._delayed)
+            self._transmit(name,peer,frame)
+
+    def _with_crc(self,payload):
+        frame = bytearray(payload)
+        frame += struct.pack('<I',calc_crc32(frame))
+        return frame
+
+    def _send_base_frame(self):
+        self._send('base',self._with_crc(self._base_struct.pack(*self.base.fill_words())))
+
+    def _send_faultlog(self):
+        words = [0]*NUMBER_OF_FAULTLOG_WORDS
+        self._send('base',self._with_crc(self._faultlog_struct.pack(*words)))
+
+    def _send_pan_tilt_frame(self):
+        self._send('pan_tilt',self._with_crc(self._pan_tilt_struct.pack(KINOVA_ACTUATOR_CMD_ID,*self.pan_tilt.values())))
+
+    def _handle_base(self,frame):
+        cmd = self._parse_command(frame)
+        if cmd is None:
+            return
+        cmd_id,words = cmd
+        if (MOTION_CMD_ID == cmd_id):
+            self.base.cmd = tuple(_u32_to_float(w) for w in words)
+            self.base.cmd_time = time.time()
+        elif (GENERAL_PURPOSE_CMD_ID == cmd_id):
+            gp_cmd,gp_param = words
+            if (GENERAL_PURPOSE_CMD_NONE == gp_cmd):
+                self._send_base_frame()
+            elif (GENERAL_PURPOSE_CMD_SET_OPERATIONAL_MODE == gp_cmd):
+                self.base.op_state = MOVO_MODES_DICT.get(gp_param,self.base.op_state)
+            elif (GENERAL_PURPOSE_CMD_SEND_FAULTLOG == gp_cmd):
+                self._send_faultlog()
+            elif (GENERAL_PURPOSE_CMD_RESET_ODOMETRY == gp_cmd):
+                self.base.reset_odometry(gp_param)
+            elif (GENERAL_PURPOSE_CMD_RESET_PARAMS_TO_DEFAULT == gp_cmd):
+                self.base.reset_config()
+            elif (GENERAL_PURPOSE_CMD_SEND_CONTINUOUS_DATA == gp_cmd):
+                self.base_streaming = (0 != gp_param)
+        elif (LOAD_MACH_CONFIG_CMD_ID == cmd_id):
+            self.base.config = list(words)
+        elif (LOAD_ETH_CONFIG_CMD_ID == cmd_id):
+            self.base.eth_config = list(words)
+
+    def _handle_linear_actuator(self,frame):
+        cmd = self._parse_command(frame)
+        if cmd is None:
+            return
+        cmd_id,words = cmd
+        if (LINEAR_ACTUATOR_POSITION_CMD_ID == cmd_id):
+            self.base.lin_target = _u32_to_float(words[0])
+        elif (LINEAR_ACTUATOR_VELOCITY_LIMIT_CMD_ID == cmd_id):
+            self.base.lin_vel_limit = abs(_u32_to_float(words[0]))
+
+    def _handle_pan_tilt(self,frame):
+        cmd = self._parse_command(frame)
+        if cmd is None:
+            return
+        cmd_id,words = cmd
+        if (KINOVA_ACTUATOR_CMD_ID == cmd_id):
+            self.pan_tilt.command([_u32_to_float(w) for w in words])
+        elif (EIB_GENERAL_CMD_ID == cmd_id) and (EIB_GENERAL_CMD_SEND_CONTINUOUS_DATA == words[0]):
+            self.pan_tilt_streaming = (EIB_STREAMING == words[1])
+
+    def _handle_gripper(self,frame):
+        """
+        The bridge frames carry the modbus request length and the expected
+        response length in the header followed by the request
+        """
+        if (len(frame) != GRIPPER_FRAME_SIZE):
+            self.stats.rx_bad_length += 1
+            return
+        request = frame[4:4+frame[2]]
+        rsp = self.gripper.transact(request,time.time())
+        if rsp is None:
+            self.stats.rx_unknown += 1
+            return
+        payload = bytearray(GRIPPER_FRAME_SIZE - 4)
+        payload[0:4] = frame[0:4]
+        payload[4:4+len(rsp)] = bytearray(rsp)
+        self._send('gripper',self._with_crc(payload))
@@ -0,0 +1,102 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   publish_policy.py
+
+ \brief  Per-topic rate decimation and publish on change for feedback topics
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import rospy
+import time
+
+class PublishPolicy(object):
+    """
+    Decides whether a feedback topic is published for the current frame, it
+    is checked before the message is built so skipped frames cost nothing.
+
+    rate_divider: publish at most every Nth frame
+    on_change:    only publish when the values differ from the last
+                  published ones by more than deadband
+    heartbeat_hz: with on_change, publish at least this often even if
+                  nothing changed (0 only publishes on change)
+
+    The default policy publishes every frame.
+    """
+    def __init__(self,rate_divider=1,on_change=False,deadband=0.0,heartbeat_hz=0.0):
+        self.rate_divider = max(int(rate_divider),1)
+        self.on_change = on_change
+        self.deadband = deadband
+        self.heartbeat_period = 0.0
+        if (heartbeat_hz > 0.0):
+            self.heartbeat_period = 1.0/heartbeat_hz
+        self._always = (1 == self.rate_divider) and (False == self.on_change)
+        self._frames = 0
+        self._last_values = None
+        self._last_publish = 0.0
+
+    def _changed(self,values):
+        if (self._last_values is None) or (len(values) != len(self._last_values)):
+            return True
+        if (self.deadband <= 0.0):
+            return (tuple(values) != self._last_values)
+        for new,old in zip(values,self._last_values):
+            if (abs(new - old) > self.deadband):
+                return True
+        return False
+
+    def should_publish(self,values=None):
+        if self._always:
+            return True
+
+        self._frames += 1
+        if (self._frames < self.rate_divider):
+            return False
+        self._frames = 0
+
+        if self.on_change and (values is not None):
+            now = time.time()
+            heartbeat_due = (self.heartbeat_period > 0.0) and ((now - self._last_publish) >= self.heartbeat_period)
+            if not heartbeat_due and not self._changed(values):
+                return False
+            self._last_values = tuple(values)
+            self._last_publish = now
+
+        return True
+
+def get_publish_policy(topic):
+    """
+    Loads the policy for a topic from ~publish_policies/<topic>, e.g.
+    {battery: {rate_divider: 10, on_change: true, deadband: 0.05, heartbeat_hz: 1.0}}
+    """
+    options = rospy.get_param('~publish_policies/%s' % topic,dict())
+    return PublishPolicy(rate_divider=options.get('rate_divider',1),
+                         on_change=options.get('on_change',False),
+                         deadband=options.get('deadband',0.0),
+                         heartbeat_hz=options.get('heartbeat_hz',0.0))
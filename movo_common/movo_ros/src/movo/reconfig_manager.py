@@ -0,0 +1,204 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   reconfig_manager.py
+
+ \brief  Coalesces runtime reconfiguration and pushes it to the platform and
+         the local planner without blocking the reconfigure callback
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from dynamic_reconfigure.client import Client
+import rospy
+import threading
+import time
+
+"""
+Words of the LOAD_MACH_CONFIG command, used to report what changed
+"""
+MACHINE_CONFIG_FIELDS = ['x_vel_limit_mps',
+                         'y_vel_limit_mps',
+                         'accel_limit_mps2',
+                         'decel_limit_mps2',
+                         'dtz_decel_limit_mps2',
+                         'yaw_rate_limit_rps',
+                         'yaw_accel_limit_rps2',
+                         'wheel_diameter_m',
+                         'wheel_base_length_m',
+                         'wheel_track_width_m',
+                         'gear_ratio',
+                         'config_bitmap']
+
+class ReconfigurationManager(object):
+    """
+    Owns the runtime reconfiguration of the platform. The reconfigure callback
+    only records what it wants and returns, a worker thread waits until the
+    requests stop arriving for coalesce_sec and pushes the latest values once:
+
+        general purpose commands are sent, only the last value per parameter
+        the machine configuration is compared with the configuration feedback
+        and LOAD_MACH_CONFIG is sent only when a word differs, it is resent
+        until the feedback matches or max_attempts commands have gone
+        unacknowledged for ack_timeout each
+        the local planner limits go through a dynamic_reconfigure client that
+        is created once and kept
+
+    send queues a command list, config_feedback returns the configuration
+    words the platform reports and notify is called by the receive handler.
+    """
+    def __init__(self,send,config_feedback,planner_name,coalesce_sec=0.2,ack_timeout=0.5,max_attempts=3,planner_timeout=1.0):
+        self._send = send
+        self._config_feedback = config_feedback
+        self.planner_name = planner_name
+        self.coalesce_sec = coalesce_sec
+        self.ack_timeout = ack_timeout
+        self.max_attempts = max_attempts
+        self.planner_timeout = planner_timeout
+
+        self._machine_cmd = None
+        self._gp_cmds = dict()
+        self._planner_changes = dict()
+        self._last_request = 0.0
+        self._planner = None
+        self._awaiting_ack = False
+        self.need_to_terminate = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target = self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def set_machine_config(self,cmd):
+        with self._cond:
+            self._machine_cmd = cmd
+            self._request()
+
+    def set_general_purpose(self,param,cmd):
+        with self._cond:
+            self._gp_cmds[param] = cmd
+            self._request()
+
+    def update_planner(self,changes):
+        with self._cond:
+            self._planner_changes.update(changes)
+            self._request()
+
+    def _request(self):
+        self._last_request = time.time()
+        self._cond.notify()
+
+    def notify(self):
+        """
+        Called for every received frame, it only takes the lock while a
+        configuration is waiting for its acknowledgement
+        """
+        if self._awaiting_ack:
+            with self._cond:
+                self._cond.notify()
+
+    def Shutdown(self):
+        with self._cond:
+            self.need_to_terminate = True
+            self._cond.notify()
+        self._thread.join()
+        if self._planner is not None:
+            self._planner.close()
+
+    def _pending(self):
+        return (self._machine_cmd is not None) or (len(self._gp_cmds) > 0) or (len(self._planner_changes) > 0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.need_to_terminate:
+                    if self._pending():
+                        remaining = self._last_request + self.coalesce_sec - time.time()
+                        if (remaining <= 0.0):
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self.need_to_terminate:
+                    return
+                machine_cmd,self._machine_cmd = self._machine_cmd,None
+                gp_cmds,self._gp_cmds = self._gp_cmds,dict()
+                planner_changes,self._planner_changes = self._planner_changes,dict()
+
+            for param in sorted(gp_cmds):
+                self._send(gp_cmds[param])
+            if machine_cmd is not None:
+                self._load_machine_config(machine_cmd)
+            if (len(planner_changes) > 0):
+                self._push_planner(planner_changes)
+
+    def _config_diff(self,words):
+        feedback = self._config_feedback()
+        return [i for i in range(len(words)) if (feedback[i] != words[i])]
+
+    def _load_machine_config(self,cmd):
+        """
+        The F-RAM holding the configuration allows unlimited writes but every
+        write is a chance for an error, so unchanged configurations are not sent
+        """
+        changed = self._config_diff(cmd[1])
+        if (0 == len(changed)):
+            return
+        rospy.loginfo("Loading machine configuration, changed: %s" % ', '.join([MACHINE_CONFIG_FIELDS[i] for i in changed if i < len(MACHINE_CONFIG_FIELDS)]))
+
+        for attempt in range(self.max_attempts):
+            self._send(cmd)
+            deadline = time.time() + self.ack_timeout
+            with self._cond:
+                self._awaiting_ack = True
+                while (len(self._config_diff(cmd[1])) > 0) and not self.need_to_terminate:
+                    remaining = deadline - time.time()
+                    if (remaining <= 0.0):
+                        break
+                    self._cond.wait(remaining)
+                self._awaiting_ack = False
+                if self.need_to_terminate:
+                    return
+            if (0 == len(self._config_diff(cmd[1]))):
+                rospy.loginfo("Machine configuration acknowledged")
+                return
+        rospy.logerr("Machine configuration was not acknowledged after %d attempts" % self.max_attempts)
+
+    def _push_planner(self,changes):
+        try:
+            if self._planner is None:
+                self._planner = Client(self.planner_name,timeout=self.planner_timeout)
+            self._planner.update_configuration(changes)
+            rospy.loginfo("Movo Driver updated move_base parameters to match machine parameters")
+        except Exception:
+            """
+            The planner is not running or went away, the client is created
+            again with the next update
+            """
+            if self._planner is not None:
+                self._planner.close()
+                self._planner = None
@@ -0,0 +1,272 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   ring_queue.py
+
+ \brief  Bounded single-producer/single-consumer ring of preallocated byte
+         slots used as an in-process replacement for multiprocessing.Queue
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import array
+import errno
+import fcntl
+import os
+import select
+import threading
+
+"""
+Policies applied when the producer finds the ring full
+"""
+RING_OVERWRITE_OLDEST = 0
+RING_DROP_NEWEST      = 1
+
+RING_POLICIES = dict({"overwrite_oldest":RING_OVERWRITE_OLDEST,
+                      "drop_newest":RING_DROP_NEWEST})
+
+def _set_nonblocking(fd):
+    flags = fcntl.fcntl(fd,fcntl.F_GETFL)
+    fcntl.fcntl(fd,fcntl.F_SETFL,flags | os.O_NONBLOCK)
+
+class _RingReader(object):
+    """
+    Mimics the _reader connection of a multiprocessing.Queue so the existing
+    select based consumers can wait on the ring without changes
+    """
+    def __init__(self,ring):
+        self._ring = ring
+
+    def fileno(self):
+        return self._ring._rfd
+
+    def recv(self):
+        return self._ring.get()
+
+class RingQueue(object):
+    """
+    The producers and consumer are threads of the same process so nothing needs
+    to be pickled or handed to a feeder thread; put copies the datagram into a
+    preallocated slot and get copies it back out. Several threads may put, they
+    are serialized by a lock; the head index is only written by producers and
+    the tail index only by the single consumer.
+
+    Every slot records the sequence number of the datagram it holds, -1 while
+    a producer writes it. The consumer only returns a copy when the slot held
+    its sequence number before and after copying, so a datagram overwritten
+    (or being overwritten) under overwrite_oldest is counted and skipped
+    instead of being returned torn or twice.
+
+    One wake byte is written to a pipe for each datagram so the consumer can
+    keep using select on _reader. The consumer counts the wake bytes it has read
+    so a byte arriving after its datagram was already consumed can never make
+    a later recv return without data.
+
+    A stamped ring carries (datagram, stamp) pairs, the stamp is kept next to
+    the slot and handed back with the datagram.
+    """
+    def __init__(self,slot_size=1500,num_slots=64,policy=RING_OVERWRITE_OLDEST,stamped=False):
+        self.slot_size = slot_size
+        self.num_slots = num_slots
+        self.policy = policy
+        self.stamped = stamped
+        self._slots = [bytearray(slot_size) for i in range(num_slots)]
+        self._lengths = [0]*num_slots
+        self._stamps = [None]*num_slots
+        self._seqs = [-1]*num_slots
+        self._lock = threading.Lock()
+        self._head = 0
+        self._tail = 0
+
+        """
+        Drop counters, dropped is owned by the producer (drop newest) and
+        overwritten by the consumer (overwrite oldest)
+        """
+        self.dropped = 0
+        self.overwritten = 0
+
+        self._tokens = 0
+        self._rearmed = 0
+        self._rfd,self._wfd = os.pipe()
+        _set_nonblocking(self._rfd)
+        _set_nonblocking(self._wfd)
+        self._reader = _RingReader(self)
+        self._closed = False
+
+    def qsize(self):
+        return min(self._head - self._tail,self.num_slots)
+
+    def empty(self):
+        return (self._head == self._tail)
+
+    def put(self,data):
+        if self.stamped:
+            data,stamp = data
+
+        size = len(data)
+        if (size > self.slot_size):
+            raise ValueError("datagram of %d bytes does not fit a %d byte slot" % (size,self.slot_size))
+
+        with self._lock:
+            if self._closed:
+                return False
+
+            head = self._head
+            if ((head - self._tail) >= self.num_slots) and (RING_DROP_NEWEST == self.policy):
+                self.dropped += 1
+                return False
+
+            """
+            The slot is marked busy before it is written and gets its sequence
+            number once complete, head moves last
+            """
+            idx = head % self.num_slots
+            self._seqs[idx] = -1
+            self._slots[idx][0:size] = data
+            self._lengths[idx] = size
+            if self.stamped:
+                self._stamps[idx] = stamp
+            self._seqs[idx] = head
+            self._head = head + 1
+            self._wake()
+        return True
+
+    def get(self,block=True,timeout=None):
+        while True:
+            self._read_tokens()
+            data = self._pop()
+            if data is not None:
+                return data
+            if not block:
+                return None
+            if self._closed:
+                self._close_reader()
+                raise EOFError
+            select.select([self._rfd],[],[],timeout)
+            if timeout is not None:
+                block = False
+
+    def close(self):
+        """
+        Only the write end is closed here, a consumer waiting in select wakes
+        up on end of file and closes the read end itself when get finds the
+        ring closed (or when the ring is collected)
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                os.close(self._wfd)
+            except OSError:
+                pass
+
+    def _close_reader(self):
+        if self._rfd is not None:
+            try:
+                os.close(self._rfd)
+            except OSError:
+                pass
+            self._rfd = None
+
+    def __del__(self):
+        self.close()
+        self._close_reader()
+
+    def _wake(self):
+        try:
+            os.write(self._wfd,b'\x00')
+        except OSError as e:
+            """
+            A full pipe already signals the consumer
+            """
+            if (e.errno != errno.EAGAIN):
+                raise
+
+    def _read_tokens(self):
+        if self._rfd is None:
+            return
+        try:
+            self._tokens += len(os.read(self._rfd,4096))
+        except OSError as e:
+            if (e.errno != errno.EAGAIN):
+                raise
+        self._tokens -= self._rearmed
+        self._rearmed = 0
+
+    def _pop(self):
+        while (self._tokens > 0):
+            tail = self._tail
+            head = self._head
+            if (head == tail):
+                return None
+
+            """
+            The producer lapped the consumer, skip what was overwritten
+            """
+            if ((head - tail) > self.num_slots):
+                skipped = (head - tail) - self.num_slots
+                self.overwritten += skipped
+                self._tokens -= skipped
+                tail += skipped
+                self._tail = tail
+                continue
+
+            idx = tail % self.num_slots
+            if (self._seqs[idx] != tail):
+                """
+                A producer is overwriting this datagram
+                """
+                self.overwritten += 1
+                self._tokens -= 1
+                self._tail = tail + 1
+                continue
+
+            data = array.array('B',self._slots[idx][0:self._lengths[idx]])
+            if self.stamped:
+                data = (data,self._stamps[idx])
+
+            if (self._seqs[idx] != tail):
+                """
+                Overwritten while being copied
+                """
+                continue
+
+            self._tail = tail + 1
+            self._tokens -= 1
+
+            """
+            Keep the pipe readable while announced datagrams remain
+            """
+            if (self._tokens > 0):
+                with self._lock:
+                    if not self._closed:
+                        self._rearmed += 1
+                        self._wake()
+            return data
+        return None
@@ -0,0 +1,190 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   shm_feedback.py
+
+ \brief  Seqlock protected shared memory channel for the latest feedback
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import mmap
+import os
+import platform
+import struct
+
+"""
+Every region starts with a header describing its fields so a reader needs
+nothing but the name. The sequence counter follows on an 8 byte boundary and
+the payload holds one float64 per field.
+"""
+SHM_MAGIC        = b'MOVOSHM1'
+SHM_VERSION      = 1
+SHM_HEADER       = struct.Struct('<8sII1024s')
+SHM_SEQ          = struct.Struct('<Q')
+SHM_SEQ_OFFSET   = SHM_HEADER.size + (-SHM_HEADER.size % 8)
+SHM_DATA_OFFSET  = SHM_SEQ_OFFSET + SHM_SEQ.size
+SHM_DIR          = '/dev/shm'
+
+"""
+The seqlock below has no memory barriers, Python can not issue them. It
+relies on the total store order of x86, where other cores see the stores of
+the writer in program order and the reader's loads are not reordered with
+each other. Weakly ordered CPUs (ARM, POWER) may make the second counter
+store visible before the payload, so the channel is only enabled on x86.
+"""
+SHM_FEEDBACK_MACHINES = ['x86_64','amd64','i386','i486','i586','i686','x86']
+
+def shm_feedback_supported():
+    return platform.machine().lower() in SHM_FEEDBACK_MACHINES
+
+"""
+Layouts of the feedback the drivers publish, the stamp is the ROS time of
+the feedback in seconds
+"""
+BASE_FEEDBACK_FIELDS = ['stamp','x_vel_mps','y_vel_mps','yaw_rate_rps','x_m','y_m','yaw_rad',
+                        'linear_actuator_vel_mps','linear_actuator_position_m']
+HEAD_FEEDBACK_FIELDS = ['stamp','pan_pos_rad','pan_vel_rps','pan_torque_nm',
+                        'tilt_pos_rad','tilt_vel_rps','tilt_torque_nm']
+
+def arm_feedback_fields(num_joints):
+    fields = ['stamp']
+    for name in ['position','velocity','effort']:
+        fields += ['%s_%d' % (name,i) for i in range(num_joints)]
+    return fields
+
+def shm_feedback_path(name):
+    return os.path.join(SHM_DIR,'movo_feedback_' + name.strip('/').replace('/','_'))
+
+class ShmFeedbackWriter(object):
+    """
+    Single writer of a region. write bumps the sequence to an odd value,
+    copies the payload and bumps it back to even, a reader that sees the same
+    even sequence before and after its copy has a consistent snapshot. The
+    counter is an aligned 8 byte store, the ordering it needs against the
+    payload stores only holds on x86 (see shm_feedback_supported).
+    """
+    def __init__(self,name,fields):
+        self.name = name
+        self.fields = list(fields)
+        self.path = shm_feedback_path(name)
+        self._payload = struct.Struct('<%dd' % len(self.fields))
+        self._seq = 0
+
+        size = SHM_DATA_OFFSET + self._payload.size
+        fd = os.open(self.path,os.O_RDWR | os.O_CREAT,0o644)
+        try:
+            os.ftruncate(fd,size)
+            self._map = mmap.mmap(fd,size)
+        finally:
+            os.close(fd)
+        SHM_HEADER.pack_into(self._map,0,SHM_MAGIC,SHM_VERSION,len(self.fields),','.join(self.fields).encode())
+        SHM_SEQ.pack_into(self._map,SHM_SEQ_OFFSET,0)
+
+    def write(self,values):
+        """
+        values holds one number per field in the order of the layout
+        """
+        self._seq += 1
+        SHM_SEQ.pack_into(self._map,SHM_SEQ_OFFSET,self._seq)
+        self._payload.pack_into(self._map,SHM_DATA_OFFSET,*values)
+        self._seq += 1
+        SHM_SEQ.pack_into(self._map,SHM_SEQ_OFFSET,self._seq)
+
+    def close(self):
+        """
+        Readers that already mapped the region keep their mapping
+        """
+        self._map.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+class ShmFeedbackReader(object):
+    """
+    Gives a co-located consumer the latest feedback of a driver without going
+    through TCPROS. read returns (updates, values) where updates counts the
+    writes so far and can be compared with a previous read to detect new data.
+    """
+    def __init__(self,name,max_retries=1000):
+        self.name = name
+        self.max_retries = max_retries
+        f = open(shm_feedback_path(name),'rb')
+        try:
+            self._map = mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+        finally:
+            f.close()
+        magic,version,num_fields,names = SHM_HEADER.unpack_from(self._map,0)
+        if (magic != SHM_MAGIC) or (version != SHM_VERSION):
+            self._map.close()
+            raise ValueError('%s is not a MOVO feedback region' % name)
+        self.fields = names.rstrip(b'\x00').decode().split(',')[:num_fields]
+        self._payload = struct.Struct('<%dd' % num_fields)
+
+    def updates(self):
+        return SHM_SEQ.unpack_from(self._map,SHM_SEQ_OFFSET)[0] >> 1
+
+    def read(self):
+        """
+        Returns None when the writer kept the region busy for max_retries
+        attempts
+        """
+        retries = self.max_retries
+        while (retries > 0):
+            retries -= 1
+            before = SHM_SEQ.unpack_from(self._map,SHM_SEQ_OFFSET)[0]
+            if (before & 1):
+                continue
+            values = self._payload.unpack_from(self._map,SHM_DATA_OFFSET)
+            if (before == SHM_SEQ.unpack_from(self._map,SHM_SEQ_OFFSET)[0]):
+                return (before >> 1,values)
+        return None
+
+    def read_dict(self):
+        result = self.read()
+        if result is None:
+            return None
+        return dict(zip(self.fields,result[1]))
+
+    def close(self):
+        self._map.close()
+
+def create_shm_feedback(name,fields,enabled):
+    """
+    Returns a writer when the channel is enabled (the ~shm_feedback parameter
+    of the drivers) and the CPU orders the stores the seqlock needs, None
+    otherwise, the ROS topics are published either way
+    """
+    if not enabled:
+        return None
+    if not shm_feedback_supported():
+        import rospy
+        rospy.logwarn("shared memory feedback needs an x86 CPU, %s only gets the ROS topics" % name)
+        return None
+    return ShmFeedbackWriter(name,fields)
@@ -0,0 +1,123 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   startup_sequence.py
+
+ \brief  Response driven startup handshake with retransmit and backoff
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import threading
+import time
+
+class StartupStep(object):
+    """
+    One step of a startup handshake
+
+    name:            reported while the step runs
+    send:            transmits the request of the step, None if the step only
+                     waits for an event
+    start:           called once when the step begins
+    done:            returns True once the expected response has arrived
+    timeout:         the step fails after this many seconds
+    initial_backoff: first retransmit interval, it doubles up to max_backoff
+    """
+    def __init__(self,name,send,done,start=None,timeout=3.0,initial_backoff=0.05,max_backoff=0.4):
+        self.name = name
+        self.send = send
+        self.done = done
+        self.start = start
+        self.timeout = timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+class StartupSequence(object):
+    """
+    Runs the steps in order. Each step sends its request right away and the
+    sequence moves on as soon as notify is called with the step complete,
+    requests are retransmitted with exponential backoff until then. The
+    receive handler calls notify after every frame so a step costs about one
+    round trip when the platform answers the first request.
+    """
+    def __init__(self,steps,on_state=None):
+        self.steps = steps
+        self.on_state = on_state
+        self.state = None
+        self.failed_step = None
+        self._cond = threading.Condition()
+        self._aborted = False
+
+    def notify(self):
+        with self._cond:
+            self._cond.notify()
+
+    def abort(self):
+        with self._cond:
+            self._aborted = True
+            self._cond.notify()
+
+    def _set_state(self,state):
+        self.state = state
+        if self.on_state is not None:
+            self.on_state(state)
+
+    def run(self):
+        for step in self.steps:
+            self._set_state(step.name)
+            if step.start is not None:
+                step.start()
+            if (False == self._run_step(step)):
+                self.failed_step = step.name
+                self._set_state('failed')
+                return False
+        self._set_state('ready')
+        return True
+
+    def _run_step(self,step):
+        start = time.time()
+        deadline = start + step.timeout
+        backoff = step.initial_backoff
+        next_send = start
+
+        with self._cond:
+            while not self._aborted:
+                if step.done():
+                    return True
+                now = time.time()
+                if (now >= deadline):
+                    return False
+                if (step.send is not None) and (now >= next_send):
+                    step.send()
+                    next_send = now + backoff
+                    backoff = min(2.0*backoff,step.max_backoff)
+                wake = deadline
+                if (step.send is not None):
+                    wake = min(wake,next_send)
+                self._cond.wait(max(0.0,wake - now))
+        return False
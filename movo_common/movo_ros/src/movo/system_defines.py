@@ -108,6 +108,12 @@ EIB_STREAMING                        = 1
 
 KINOVA_ACTUATOR_RSP_SIZE_BYTES = 86 
 
+"""
+Velocity limit sent with interpolated pan-tilt setpoints, the position
+setpoint is already time correct
+"""
+STREAM_VELOCITY_LIMIT = 10000.0
+
 """
 Load machine configuration command is sent to update the NVM configuration
 parameters that get loaded on the machine during initialization
@@ -0,0 +1,190 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   trajectory_streamer.py
+
+ \brief  Time indexed setpoint streaming of joint trajectories
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import array
+import bisect
+
+class _Trajectory(object):
+    """
+    Absolute point times and the point values flattened point major, the
+    cursor remembers the segment of the last sample
+    """
+    __slots__ = ('times','positions','velocities','accelerations','hermite','cursor')
+
+    def __init__(self,times,positions,velocities,accelerations,hermite):
+        self.times = times
+        self.positions = positions
+        self.velocities = velocities
+        self.accelerations = accelerations
+        self.hermite = hermite
+        self.cursor = 0
+
+class TrajectoryStreamer(object):
+    """
+    Keeps the active trajectory as time indexed arrays and samples the
+    setpoint for the current time on every control tick. Between points the
+    positions are a cubic Hermite spline when the points have velocities and
+    linear otherwise, before the first point and after the last one the
+    setpoint holds that point. A new trajectory replaces the active one as a
+    whole (preemption), so a burst of commands never queues up.
+
+    changed() filters setpoints that moved less than the deadband since the
+    last one sent.
+    """
+    def __init__(self,joints,deadband=1e-4):
+        self.joints = joints
+        self.deadband = deadband
+        self._active = None
+        self._last_sent = None
+
+    def set_trajectory(self,start_time,times,positions,velocities=None,accelerations=None):
+        """
+        times are seconds from start_time and must not decrease, positions
+        (and velocities, accelerations when given) hold one list of joint
+        values per point
+        """
+        n = self.joints
+        if (len(times) == 0) or (len(positions) != len(times)):
+            raise ValueError("a trajectory needs one position per point time")
+        hermite = velocities is not None
+        if velocities is None:
+            velocities = [[0.0]*n]*len(times)
+        if accelerations is None:
+            accelerations = [[0.0]*n]*len(times)
+        for values in (positions,velocities,accelerations):
+            if (len(values) != len(times)) or any([(len(point) != n) for point in values]):
+                raise ValueError("every point needs %d joint values" % n)
+
+        stamps = array.array('d',[start_time + t for t in times])
+        if any([(stamps[i+1] < stamps[i]) for i in range(len(stamps)-1)]):
+            raise ValueError("trajectory point times must not decrease")
+
+        self._active = _Trajectory(stamps,
+                                   array.array('d',[v for point in positions for v in point]),
+                                   array.array('d',[v for point in velocities for v in point]),
+                                   array.array('d',[v for point in accelerations for v in point]),
+                                   hermite)
+
+    def set_point(self,positions,velocities,accelerations):
+        """
+        A setpoint that applies immediately and is held
+        """
+        self.set_trajectory(0.0,[0.0],[positions],[velocities],[accelerations])
+
+    def clear(self):
+        self._active = None
+
+    def active(self):
+        return self._active is not None
+
+    def timed(self):
+        """
+        True when the active trajectory moves over time, False for a held point
+        """
+        traj = self._active
+        return (traj is not None) and (len(traj.times) > 1)
+
+    def end_time(self):
+        traj = self._active
+        return traj.times[-1] if traj is not None else None
+
+    def _point(self,traj,i):
+        n = self.joints
+        return (list(traj.positions[i*n:(i+1)*n]),
+                list(traj.velocities[i*n:(i+1)*n]),
+                list(traj.accelerations[i*n:(i+1)*n]))
+
+    def sample(self,now):
+        """
+        (positions, velocities, accelerations) at time now, None without a
+        trajectory. Ticks move forward in time so the segment search starts
+        at the segment of the previous sample.
+        """
+        traj = self._active
+        if traj is None:
+            return None
+
+        times = traj.times
+        last = len(times) - 1
+        if (now <= times[0]):
+            return self._point(traj,0)
+        if (now >= times[last]):
+            return self._point(traj,last)
+
+        i = traj.cursor
+        if (times[i] > now):
+            i = bisect.bisect_right(times,now) - 1
+        while (times[i+1] <= now):
+            i += 1
+        traj.cursor = i
+
+        n = self.joints
+        dt = times[i+1] - times[i]
+        s = (now - times[i]) / dt
+        p,v,a = traj.positions,traj.velocities,traj.accelerations
+        k0 = i*n
+        k1 = k0 + n
+        if traj.hermite:
+            s2 = s*s
+            s3 = s2*s
+            h00,h10,h01,h11 = 2*s3-3*s2+1,(s3-2*s2+s)*dt,-2*s3+3*s2,(s3-s2)*dt
+            d00,d10,d01,d11 = (6*s2-6*s)/dt,3*s2-4*s+1,(6*s-6*s2)/dt,3*s2-2*s
+            e00,e10,e01,e11 = (12*s-6)/(dt*dt),(6*s-4)/dt,(6-12*s)/(dt*dt),(6*s-2)/dt
+            positions = [h00*p[k0+j] + h10*v[k0+j] + h01*p[k1+j] + h11*v[k1+j] for j in range(n)]
+            velocities = [d00*p[k0+j] + d10*v[k0+j] + d01*p[k1+j] + d11*v[k1+j] for j in range(n)]
+            accelerations = [e00*p[k0+j] + e10*v[k0+j] + e01*p[k1+j] + e11*v[k1+j] for j in range(n)]
+        else:
+            positions = [p[k0+j] + s*(p[k1+j]-p[k0+j]) for j in range(n)]
+            velocities = [(p[k1+j]-p[k0+j])/dt for j in range(n)]
+            accelerations = [a[k0+j] + s*(a[k1+j]-a[k0+j]) for j in range(n)]
+        return positions,velocities,accelerations
+
+    def changed(self,command):
+        """
+        True (and command becomes the last one sent) when any value of
+        command differs from the last one sent by more than the deadband
+        """
+        last = self._last_sent
+        if (last is not None) and (len(last) == len(command)):
+            if all([abs(command[i]-last[i]) <= self.deadband for i in range(len(command))]):
+                return False
+        self._last_sent = list(command)
+        return True
+
+    def reset_sent(self):
+        """
+        The next setpoint is sent whatever it is
+        """
+        self._last_sent = None
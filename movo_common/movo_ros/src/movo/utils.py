@@ -37,6 +37,7 @@ import struct
 import socket
 import math
 from crc32 import calc_crc32, valid_crc32
+from cmd_templates import get_command_template
 import array
 from system_defines import *
 import timeit
@@ -79,21 +80,15 @@ def m32(byte_array):
     return ret
 
 def generate_cmd_bytes(cmd):
-    cmd_bytes = []
-    
-    add_bytes(cmd_bytes,cmd[0],16)
-    for cmd_var in cmd[1]:
-        add_bytes(cmd_bytes,cmd_var,32)
-        
-    cmd_bytes = array.array('B',cmd_bytes)
-    
     """
-    Generate the CRC for the command bytes
+    The frame is built in the calling thread's template for the command ID
+    and returned as a copy so queued commands never share a buffer
     """
-    crc = calc_crc32(cmd_bytes)
-    add_bytes(cmd_bytes,crc,32)
-   
-    return cmd_bytes
+    template = get_command_template(cmd[0],len(cmd[1]))
+    template.set_words(cmd[1])
+    template.update_crc()
+
+    return template.to_array()
     
 def validate_response(rsp,expected_len):
     
@@ -225,3 +220,20 @@ def approx_equal(in_1,in_2,max_delta):
 
 
 
+
+def namespace_name(namespace,name):
+    """
+    Prefix a global topic or service name with the namespace of a robot,
+    without a namespace the name is unchanged
+    """
+    if not namespace:
+        return name
+    return '/' + namespace.strip('/') + name
+
+def namespace_frame(namespace,frame_id):
+    """
+    Prefix a TF frame with the namespace of a robot the way tf_prefix does
+    """
+    if not namespace:
+        return frame_id
+    return namespace.strip('/') + '/' + frame_id
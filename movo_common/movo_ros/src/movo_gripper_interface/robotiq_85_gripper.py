@@ -28,7 +28,8 @@ NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ----------------------------------------------------------------------"""
 
-from movo.io_eth import IoEthThread
+from movo.io_eth import create_io_queue,create_io_link,rx_stamped
+from movo.link_monitor import create_link_monitor,get_link_diagnostics
 from gripper_io import GripperIO
 from modbus_crc import verify_modbus_rtu_crc
 from movo.crc32 import calc_crc32, valid_crc32
@@ -62,12 +63,21 @@ class Robotiq85Gripper:
         """
         Create the thread to run MOVO Linear actuator command interface
         """
-        self.tx_queue_ = multiprocessing.Queue()
-        self.rx_queue_ = multiprocessing.Queue()
-        self.comm = IoEthThread((movo_ip,6238),
-                                self.tx_queue_,
-                                self.rx_queue_,
-                                max_packet_size=R85_PACKET_SIZE_BYTES)
+        io_options = rospy.get_param('~io',dict())
+        self._rx_stamped = rx_stamped(io_options)
+        self.tx_queue_ = create_io_queue(R85_PACKET_SIZE_BYTES,io_options)
+        self.rx_queue_ = create_io_queue(R85_PACKET_SIZE_BYTES,io_options,self._rx_stamped)
+        self.comm = create_io_link((movo_ip,6238),
+                                   self.tx_queue_,
+                                   self.rx_queue_,
+                                   max_packet_size=R85_PACKET_SIZE_BYTES,
+                                   options=io_options)
+
+        """
+        The gripper is polled, the monitor tracks the transaction latency
+        """
+        self._link_monitor = create_link_monitor('gripper',(movo_ip,6238),
+                                                 0.0,dict({'tx':self.tx_queue_,'rx':self.rx_queue_}))
         
         self._gripper = []
         self._num_grippers = num_grippers
@@ -79,6 +89,7 @@ class Robotiq85Gripper:
     def shutdown(self):
         self._shutdown_driver = True
         rospy.loginfo("Movo R85 gripper has called the Shutdown method, terminating")
+        get_link_diagnostics().unregister(self._link_monitor)
         self.comm.Close()
         self.tx_queue_.close()
         self.rx_queue_.close()
@@ -110,6 +121,7 @@ class Robotiq85Gripper:
         """
         Send it
         """
+        self._link_monitor.request_sent('transact')
         self.tx_queue_.put(cmd_bytes) 
         rsp_data = None
         try:
@@ -117,8 +129,15 @@ class Robotiq85Gripper:
         
             if len(result[0]) > 0:
                 rsp = result[0][0].recv()
+                rx_stamp = None
+                if self._rx_stamped:
+                    rsp,rx_stamp = rsp
                 if (valid_crc32(rsp)) and (len(rsp) == 72):
+                    self._link_monitor.frame_received(rx_stamp)
+                    self._link_monitor.response_received('transact',rx_stamp)
                     rsp_data  = rsp[4:rx_bytes+4]
+                else:
+                    self._link_monitor.invalid_frame()
         except:
             pass
         
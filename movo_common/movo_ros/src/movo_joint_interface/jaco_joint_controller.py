@@ -46,6 +46,7 @@ from angles import *
 from helpers import *
 from jaco_joint_pid import JacoPID
 from kinova_api_wrapper import *
+from movo.shm_feedback import create_shm_feedback,arm_feedback_fields
 import operator
         
 class SIArmController(object):
@@ -159,6 +160,7 @@ class SIArmController(object):
         
         self._actfdbk_pub = rospy.Publisher("/movo/%s_arm/actuator_feedback"%self._prefix,KinovaActuatorFdbk,queue_size=10)
         self._actfdbk_msg = KinovaActuatorFdbk()
+        self._shm = create_shm_feedback('%s_arm'%self._prefix,arm_feedback_fields(self._num_joints),rospy.get_param('~shm_feedback',False))
         self._jsmsg.header.seq = 0
         self._jsmsg.header.frame_id = ''
         self._jsmsg.header.stamp = rospy.get_rostime()
@@ -297,6 +299,8 @@ class SIArmController(object):
             except:
                 pass
             self.api.Shutdown()
+            if self._shm is not None:
+                self._shm.close()
             
             rospy.loginfo("%s arm controller has stopped"%self._prefix)
             self._done = True
@@ -445,6 +449,9 @@ class SIArmController(object):
         self._jsmsg.effort = self._joint_fb['force']
         self._jspub.publish(self._jsmsg)
         self._jsmsg.header.seq+=1
+
+        if self._shm is not None:
+            self._shm.write([self._jsmsg.header.stamp.to_sec()] + tmp + list(self._joint_fb['velocity']) + list(self._joint_fb['force']))
         
 
         if (0 != self.num_fingers):
@@ -101,46 +101,34 @@ def de_boor_control_pts(points_array, d0=None,
     # so it is only necessary to find N+1 pts, dpts_(0) to to dpts_(N)
     (rows, k) = np.shape(points_array)
     N = rows - 1  # minus 1 because list includes x_(0)
-    # Compute A matrix
-    if natural:
-        if N > 2:
-            A = np.zeros((N-1, N-1))
-            A[np.ix_([0], [0, 1])] = [4, 1]
-            A[np.ix_([N-2], [N-3, N-2])] = [1, 4]
+    # The A matrix is tridiagonal with ones off the diagonal, 4 on the
+    # diagonal and 4 (natural) or 3.5 in the first and last row
+    end_diag = 4.0 if natural else 3.5
+    d_pts = np.zeros((N+3, k))
+    if N > 2:
+        # Right hand side of every column at once, with the start / end
+        # conditions in the first and last row
+        x = 6.0*np.asarray(points_array[1:N, :], dtype=float)
+        if natural:
+            x[0, :] -= points_array[0, :]
+            x[N-2, :] -= points_array[-1, :]
         else:
-            A = 4.0
+            x[0, :] -= 1.5*np.reshape(d0, k)
+            x[N-2, :] -= 1.5*np.reshape(dN, k)
+        diagonal = np.empty(N-1)
+        diagonal.fill(4.0)
+        diagonal[0] = end_diag
+        diagonal[N-2] = end_diag
+        # Solve bezier interpolation
+        d_pts[2:N+1, :] = solve_tridiagonal(diagonal, x)
     else:
-        if N > 2:
-            A = np.zeros((N-1, N-1))
-            A[np.ix_([0], [0, 1])] = [3.5, 1]
-            A[np.ix_([N-2], [N-3, N-2])] = [1, 3.5]
-        else:
-            A = 3.5
-    for i in range(1, N-2):
-        A[np.ix_([i], [i-1, i, i+1])] = [1, 4, 1]
-    # Construct de Boor Control Points from A matrix
-    d_pts = np.zeros((N+3, k))
-    for col in range(0, k):
-        x = np.zeros((max(N-1, 1), 1))
-        if N > 2:
-            # Compute start / end conditions
-            if natural:
-                x[N-2, 0] = 6*points_array[-2, col] - points_array[-1, col]
-                x[0, 0] = 6*points_array[1, col] - points_array[0, col]
-            else:
-                x[N-2, 0] = 6*points_array[-2, col] - 1.5*dN[0, col]
-                x[0, 0] = 6*points_array[1, col] - 1.5*d0[0, col]
-            x[range(1, N-3+1), 0] = 6*points_array[range(2, N-2+1), col]
-            # Solve bezier interpolation
-            d_pts[2:N+1, col] = np.linalg.solve(A, x).T
+        # Compute start / end conditions
+        if natural:
+            x = 6.0*points_array[1, :] - points_array[0, :]
         else:
-            # Compute start / end conditions
-            if natural:
-                x[0, 0] = 6*points_array[1, col] - points_array[0, col]
-            else:
-                x[0, 0] = 6*points_array[1, col] - 1.5*d0[col]
-            # Solve bezier interpolation
-            d_pts[2, col] = x / A
+            x = 6.0*points_array[1, :] - 1.5*np.reshape(d0, k)
+        # Solve bezier interpolation
+        d_pts[2, :] = x / end_diag
     # Store off start and end positions
     d_pts[0, :] = points_array[0, :]
     d_pts[-1, :] = points_array[-1, :]
@@ -157,6 +145,45 @@ def de_boor_control_pts(points_array, d0=None,
     return d_pts
 
 
+def solve_tridiagonal(diagonal, rhs):
+    """
+    Solves A x = rhs for a tridiagonal A with ones on the sub and super
+    diagonals (Thomas algorithm). The matrix is factored once and every
+    column of rhs is solved in the same sweeps, so the cost is O(n*k)
+    instead of O(n^3) per column for a dense solve.
+
+    params:
+        diagonal: main diagonal of A
+            numpy.array of size n
+        rhs: right hand sides, one per column
+            numpy.array of size n by k
+
+    returns:
+        x: solutions, one per column
+            numpy.array of size n by k
+    """
+    n = len(diagonal)
+    # Factor: inv[i] is 1/pivot, which is also the modified super diagonal
+    inv = [1.0/diagonal[0]]
+    for i in range(1, n):
+        inv.append(1.0/(diagonal[i] - inv[i-1]))
+    # Forward sweep over all columns, rows are updated in place
+    x = np.array(rhs, dtype=float)
+    prev = x[0]
+    prev *= inv[0]
+    for i in range(1, n):
+        row = x[i]
+        row -= prev
+        row *= inv[i]
+        prev = row
+    # Back substitution
+    for i in range(n-2, -1, -1):
+        row = x[i]
+        row -= inv[i]*prev
+        prev = row
+    return x
+
+
 def bezier_coefficients(points_array, d_pts):
     """
     Compute the Bezier coefficients for a given
@@ -187,45 +214,49 @@ def bezier_coefficients(points_array, d_pts):
     (rows, k) = np.shape(points_array)
     N = rows - 1  # N minus 1 because points array includes x_0
     b_coeffs = np.zeros(shape=(k, N, 4))
-    for i in range(0, N):
-        points_array_i = i+1
-        d_pts_i = i + 2
-        if i == 0:
-            for axis_pos in range(0, k):
-                b_coeffs[axis_pos, i, 0] = points_array[points_array_i - 1,
-                                                        axis_pos]
-                b_coeffs[axis_pos, i, 1] = d_pts[d_pts_i - 1, axis_pos]
-                b_coeffs[axis_pos, i, 2] = (0.5 * d_pts[d_pts_i - 1, axis_pos]
-                                            + 0.5 * d_pts[d_pts_i, axis_pos])
-                b_coeffs[axis_pos, i, 3] = points_array[points_array_i,
-                                                        axis_pos]
-        elif i == N-1:
-            for axis_pos in range(0, k):
-                b_coeffs[axis_pos, i, 0] = points_array[points_array_i - 1,
-                                                        axis_pos]
-                b_coeffs[axis_pos, i, 1] = (0.5 * d_pts[d_pts_i - 1, axis_pos]
-                                            + 0.5 * d_pts[d_pts_i, axis_pos])
-                b_coeffs[axis_pos, i, 2] = d_pts[d_pts_i, axis_pos]
-                b_coeffs[axis_pos, i, 3] = points_array[points_array_i,
-                                                        axis_pos]
-        else:
-            for axis_pos in range(0, k):
-                b_coeffs[axis_pos, i, 0] = points_array[points_array_i - 1,
-                                                        axis_pos]
-                b_coeffs[axis_pos, i, 1] = (2.0/3.0 * d_pts[d_pts_i - 1,
-                                                            axis_pos]
-                                            + 1.0/3.0 * d_pts[d_pts_i,
-                                                              axis_pos])
-                b_coeffs[axis_pos, i, 2] = (1.0/3.0 * d_pts[d_pts_i - 1,
-                                                            axis_pos]
-                                            + 2.0/3.0 * d_pts[d_pts_i,
-                                                              axis_pos])
-                b_coeffs[axis_pos, i, 3] = points_array[points_array_i,
-                                                        axis_pos]
+    # Segment i runs from points_array[i] to points_array[i+1] and uses the
+    # de Boor points i+1 and i+2, all segments and axes are set at once
+    d_prev = d_pts[1:N+1, :]
+    d_next = d_pts[2:N+2, :]
+    b_coeffs[:, :, 0] = points_array[0:N, :].T
+    b_coeffs[:, :, 1] = (2.0/3.0 * d_prev + 1.0/3.0 * d_next).T
+    b_coeffs[:, :, 2] = (1.0/3.0 * d_prev + 2.0/3.0 * d_next).T
+    b_coeffs[:, :, 3] = points_array[1:N+1, :].T
+    # The last and then the first segment end on the de Boor points
+    b_coeffs[:, N-1, 1] = 0.5 * d_pts[N, :] + 0.5 * d_pts[N+1, :]
+    b_coeffs[:, N-1, 2] = d_pts[N+1, :]
+    b_coeffs[:, 0, 1] = d_pts[1, :]
+    b_coeffs[:, 0, 2] = 0.5 * d_pts[1, :] + 0.5 * d_pts[2, :]
 
     return b_coeffs
 
 
+def joint_bezier_coefficients(traj_array):
+    """
+    Compute the Bezier coefficients of every joint and
+    dimension (position, velocity, ...) of a trajectory
+    at once. Every joint dimension is a column of a
+    single de Boor system and coefficient computation.
+
+    params:
+        traj_array: trajectory waypoints
+            numpy.array of size N by J by D
+            N is the number of waypoints
+            J is the number of joints
+            D is the number of dimensions for each joint
+
+    returns:
+        b_matrix: 4 Bezier coefficients for every joint,
+            dimension and segment
+            numpy.array of size J by D by N-1 by 4
+    """
+    (rows, num_joints, num_dims) = np.shape(traj_array)
+    columns = np.reshape(np.asarray(traj_array, dtype=float), (rows, num_joints*num_dims))
+    d_pts = de_boor_control_pts(columns)
+    b_coeffs = bezier_coefficients(columns, d_pts)
+    return np.reshape(b_coeffs, (num_joints, num_dims, rows-1, 4))
+
+
 def _cubic_spline_point(b_coeff, t):
     """
     Internal convenience function for calculating
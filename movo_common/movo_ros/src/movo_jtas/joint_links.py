@@ -0,0 +1,136 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   joint_links.py
+
+ \brief  Command and feedback links between the trajectory action servers
+         and the actuator drivers
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from movo_msgs.msg import PanTiltCmd,LinearActuatorCmd
+from sensor_msgs.msg import JointState
+from movo.system_defines import STREAM_VELOCITY_LIMIT
+import threading
+import rospy
+
+class TopicJointState(object):
+    """
+    Latest JointState of a topic, the default feedback of the servers
+    """
+    def __init__(self,topic):
+        self._js = rospy.wait_for_message(topic,JointState)
+        self._sub = rospy.Subscriber(topic,JointState,self._update)
+
+    def _update(self,msg):
+        self._js = msg
+
+    def __call__(self):
+        return self._js
+
+class TopicCommand(object):
+    """
+    Publishes every setpoint as a driver command message, make_msg turns a
+    JointTrajectoryPoint into the message
+    """
+    def __init__(self,topic,msg_type,make_msg):
+        self._pub = rospy.Publisher(topic,msg_type,queue_size=10)
+        self._make_msg = make_msg
+
+    def __call__(self,point):
+        self._pub.publish(self._make_msg(point))
+
+def pan_tilt_cmd(point):
+    cmdz = PanTiltCmd()
+    cmdz.pan_cmd.pos_rad = point.positions[0]
+    cmdz.tilt_cmd.pos_rad = point.positions[1]
+    cmdz.pan_cmd.vel_rps = STREAM_VELOCITY_LIMIT
+    cmdz.tilt_cmd.vel_rps = STREAM_VELOCITY_LIMIT
+    return cmdz
+
+def linear_actuator_cmd(point):
+    cmdz = LinearActuatorCmd()
+    cmdz.desired_position_m = point.positions[0]
+    return cmdz
+
+class SharedControlLoop(object):
+    """
+    One timing source for every server in the process. sleep() has the
+    interface of rospy.Rate and returns on the next tick, so the servers
+    executing a trajectory all run on the same tick. Drivers hosted in the
+    process register a tick callback instead of running their own timer.
+    """
+    def __init__(self,rate):
+        self.period = 1.0/rate
+        self._tick = 0
+        self._callbacks = []
+        self._running = True
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        r = rospy.Rate(1.0/self.period)
+        while self._running and not rospy.is_shutdown():
+            try:
+                r.sleep()
+            except rospy.ROSInterruptException:
+                break
+            with self._cond:
+                self._tick += 1
+                self._cond.notify_all()
+                callbacks = list(self._callbacks)
+            for callback in callbacks:
+                callback(None)
+        self.Shutdown()
+
+    def add_tick_callback(self,callback):
+        """
+        callback(None) is called from the loop thread on every tick, the
+        argument stands in for the rospy.TimerEvent of a driver timer
+        """
+        with self._cond:
+            self._callbacks.append(callback)
+
+    def remove_tick_callback(self,callback):
+        with self._cond:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def sleep(self):
+        with self._cond:
+            tick = self._tick
+            while self._running and (tick == self._tick):
+                self._cond.wait(2*self.period)
+
+    def Shutdown(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
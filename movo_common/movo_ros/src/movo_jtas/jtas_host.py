@@ -0,0 +1,109 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   jtas_host.py
+
+ \brief  Hosts the head and torso trajectory action servers in one process
+         with one control loop, optionally next to the actuator drivers
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+from movo.movo_pan_tilt import PanTiltIO
+from movo.system_defines import STREAM_VELOCITY_LIMIT
+from movo.movo_linear_actuator import LinearActuator
+from movo_head_jtas import MovoHeadJTAS
+from movo_torso_jtas import MovoTorsoJTAS
+from joint_links import SharedControlLoop
+import rospy
+
+class JTASHost(object):
+    """
+    Runs the head and/or torso trajectory action servers in one process with
+    one control loop.
+
+    With pan_tilt the head driver (PanTiltIO) is created in this process and
+    the head server hands it setpoints and reads its joint states through
+    direct calls, no message is serialized in between. The driver runs on the
+    same loop instead of its own command timer and sends each setpoint as
+    soon as the server computes it. With linear_actuator
+    the torso command link is opened here and torso setpoints are queued
+    directly; the torso joint states come with the base feedback and are
+    still read from the topic, so the base driver must not open the linear
+    actuator link as well (run it with ~linear_actuator false).
+    """
+    def __init__(self,servers=('head','torso'),rate=100.0,movo_ip='10.66.171.5',pan_tilt=False,linear_actuator=False,feedback_timeout=5.0):
+        self.init_success = False
+        self.servers = dict()
+        self._drivers = []
+        self._loop = SharedControlLoop(rate)
+
+        if 'head' in servers:
+            command = None
+            joint_state = None
+            if pan_tilt:
+                pan_tilt_io = PanTiltIO(movo_ip,control_loop=self._loop)
+                if not pan_tilt_io.init_success:
+                    rospy.logerr("Could not start the pan-tilt driver in the trajectory server host")
+                    self.Shutdown()
+                    return
+                self._drivers.append(pan_tilt_io)
+
+                """
+                The server seeds its targets from the joint states, they only
+                hold real positions after the first feedback frame
+                """
+                if not pan_tilt_io.wait_for_feedback(feedback_timeout):
+                    rospy.logerr("No pan-tilt feedback within %.1fs in the trajectory server host" % feedback_timeout)
+                    self.Shutdown()
+                    return
+                command = lambda point: pan_tilt_io.command_setpoint(point.positions,[STREAM_VELOCITY_LIMIT]*2,[0.0,0.0])
+                joint_state = pan_tilt_io.joint_state
+            self.servers['head'] = MovoHeadJTAS(rate,command=command,joint_state=joint_state,
+                                                control_loop=self._loop)
+
+        if 'torso' in servers:
+            command = None
+            if linear_actuator:
+                linear = LinearActuator(movo_ip)
+                if not linear.init_success:
+                    rospy.logerr("Could not start the linear actuator link in the trajectory server host")
+                    self.Shutdown()
+                    return
+                self._drivers.append(linear)
+                command = lambda point: linear.command_position(point.positions[0])
+            self.servers['torso'] = MovoTorsoJTAS(rate,command=command,
+                                                  control_loop=self._loop)
+
+        self.init_success = all([server.init_success for server in self.servers.values()])
+
+    def Shutdown(self):
+        self._loop.Shutdown()
+        for driver in self._drivers:
+            driver.Shutdown()
+        self._drivers = []
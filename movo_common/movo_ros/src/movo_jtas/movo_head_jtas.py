@@ -36,6 +36,7 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 --------------------------------------------------------------------"""
 from movo_msgs.msg import PanTiltCmd,Status
 from trajectory_smoother import TrajectorySmoother 
+from joint_links import TopicJointState,TopicCommand,pan_tilt_cmd
 
 from control_msgs.msg import FollowJointTrajectoryAction, FollowJointTrajectoryFeedback, FollowJointTrajectoryResult
 from trajectory_msgs.msg import JointTrajectoryPoint
@@ -54,7 +55,7 @@ import cmd
 
 
 class MovoHeadJTAS(object):
-    def __init__(self, rate=100.0):
+    def __init__(self, rate=100.0, command=None, joint_state=None, control_loop=None):
         self._alive = False
         self.init_success = False
 
@@ -91,10 +92,20 @@ class MovoHeadJTAS(object):
         self._alive = True
         self.estop = False
         self._movo_status_sub = rospy.Subscriber("/movo/feedback/status",Status,self._update_movo_status)
-        self._js = rospy.wait_for_message("/movo/head/joint_states",JointState)
+
+        """
+        Setpoints and joint states go through the driver topics unless the
+        host passes direct links to a driver in the same process, the host
+        also passes the control loop shared by its servers
+        """
+        if joint_state is None:
+            joint_state = TopicJointState("/movo/head/joint_states")
+        if command is None:
+            command = TopicCommand("/movo/head/cmd",PanTiltCmd,pan_tilt_cmd)
+        self._joint_state = joint_state
+        self._command = command
+        self._control_loop = control_loop
         self.pos_targets = self._get_current_position(self._joint_names)
-        self._sub = rospy.Subscriber("/movo/head/joint_states",JointState,self._update_movo_joint_states)
-        self._cmd_pub=rospy.Publisher("/movo/head/cmd",PanTiltCmd,queue_size=10)
         self._server.start()
         
         self.init_success=True
@@ -107,9 +118,6 @@ class MovoHeadJTAS(object):
         else:
             self.estop = False
             
-    def _update_movo_joint_states(self,msg):
-        self._js = msg
-    
     def robot_is_enabled(self):
         return not self.estop
 
@@ -164,12 +172,14 @@ class MovoHeadJTAS(object):
                         self._goal_error[jnt] = tolerance.position
 
     def _get_current_position(self, joint_names):    
-        pos = dict(zip(self._js.name,self._js.position))
+        js = self._joint_state()
+        pos = dict(zip(js.name,js.position))
         pos = [pos[jnt] for jnt in joint_names]
         return pos
 
     def _get_current_velocities(self, joint_names):
-        vel = dict(zip(self._js.name,self._js.velocity))
+        js = self._joint_state()
+        vel = dict(zip(js.name,js.velocity))
         vel = [vel[jnt] for jnt in joint_names]
         return vel
 
@@ -218,15 +228,8 @@ class MovoHeadJTAS(object):
                 self._command_stop()
                 return False
                 
-        cmdz = PanTiltCmd()
-        cmdz.pan_cmd.pos_rad = point.positions[0]
-        cmdz.tilt_cmd.pos_rad = point.positions[1]
-        cmdz.pan_cmd.vel_rps = 10000.0
-        cmdz.tilt_cmd.vel_rps = 10000.0
-        
         if self._alive:
-            self._cmd_pub.publish(cmdz)
-            actual = self._get_current_position(joint_names)
+            self._command(point)
         return True
         
     def _check_goal_state(self, joint_names, last):
@@ -301,7 +304,10 @@ class MovoHeadJTAS(object):
         of the control rate past the end to ensure we get to the end.
         Keep track of current indices for spline segment generation
         """
-        control_rate = rospy.Rate(self._trajectory_control_rate)
+        if self._control_loop is not None:
+            control_rate = self._control_loop
+        else:
+            control_rate = rospy.Rate(self._trajectory_control_rate)
         now_from_start = rospy.get_time() - start_time
         end_time = trajectory_points[-1].time_from_start.to_sec()
         last_idx = 0
@@ -34,6 +34,7 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
  \Platform: Linux/ROS Indigo
 --------------------------------------------------------------------"""
 from movo_msgs.msg import LinearActuatorCmd,Status
+from joint_links import TopicJointState,TopicCommand,linear_actuator_cmd
 from control_msgs.msg import FollowJointTrajectoryAction, FollowJointTrajectoryFeedback, FollowJointTrajectoryResult
 from trajectory_msgs.msg import JointTrajectoryPoint
 from std_msgs.msg import UInt16,Bool
@@ -51,7 +52,7 @@ import cmd
 
 
 class MovoTorsoJTAS(object):
-    def __init__(self, rate=100.0):
+    def __init__(self, rate=100.0, command=None, joint_state=None, control_loop=None):
         self._alive = False
         self.init_success = False
 
@@ -87,10 +88,20 @@ class MovoTorsoJTAS(object):
         self._alive = True
         self.estop = False
         self._movo_status_sub = rospy.Subscriber("/movo/feedback/status",Status,self._update_movo_status)
-        self._js = rospy.wait_for_message("/movo/linear_actuator/joint_states",JointState)
+
+        """
+        Setpoints and joint states go through the driver topics unless the
+        host passes direct links to a driver in the same process, the host
+        also passes the control loop shared by its servers
+        """
+        if joint_state is None:
+            joint_state = TopicJointState("/movo/linear_actuator/joint_states")
+        if command is None:
+            command = TopicCommand("/movo/linear_actuator_cmd",LinearActuatorCmd,linear_actuator_cmd)
+        self._joint_state = joint_state
+        self._command = command
+        self._control_loop = control_loop
         self.pos_targets = self._get_current_position(self._joint_names)
-        self._sub = rospy.Subscriber("/movo/linear_actuator/joint_states",JointState,self._update_movo_joint_states)
-        self._cmd_pub=rospy.Publisher("/movo/linear_actuator_cmd",LinearActuatorCmd,queue_size=10)
         self._server.start()
         
         self.init_success=True
@@ -103,9 +114,6 @@ class MovoTorsoJTAS(object):
         else:
             self.estop = False
             
-    def _update_movo_joint_states(self,msg):
-        self._js = msg
-    
     def robot_is_enabled(self):
         return not self.estop
 
@@ -160,12 +168,14 @@ class MovoTorsoJTAS(object):
                         self._goal_error[jnt] = tolerance.position
 
     def _get_current_position(self, joint_names):    
-        pos = dict(zip(self._js.name,self._js.position))
+        js = self._joint_state()
+        pos = dict(zip(js.name,js.position))
         pos = [pos[jnt] for jnt in joint_names]
         return pos
 
     def _get_current_velocities(self, joint_names):
-        vel = dict(zip(self._js.name,self._js.velocity))
+        js = self._joint_state()
+        vel = dict(zip(js.name,js.velocity))
         vel = [vel[jnt] for jnt in joint_names]
         return vel
 
@@ -214,12 +224,8 @@ class MovoTorsoJTAS(object):
                 self._command_stop()
                 return False
                 
-        cmdz = LinearActuatorCmd()
-        cmdz.desired_position_m = point.positions[0]
-        
         if self._alive:
-            self._cmd_pub.publish(cmdz)
-            actual = self._get_current_position(joint_names)
+            self._command(point)
         return True
         
     def _check_goal_state(self, joint_names, last):
@@ -294,7 +300,10 @@ class MovoTorsoJTAS(object):
         of the control rate past the end to ensure we get to the end.
         Keep track of current indices for spline segment generation
         """
-        control_rate = rospy.Rate(self._trajectory_control_rate)
+        if self._control_loop is not None:
+            control_rate = self._control_loop
+        else:
+            control_rate = rospy.Rate(self._trajectory_control_rate)
         now_from_start = rospy.get_time() - start_time
         end_time = trajectory_points[-1].time_from_start.to_sec()
         last_idx = 0
@@ -51,25 +51,16 @@ class TrajectorySmoother(object):
         self._name = name
     
     def _compute_bezier_coeff(self, joint_names, trajectory_points, dimensions_dict):
-        # Compute Full Bezier Curve
+        # Compute Full Bezier Curve, the waypoints of all joints are
+        # gathered into one N by J by D array and solved together
         num_joints = len(joint_names)
-        num_traj_pts = len(trajectory_points)
-        num_traj_dim = sum(dimensions_dict.values())
-        num_b_values = len(['b0', 'b1', 'b2', 'b3'])
-        b_matrix = np.zeros(shape=(num_joints, num_traj_dim, num_traj_pts-1, num_b_values))
-        for jnt in xrange(num_joints):
-            traj_array = np.zeros(shape=(len(trajectory_points), num_traj_dim))
-            for idx, point in enumerate(trajectory_points):
-                current_point = list()
-                current_point.append(point.positions[jnt])
-                if dimensions_dict['velocities']:
-                    current_point.append(point.velocities[jnt])
-                if dimensions_dict['accelerations']:
-                    current_point.append(point.accelerations[jnt])
-                traj_array[idx, :] = current_point
-            d_pts = bezier.de_boor_control_pts(traj_array)
-            b_matrix[jnt, :, :, :] = bezier.bezier_coefficients(traj_array, d_pts)
-        return b_matrix
+        dims = [np.array([point.positions[:num_joints] for point in trajectory_points], dtype=float)]
+        if dimensions_dict['velocities']:
+            dims.append(np.array([point.velocities[:num_joints] for point in trajectory_points], dtype=float))
+        if dimensions_dict['accelerations']:
+            dims.append(np.array([point.accelerations[:num_joints] for point in trajectory_points], dtype=float))
+        traj_array = np.dstack(dims)
+        return bezier.joint_bezier_coefficients(traj_array)
         
     def _determine_dimensions(self, trajectory_points):
         # Determine dimensions supplied
@@ -136,22 +127,18 @@ class TrajectorySmoother(object):
     def GetBezierPoint(self, b_matrix, idx, t, cmd_time, dimensions_dict):
         pnt = JointTrajectoryPoint()
         pnt.time_from_start = rospy.Duration(cmd_time)
-        num_joints = b_matrix.shape[0]
-        pnt.positions = [0.0] * num_joints
+        # Evaluate every joint and dimension at once
+        (num_joints, num_dims, num_segments, _) = b_matrix.shape
+        b_points = bezier.bezier_point(np.reshape(b_matrix, (num_joints*num_dims, num_segments, 4)), idx, t)
+        b_points = np.reshape(b_points, (num_joints, num_dims))
+        # Positions at specified time
+        pnt.positions = b_points[:, 0].tolist()
+        # Velocities at specified time
         if dimensions_dict['velocities']:
-            pnt.velocities = [0.0] * num_joints
+            pnt.velocities = b_points[:, 1].tolist()
+        # Accelerations at specified time
         if dimensions_dict['accelerations']:
-            pnt.accelerations = [0.0] * num_joints
-        for jnt in range(num_joints):
-            b_point = bezier.bezier_point(b_matrix[jnt, :, :, :], idx, t)
-            # Positions at specified time
-            pnt.positions[jnt] = b_point[0]
-            # Velocities at specified time
-            if dimensions_dict['velocities']:
-                pnt.velocities[jnt] = b_point[1]
-            # Accelerations at specified time
-            if dimensions_dict['accelerations']:
-                pnt.accelerations[jnt] = b_point[-1]
+            pnt.accelerations = b_points[:, -1].tolist()
         return pnt
         
         
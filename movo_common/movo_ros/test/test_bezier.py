@@ -0,0 +1,142 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_bezier.py
+
+ \brief  Tests of the Bezier spline control point computation
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+
+try:
+    import numpy as np
+    from movo_jtas import bezier
+except ImportError:
+    np = None
+
+def dense_de_boor(points_array, d0=None, dN=None, natural=True):
+    """
+    The de Boor points from the dense system, one solve per column
+    """
+    N = points_array.shape[0] - 1
+    end = 4.0 if natural else 3.5
+    A = np.diag([end] + [4.0]*(N-3) + [end]) + np.diag([1.0]*(N-2), 1) + np.diag([1.0]*(N-2), -1)
+    d_pts = np.zeros((N+3, points_array.shape[1]))
+    for col in range(points_array.shape[1]):
+        x = 6.0*points_array[1:N, col]
+        if natural:
+            x[0] -= points_array[0, col]
+            x[-1] -= points_array[-1, col]
+        else:
+            x[0] -= 1.5*d0[0, col]
+            x[-1] -= 1.5*dN[0, col]
+        d_pts[2:N+1, col] = np.linalg.solve(A, x)
+    d_pts[0, :] = points_array[0, :]
+    d_pts[-1, :] = points_array[-1, :]
+    if natural:
+        d_pts[1, :] = (2.0/3.0)*points_array[0, :] + (1.0/3.0)*d_pts[2, :]
+        d_pts[N+1, :] = (1.0/3.0)*d_pts[-3, :] + (2.0/3.0)*points_array[-1, :]
+    else:
+        d_pts[1, :] = d0
+        d_pts[N+1, :] = dN
+    return d_pts
+
+def loop_bezier_coefficients(points_array, d_pts):
+    """
+    The Bezier coefficients segment by segment and axis by axis
+    """
+    (rows, k) = points_array.shape
+    N = rows - 1
+    b_coeffs = np.zeros(shape=(k, N, 4))
+    for i in range(N):
+        for axis in range(k):
+            b_coeffs[axis, i, 0] = points_array[i, axis]
+            b_coeffs[axis, i, 3] = points_array[i+1, axis]
+            if i == 0:
+                b_coeffs[axis, i, 1] = d_pts[i+1, axis]
+                b_coeffs[axis, i, 2] = 0.5*d_pts[i+1, axis] + 0.5*d_pts[i+2, axis]
+            elif i == N-1:
+                b_coeffs[axis, i, 1] = 0.5*d_pts[i+1, axis] + 0.5*d_pts[i+2, axis]
+                b_coeffs[axis, i, 2] = d_pts[i+2, axis]
+            else:
+                b_coeffs[axis, i, 1] = 2.0/3.0*d_pts[i+1, axis] + 1.0/3.0*d_pts[i+2, axis]
+                b_coeffs[axis, i, 2] = 1.0/3.0*d_pts[i+1, axis] + 2.0/3.0*d_pts[i+2, axis]
+    return b_coeffs
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class BezierTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(7)
+
+    def test_solve_tridiagonal(self):
+        for n in [1, 2, 3, 10, 200]:
+            diagonal = 4.0 + self.rng.uniform(-0.5, 0.5, n)
+            rhs = self.rng.normal(size=(n, 7))
+            A = np.diag(diagonal) + np.diag(np.ones(n-1), 1) + np.diag(np.ones(n-1), -1)
+            self.assertTrue(np.allclose(bezier.solve_tridiagonal(diagonal, rhs), np.linalg.solve(A, rhs)))
+
+    def test_de_boor_matches_dense_solve(self):
+        for rows in [4, 5, 9, 120]:
+            points = self.rng.normal(size=(rows, 7))
+            d0 = self.rng.normal(size=(1, 7))
+            dN = self.rng.normal(size=(1, 7))
+            self.assertTrue(np.allclose(bezier.de_boor_control_pts(points), dense_de_boor(points)))
+            self.assertTrue(np.allclose(bezier.de_boor_control_pts(points, d0, dN, False),
+                                        dense_de_boor(points, d0, dN, False)))
+
+    def test_spline_passes_through_the_points(self):
+        points = self.rng.normal(size=(30, 3))
+        b_coeffs = bezier.bezier_coefficients(points, bezier.de_boor_control_pts(points))
+        curve = bezier.bezier_curve(b_coeffs, 4)
+        self.assertTrue(np.allclose(curve[::4], points))
+
+    def test_joint_coefficients_match_per_joint_loops(self):
+        """
+        Random trajectories of random length, joint count, dimensions and
+        scale give the same coefficients as solving joint by joint
+        """
+        for trial in range(100):
+            rows = self.rng.randint(4, 80)
+            joints = self.rng.randint(1, 8)
+            dims = self.rng.randint(1, 4)
+            traj = self.rng.normal(size=(rows, joints, dims))*self.rng.uniform(0.01, 100.0)
+            b_matrix = bezier.joint_bezier_coefficients(traj)
+            self.assertEqual(b_matrix.shape, (joints, dims, rows-1, 4))
+            for jnt in range(joints):
+                d_pts = dense_de_boor(traj[:, jnt, :])
+                self.assertTrue(np.allclose(b_matrix[jnt], loop_bezier_coefficients(traj[:, jnt, :], d_pts)))
+
+    def test_single_segment_coefficients(self):
+        points = self.rng.normal(size=(2, 3))
+        d_pts = self.rng.normal(size=(5, 3))
+        self.assertTrue(np.allclose(bezier.bezier_coefficients(points, d_pts), loop_bezier_coefficients(points, d_pts)))
+
+if __name__ == '__main__':
+    unittest.main()
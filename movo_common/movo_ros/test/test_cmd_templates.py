@@ -0,0 +1,92 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_cmd_templates.py
+
+ \brief  Tests of the preallocated command frames
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import random
+import array
+
+from movo.cmd_templates import CommandTemplate,COMMAND_WORD_COUNTS
+from movo.system_defines import MOTION_CMD_ID
+from movo.crc32 import calc_crc32
+from movo.utils import generate_cmd_bytes,add_bytes,convert_float_to_u32
+
+def reference_cmd_bytes(cmd):
+    """
+    The frame as the original generate_cmd_bytes built it, one little endian
+    byte at a time
+    """
+    cmd_bytes = []
+    add_bytes(cmd_bytes,cmd[0],16)
+    for cmd_var in cmd[1]:
+        add_bytes(cmd_bytes,cmd_var,32)
+    cmd_bytes = array.array('B',cmd_bytes)
+    add_bytes(cmd_bytes,calc_crc32(cmd_bytes),32)
+    return cmd_bytes
+
+class CommandTemplateTest(unittest.TestCase):
+    def setUp(self):
+        self.rand = random.Random(7)
+
+    def random_words(self,num_words):
+        """
+        Unsigned, negative and float words as the drivers send them
+        """
+        kinds = [lambda: self.rand.getrandbits(32),
+                 lambda: -self.rand.randint(1,1000),
+                 lambda: convert_float_to_u32(self.rand.uniform(-10.0,10.0))]
+        return [self.rand.choice(kinds)() for i in range(num_words)]
+
+    def test_frames_match_the_original_encoding(self):
+        for cmd_id,num_words in sorted(COMMAND_WORD_COUNTS.items()):
+            template = CommandTemplate(cmd_id)
+            for trial in range(20):
+                cmd = [cmd_id,self.random_words(num_words)]
+                template.set_words(cmd[1])
+                template.update_crc()
+                expected = reference_cmd_bytes(cmd)
+                self.assertEqual(template.to_array(),expected,'command %#x' % cmd_id)
+                self.assertEqual(generate_cmd_bytes(cmd),expected,'command %#x' % cmd_id)
+
+    def test_float_words(self):
+        template = CommandTemplate(MOTION_CMD_ID)
+        values = [0.5,-1.25,3.0e-3]
+        for i,value in enumerate(values):
+            template.set_float(i,value)
+        template.update_crc()
+        self.assertEqual(template.to_array(),
+                         reference_cmd_bytes([template.cmd_id,[convert_float_to_u32(v) for v in values]]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_crc32.py
+
+ \brief  Tests of the zlib and table CRC32 implementations
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import array
+import random
+import struct
+import unittest
+
+from movo import crc32
+
+
+class TestCrc32(unittest.TestCase):
+
+    def setUp(self):
+        self.rand = random.Random(1248)
+
+    def random_bytes(self, size):
+        return array.array('B', [self.rand.randint(0, 255) for _ in range(size)])
+
+    def add_crc(self, byte_buff, crc):
+        byte_buff.extend(array.array('B', struct.pack('<I', crc)))
+        return byte_buff
+
+    def test_calc_matches_reference(self):
+        for size in [0, 1, 2, 3, 4, 7, 18, 86, 72, 1248] + [self.rand.randint(0, 1248) for _ in range(50)]:
+            data = self.random_bytes(size)
+            self.assertEqual(crc32.calc_crc32_table(data), crc32.calc_crc32_zlib(data),
+                             "CRC mismatch for %d byte buffer" % size)
+
+    def test_calc_accepts_lists(self):
+        data = self.random_bytes(64)
+        self.assertEqual(crc32.calc_crc32_table(data.tolist()), crc32.calc_crc32_zlib(data.tolist()))
+
+    def test_valid_matches_reference(self):
+        for size in [0, 14, 82, 1244]:
+            data = self.random_bytes(size)
+            frame = self.add_crc(data, crc32.calc_crc32_table(data))
+            self.assertTrue(crc32.valid_crc32_table(frame))
+            self.assertTrue(crc32.valid_crc32_zlib(frame))
+
+            frame[self.rand.randint(0, len(frame) - 1)] ^= 0x10
+            self.assertFalse(crc32.valid_crc32_table(frame))
+            self.assertFalse(crc32.valid_crc32_zlib(frame))
+
+    def test_selected_implementation(self):
+        data = self.random_bytes(1248)
+        self.assertEqual(crc32.calc_crc32_table(data), crc32.calc_crc32(data))
+        self.assertTrue(crc32.valid_crc32(self.add_crc(data, crc32.calc_crc32(data))))
+
+
+if __name__ == '__main__':
+    unittest.main()
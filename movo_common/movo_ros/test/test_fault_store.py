@@ -0,0 +1,103 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_fault_store.py
+
+ \brief  Tests of the faultlog store
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import os
+import shutil
+import tempfile
+
+from movo.fault_store import FaultStore,faultlog_stamp,parse_stamp,ingest_faultlog
+from movo.faultlog_parser import save_faultlog_dump
+from movo.system_defines import NUMBER_OF_FAULTLOG_WORDS
+
+def faultlog(serial,entries):
+    """
+    entries are (seconds, critical faults, comm faults)
+    """
+    data = [0]*NUMBER_OF_FAULTLOG_WORDS
+    data[4] = serial
+    data[2] = len(entries)
+    for i,(seconds,critical,comm) in enumerate(entries):
+        start = 11 + i*15
+        data[start] = seconds
+        data[start+1] = 100 + i
+        data[start+2] = 7
+        data[start+4] = critical
+        data[start+5] = comm
+    return data
+
+class FaultStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = FaultStore(os.path.join(self.dir,'faults.db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def test_repeated_logs_are_deduplicated(self):
+        first = faultlog(1,[(1000,0x1,0x0),(2000,0x2,0x3)])
+        self.assertEqual(self.store.ingest(first),2)
+        self.assertEqual(self.store.ingest(first),None)
+        self.assertEqual(self.store.ingest(faultlog(1,[(1000,0x1,0x0),(2000,0x2,0x3),(3000,0x1,0x0)])),1)
+        counts = dict([(name,count) for group,name,count,robots,first,last in self.store.fault_counts()])
+        self.assertEqual(counts,{'CRITICAL_FAULT_INIT':2,'CRITICAL_FAULT_INIT_PROPULSION':1,
+                                 'COMM_FAULT_ETH_RX_OVRRUN':1,'COMM_FAULT_ETH_TX_OVRRUN':1})
+
+    def test_time_range_and_robots(self):
+        self.store.ingest(faultlog(1,[(1000,0x1,0x0),(5000,0x1,0x0)]))
+        self.store.ingest(faultlog(2,[(3000,0x1,0x0)]),source='movo2')
+        group,name,count,robots,first,last = self.store.fault_counts()[0]
+        self.assertEqual((group,name,count,robots),('Critical Faults','CRITICAL_FAULT_INIT',3,2))
+        self.assertEqual((first,last),(faultlog_stamp(1000),faultlog_stamp(5000)))
+        self.assertEqual(self.store.fault_counts(faultlog_stamp(2000),faultlog_stamp(4000))[0][2],1)
+        self.assertEqual([row[1] for row in self.store.fault_history('CRITICAL_FAULT_INIT')],
+                         ['0000000100000000','0000000200000000','0000000100000000'])
+        self.assertEqual([(robot,faults) for robot,entries,faults,distinct,first,last in self.store.robot_summary()],
+                         [('0000000100000000',2),('0000000200000000',1)])
+
+    def test_dump_and_dates(self):
+        path = os.path.join(self.dir,'log.dat')
+        save_faultlog_dump(path,faultlog(1,[(86400,0x4,0x0)]))
+        self.assertEqual(self.store.ingest_dump(path),1)
+
+        """
+        The same entry extracted by the driver is already stored under the serial
+        """
+        self.assertEqual(ingest_faultlog(self.store.path,faultlog(1,[(86400,0x4,0x0),(90000,0x4,0x0)])),1)
+        self.assertEqual(self.store.fault_history('CRITICAL_FAULT_INIT_TIMEOUT')[0][0],parse_stamp('2011-01-02'))
+
+if __name__ == '__main__':
+    unittest.main()
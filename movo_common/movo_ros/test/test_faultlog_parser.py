@@ -0,0 +1,80 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_faultlog_parser.py
+
+ \brief  Golden output tests of the faultlog report
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import os
+
+from movo.faultlog_parser import *
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),'data')
+
+class FaultlogParserTest(unittest.TestCase):
+    def test_report_matches_golden_output(self):
+        """
+        faultlog.html was rendered from faultlog.txt by the original parser,
+        the log has set and unknown fault bits, empty entries and a latest
+        entry
+        """
+        data = load_faultlog_dump(os.path.join(DATA_DIR,'faultlog.txt'))
+        with open(os.path.join(DATA_DIR,'faultlog.html')) as f:
+            golden = f.read()
+        self.assertEqual(render_faultlog('faultlog.html',data),golden)
+
+    def test_tables_follow_decode_list(self):
+        self.assertEqual(len(FAULT_BIT_NAMES),len(decode_list))
+        for group,decode in enumerate(decode_list):
+            for bit,name in decode.items():
+                if (bit <= 0) or (bit & (bit-1)):
+                    continue
+                self.assertEqual(FAULT_BIT_NAMES[group][bit.bit_length()-1],name)
+        self.assertEqual(decode_faults(0x1,0),[FAULT_BIT_ROWS[0][0]])
+
+    def test_decode_fsw(self):
+        """
+        The same names the original decoder looked up bit by bit in the
+        decode dictionaries
+        """
+        fsw = [0]*4
+        fsw[FSW_CRITICAL_FAULTS_INDEX] |= (0x3 << FSW_CRITICAL_FAULTS_SHIFT)
+        fsw[FSW_ARCH_FAULTS_INDEX] |= 0x8000
+        fsw[FSW_MD_FAULTS_INDEX] |= 0x10
+        expected = []
+        for group,value in [(FAULTGROUP_CRITICAL,0x3),(FAULTGROUP_MD,0x10),(FAULTGROUP_ARCHITECTURE,0x8000)]:
+            expected += [decode_list[group].get(1<<x,NO_FAULT_INDICATION) for x in range(32) if (value & (1<<x))]
+        self.assertEqual(decode_fsw(fsw),expected)
+        self.assertEqual(decode_fsw([0]*4),[])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_flight_recorder.py
+
+ \brief  Tests of the columnar flight recorder
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import os
+import shutil
+import tempfile
+import StringIO
+
+from movo import flight_recorder
+from movo.flight_recorder import FlightRecorder,FlightRecorderReader
+from movo.frame_decoder import MOVO_RSP_LAYOUT
+
+def frame(i):
+    return [(0.5*i if ('f' == t) else i) for t in MOVO_RSP_LAYOUT]
+
+class FlightRecorderTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _record(self,frames,**kwargs):
+        recorder = FlightRecorder(self.dir,**kwargs)
+        for i in range(frames):
+            recorder.record(frame(i),100.0 + 0.01*i)
+        recorder.Shutdown()
+
+    def test_query_time_range(self):
+        self._record(250,chunk_rows=100)
+        reader = FlightRecorderReader(self.dir)
+        self.assertEqual(len(reader.chunks('battery')),3)
+        names,rows = reader.query('battery',101.0,101.025,['batt_soc'])
+        self.assertEqual(names,['stamp','batt_soc'])
+        self.assertEqual([row[1] for row in rows],[0.5*i for i in range(100,103)])
+
+    def test_chunks_outside_the_range_are_not_decompressed(self):
+        self._record(250,chunk_rows=100)
+        decompressed = []
+        decompress = flight_recorder.zlib.decompress
+        def counting(data):
+            decompressed.append(len(data))
+            return decompress(data)
+        flight_recorder.zlib.decompress = counting
+        try:
+            names,rows = FlightRecorderReader(self.dir).query('battery',101.0,101.025,['batt_soc'])
+        finally:
+            flight_recorder.zlib.decompress = decompress
+        self.assertEqual(len(rows),3)
+        self.assertEqual(len(decompressed),2)
+
+    def test_typed_columns(self):
+        self._record(10,chunk_rows=100)
+        names,rows = FlightRecorderReader(self.dir).query('status',fields=['operational_state'])
+        self.assertEqual([row[1] for row in rows],list(range(10)))
+        self.assertIsInstance(rows[3][1],(int,long))
+
+    def test_csv(self):
+        self._record(3)
+        out = StringIO.StringIO()
+        self.assertEqual(FlightRecorderReader(self.dir).to_csv(out,'battery',fields=['batt_soc']),3)
+        self.assertEqual(out.getvalue().splitlines(),['stamp,batt_soc','100.0,0.0','100.01,0.5','100.02,1.0'])
+
+    def test_directory_is_bounded(self):
+        self._record(2000,chunk_rows=50,max_bytes=20000)
+        size = sum([os.path.getsize(os.path.join(self.dir,f)) for f in os.listdir(self.dir)])
+        self.assertLessEqual(size,20000)
+        names,rows = FlightRecorderReader(self.dir).query('dynamics')
+        self.assertEqual(rows[-1][0],100.0 + 0.01*1999)
+
+if __name__ == '__main__':
+    unittest.main()
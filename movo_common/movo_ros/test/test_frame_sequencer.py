@@ -0,0 +1,104 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_frame_sequencer.py
+
+ \brief  Tests of the base feedback frame sequencing
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import struct
+
+from movo.frame_sequencer import FrameSequencer,float32_resolution
+
+def f32(value):
+    return struct.unpack('=f',struct.pack('=f',value))[0]
+
+class FrameSequencerTest(unittest.TestCase):
+    def test_in_order(self):
+        seq = FrameSequencer(0.01)
+        self.assertTrue(all([seq.accept(f32(10.0 + 0.01*i)) for i in range(100)]))
+        self.assertEqual([count for name,count in seq.counters()],[0,0,0,0,0])
+
+    def test_duplicates_and_reordering_are_dropped(self):
+        seq = FrameSequencer(0.01)
+        accepted = [seq.accept(t) for t in [1.00,1.01,1.01,1.03,1.02,1.04]]
+        self.assertEqual(accepted,[True,True,False,True,False,True])
+        self.assertEqual((seq.duplicates,seq.out_of_order),(1,1))
+        self.assertEqual((seq.gaps,seq.lost_frames),(1,1))
+
+    def test_gap_counts_lost_frames(self):
+        seq = FrameSequencer(0.01)
+        seq.accept(2.0)
+        seq.accept(2.05)
+        self.assertEqual((seq.gaps,seq.lost_frames),(1,4))
+
+    def test_platform_reset_and_restart(self):
+        seq = FrameSequencer(0.01)
+        seq.accept(100.0)
+        self.assertTrue(seq.accept(0.5))
+        self.assertEqual(seq.resets,1)
+        seq.restart()
+        self.assertTrue(seq.accept(0.2))
+        self.assertEqual(seq.out_of_order,0)
+
+    def test_period_must_be_positive(self):
+        self.assertRaises(ValueError,FrameSequencer,0.0)
+        self.assertRaises(ValueError,FrameSequencer,-0.01)
+
+    def test_coarse_time_is_not_a_duplicate(self):
+        """
+        After about 2.3 days a float32 no longer resolves 5 ms
+        """
+        t = f32(300000.0)
+        self.assertGreater(float32_resolution(t),0.005)
+        seq = FrameSequencer(0.01)
+        self.assertTrue(seq.accept(t))
+        self.assertTrue(seq.accept(t))
+        self.assertEqual(seq.duplicates,0)
+
+    def test_coarse_time_steps_are_not_gaps(self):
+        """
+        At 2^17 s and 2^18 s a 100 Hz stream steps by 0, 1 or 2 float32 ulps
+        """
+        for base in [2.0**17,2.0**18]:
+            seq = FrameSequencer(0.01)
+            self.assertTrue(all([seq.accept(f32(base + 0.01*i)) for i in range(1000)]))
+            self.assertEqual((seq.gaps,seq.lost_frames),(0,0))
+
+            """
+            Half a second of missing frames is still a gap
+            """
+            seq.accept(f32(base + 0.01*1050))
+            self.assertEqual(seq.gaps,1)
+            self.assertTrue(0 < seq.lost_frames <= 49)
+
+if __name__ == '__main__':
+    unittest.main()
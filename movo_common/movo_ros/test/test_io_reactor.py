@@ -0,0 +1,89 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_io_reactor.py
+
+ \brief  Tests of the epoll reactor links
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import multiprocessing
+import socket
+import time
+
+from movo.io_reactor import IoReactor,IoReactorLink
+
+def closed_udp_port():
+    sock = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1',0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+class IoReactorLinkTest(unittest.TestCase):
+    def setUp(self):
+        self.reactor = IoReactor()
+        self.link = IoReactorLink(self.reactor,('127.0.0.1',closed_udp_port()),
+                                  multiprocessing.Queue(),multiprocessing.Queue(),local_ip='127.0.0.2')
+        self.assertTrue(self.link.link_up)
+
+    def tearDown(self):
+        self.link.Close()
+        self.reactor.Shutdown()
+
+    def test_socket_error_does_not_spin(self):
+        """
+        Sending to a closed port queues an ICMP port unreachable error on the
+        socket, once it is cleared the reactor goes idle again
+        """
+        calls = []
+        on_socket = self.reactor._handlers[self.link._conn_fd]
+        def counting(mask):
+            calls.append(mask)
+            on_socket(mask)
+        self.reactor._handlers[self.link._conn_fd] = counting
+
+        self.link.tx_queue.put(b'\x00'*8)
+        time.sleep(0.2)
+        self.assertGreater(len(calls),0)
+        settled = len(calls)
+        time.sleep(0.2)
+        self.assertEqual(len(calls),settled)
+        self.assertLess(settled,10)
+
+        """
+        The link keeps working after the error
+        """
+        self.link.tx_queue.put(b'\x00'*8)
+        time.sleep(0.2)
+        self.assertLess(len(calls),20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_jtas_host.py
+
+ \brief  Tests of the co-located trajectory server host and its joint links
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import threading
+
+try:
+    import rospy
+    from trajectory_msgs.msg import JointTrajectoryPoint
+    from sensor_msgs.msg import JointState
+    from movo.system_defines import STREAM_VELOCITY_LIMIT
+    from movo_jtas import joint_links,jtas_host
+except ImportError:
+    rospy = None
+
+def point(*positions):
+    pnt = JointTrajectoryPoint()
+    pnt.positions = list(positions)
+    return pnt
+
+class FakePublisher(object):
+    def __init__(self,topic,msg_type,queue_size=None):
+        self.topic = topic
+        self.published = []
+
+    def publish(self,msg):
+        self.published.append(msg)
+
+class FakeServer(object):
+    def __init__(self,rate,command=None,joint_state=None,control_loop=None):
+        self.command = command
+        self.joint_state = joint_state
+        self.control_loop = control_loop
+        self.init_success = True
+
+class FakePanTilt(object):
+    feedback = True
+    def __init__(self,movo_ip,control_loop=None):
+        self.control_loop = control_loop
+        self.init_success = True
+        self.setpoints = []
+        self.shutdown = False
+
+    def wait_for_feedback(self,timeout=None):
+        return FakePanTilt.feedback
+
+    def command_setpoint(self,positions,velocities,accelerations):
+        self.setpoints.append((list(positions),velocities,accelerations))
+
+    def joint_state(self):
+        return 'pan_tilt_js'
+
+    def Shutdown(self):
+        self.shutdown = True
+
+class FakeLinear(object):
+    def __init__(self,movo_ip):
+        self.init_success = True
+        self.positions = []
+
+    def command_position(self,position):
+        self.positions.append(position)
+
+    def Shutdown(self):
+        pass
+
+class FakeLoop(object):
+    def __init__(self,rate):
+        self.running = True
+
+    def Shutdown(self):
+        self.running = False
+
+@unittest.skipIf(rospy is None, "ROS is not installed")
+class JointLinksTest(unittest.TestCase):
+    def setUp(self):
+        rospy.rostime.set_rostime_initialized(True)
+        self._saved = dict([(name,getattr(rospy,name)) for name in ['Publisher','Subscriber','wait_for_message']])
+
+    def tearDown(self):
+        for name,value in self._saved.items():
+            setattr(rospy,name,value)
+
+    def test_topic_command(self):
+        rospy.Publisher = FakePublisher
+        command = joint_links.TopicCommand('/movo/head/cmd',None,joint_links.pan_tilt_cmd)
+        command(point(0.25,-0.5))
+        msg = command._pub.published[0]
+        self.assertEqual((msg.pan_cmd.pos_rad,msg.tilt_cmd.pos_rad),(0.25,-0.5))
+        self.assertEqual(msg.pan_cmd.vel_rps,STREAM_VELOCITY_LIMIT)
+        self.assertEqual(joint_links.linear_actuator_cmd(point(0.3)).desired_position_m,0.3)
+
+    def test_topic_joint_state(self):
+        subscribed = []
+        first = JointState()
+        rospy.wait_for_message = lambda topic,msg_type: first
+        rospy.Subscriber = lambda topic,msg_type,callback: subscribed.append(callback)
+        joint_state = joint_links.TopicJointState('/movo/head/joint_states')
+        self.assertIs(joint_state(),first)
+        latest = JointState()
+        subscribed[0](latest)
+        self.assertIs(joint_state(),latest)
+
+    def test_shared_control_loop(self):
+        loop = joint_links.SharedControlLoop(200.0)
+        ticks = []
+        def server():
+            for i in range(5):
+                before = loop._tick
+                loop.sleep()
+                ticks.append(loop._tick > before)
+        servers = [threading.Thread(target=server) for i in range(2)]
+        for thread in servers:
+            thread.start()
+        for thread in servers:
+            thread.join(2.0)
+        self.assertEqual(ticks,[True]*10)
+
+        """
+        Tick callbacks run from the loop thread
+        """
+        ticked = threading.Event()
+        callback = lambda event: ticked.set()
+        loop.add_tick_callback(callback)
+        self.assertTrue(ticked.wait(1.0))
+        loop.remove_tick_callback(callback)
+        self.assertEqual(loop._callbacks,[])
+
+        """
+        Once shut down sleep returns at once
+        """
+        loop.Shutdown()
+        done = threading.Event()
+        sleeper = threading.Thread(target=lambda: (loop.sleep(),done.set()))
+        sleeper.start()
+        self.assertTrue(done.wait(1.0))
+
+@unittest.skipIf(rospy is None, "ROS is not installed")
+class JTASHostTest(unittest.TestCase):
+    def setUp(self):
+        self._saved = dict([(name,getattr(jtas_host,name)) for name in
+                            ['MovoHeadJTAS','MovoTorsoJTAS','PanTiltIO','LinearActuator','SharedControlLoop']])
+        jtas_host.MovoHeadJTAS = FakeServer
+        jtas_host.MovoTorsoJTAS = FakeServer
+        jtas_host.PanTiltIO = FakePanTilt
+        jtas_host.LinearActuator = FakeLinear
+        jtas_host.SharedControlLoop = FakeLoop
+        FakePanTilt.feedback = True
+
+    def tearDown(self):
+        for name,value in self._saved.items():
+            setattr(jtas_host,name,value)
+
+    def test_direct_links(self):
+        host = jtas_host.JTASHost(pan_tilt=True,linear_actuator=True)
+        self.assertTrue(host.init_success)
+        head = host.servers['head']
+        torso = host.servers['torso']
+        self.assertIs(head.control_loop,torso.control_loop)
+        self.assertEqual(head.joint_state(),'pan_tilt_js')
+        self.assertIsNone(torso.joint_state)
+
+        head.command(point(0.1,0.2))
+        torso.command(point(0.35))
+        pan_tilt,linear = host._drivers
+        self.assertIs(pan_tilt.control_loop,head.control_loop)
+        self.assertEqual(pan_tilt.setpoints,[([0.1,0.2],[STREAM_VELOCITY_LIMIT]*2,[0.0,0.0])])
+        self.assertEqual(linear.positions,[0.35])
+        host.Shutdown()
+        self.assertTrue(pan_tilt.shutdown)
+
+    def test_topic_links_by_default(self):
+        host = jtas_host.JTASHost(servers=['head'])
+        self.assertEqual(list(host.servers.keys()),['head'])
+        self.assertIsNone(host.servers['head'].command)
+        self.assertIsNone(host.servers['head'].joint_state)
+
+    def test_waits_for_pan_tilt_feedback(self):
+        FakePanTilt.feedback = False
+        host = jtas_host.JTASHost(pan_tilt=True,feedback_timeout=0.01)
+        self.assertFalse(host.init_success)
+        self.assertEqual(host.servers,{})
+        self.assertFalse(host._loop.running)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_motion_scheduler.py
+
+ \brief  Tests of the fixed rate motion command scheduler
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import struct
+
+try:
+    import rospy
+    from movo import motion_scheduler
+    from movo.motion_scheduler import MotionCommandScheduler
+    from movo.system_defines import MOTION_CMD_ID
+except ImportError:
+    rospy = None
+
+class FakeTimer(object):
+    def __init__(self,period,callback):
+        self.period = period
+        self.callback = callback
+        self.running = True
+
+    def shutdown(self):
+        self.running = False
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+class FrameQueue(object):
+    def __init__(self):
+        self.frames = []
+
+    def put(self,frame):
+        self.frames.append(bytearray(frame))
+
+def decode(frame):
+    cmd_id = struct.unpack_from('<H',frame,0)[0]
+    return cmd_id,struct.unpack_from('<3f',frame,2)
+
+@unittest.skipIf(rospy is None, "ROS is not installed")
+class MotionSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self._saved = (motion_scheduler.rospy.Timer,motion_scheduler.rospy.get_time)
+        self.clock = FakeClock()
+        motion_scheduler.rospy.Timer = lambda period,callback: FakeTimer(period,callback)
+        motion_scheduler.rospy.get_time = self.clock
+        self.queue = FrameQueue()
+        self.scheduler = MotionCommandScheduler(self.queue,rate_hz=50.0,source_timeout=0.2,
+                                                priorities={'/teleop':10})
+
+    def tearDown(self):
+        motion_scheduler.rospy.Timer,motion_scheduler.rospy.get_time = self._saved
+
+    def tick(self,dt=0.02):
+        self.clock.now += dt
+        self.scheduler._tick(None)
+
+    def test_fixed_rate(self):
+        self.assertAlmostEqual(self.scheduler._timer.period.to_sec(),0.02)
+        self.scheduler.Shutdown()
+        self.assertFalse(self.scheduler._timer.running)
+
+    def test_one_frame_per_period_with_the_latest_setpoint(self):
+        for i in range(10):
+            self.scheduler.update('/planner',0.1*i,0.0,0.0)
+        self.tick()
+        self.assertEqual(len(self.queue.frames),1)
+        cmd_id,values = decode(self.queue.frames[0])
+        self.assertEqual(cmd_id,MOTION_CMD_ID)
+        self.assertAlmostEqual(values[0],0.9,places=6)
+
+        """
+        The setpoint is resent every period while the source is alive
+        """
+        self.tick(0.01)
+        self.assertEqual(len(self.queue.frames),2)
+        self.assertEqual(self.queue.frames[0],self.queue.frames[1])
+
+    def test_priority_and_ties(self):
+        self.scheduler.update('/teleop',0.5,0.0,0.0)
+        self.clock.now += 0.01
+        self.scheduler.update('/planner',1.0,0.0,0.0)
+        self.tick(0.0)
+        self.assertAlmostEqual(decode(self.queue.frames[-1])[1][0],0.5)
+
+        """
+        Between equal priorities the newest setpoint wins
+        """
+        self.clock.now += 0.01
+        self.scheduler.update('/other',-1.0,0.25,0.0)
+        self.clock.now += 0.01
+        self.scheduler.update('/planner',2.0,0.0,0.0)
+        self.scheduler._setpoints.pop('/teleop')
+        self.tick(0.0)
+        self.assertAlmostEqual(decode(self.queue.frames[-1])[1][0],2.0)
+
+    def test_sources_time_out(self):
+        self.scheduler.update('/teleop',0.5,0.0,0.0)
+        self.scheduler.update('/planner',1.0,0.0,0.3)
+        self.clock.now += 0.15
+        self.scheduler.update('/planner',1.0,0.0,0.3)
+        self.tick(0.1)
+        cmd_id,values = decode(self.queue.frames[-1])
+        self.assertAlmostEqual(values[2],0.3,places=6)
+        self.assertEqual(list(self.scheduler._setpoints.keys()),['/planner'])
+
+        """
+        Once every source timed out nothing is sent and the base times out
+        on its own
+        """
+        self.tick(0.3)
+        self.assertEqual(len(self.queue.frames),1)
+        self.assertEqual(self.scheduler._setpoints,dict())
+
+    def test_sent_callback(self):
+        sent = []
+        self.scheduler = MotionCommandScheduler(self.queue,rate_hz=50.0,sent_callback=lambda: sent.append(len(self.queue.frames)))
+        self.tick()
+        self.assertEqual(sent,[])
+        self.scheduler.update('/planner',1.0,0.0,0.0)
+        self.tick()
+        self.tick()
+        self.assertEqual(sent,[1,2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_packet_capture.py
+
+ \brief  Tests of the packet capture log and its replay
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import array
+import os
+import shutil
+import tempfile
+
+from movo.packet_capture import PacketCapture,CaptureReader,PacketReplay,DIR_TX,DIR_RX,index_path
+
+BASE = ('10.66.171.5',8080)
+HEAD = ('10.66.171.5',6237)
+
+class PacketCaptureTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir,'movo.cap')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _capture(self,frames):
+        capture = PacketCapture(self.path,ring_slots=len(frames),chunk_size=4096)
+        for direction,address,data,stamp in frames:
+            capture.record(direction,address,data,stamp)
+        capture.close()
+        return capture
+
+    def test_round_trip(self):
+        frames = [(DIR_TX,BASE,array.array('B',[1,2,3]),10.0)]
+        frames += [(DIR_RX,BASE if (i%2) else HEAD,array.array('B',[i]*700),10.0+i*0.01) for i in range(20)]
+        capture = self._capture(frames)
+        self.assertEqual(capture.records,len(frames))
+        self.assertEqual(capture.dropped,0)
+
+        reader = CaptureReader(self.path)
+        self.assertEqual(len(reader),len(frames))
+        for record,frame in zip(reader,frames):
+            self.assertEqual((record.direction,record.remote_address,record.data,record.stamp),frame)
+        reader.close()
+
+    def test_index_is_rebuilt(self):
+        self._capture([(DIR_RX,BASE,array.array('B',[i]*10),float(i)) for i in range(5)])
+        os.remove(index_path(self.path))
+        reader = CaptureReader(self.path)
+        self.assertEqual([record.stamp for record in reader],[0.0,1.0,2.0,3.0,4.0])
+        reader.close()
+
+    def test_full_ring_drops(self):
+        capture = PacketCapture(self.path,ring_slots=2,flush_period=10.0)
+        for i in range(5):
+            capture.record(DIR_RX,BASE,array.array('B',[i]))
+        capture.close()
+        self.assertEqual((capture.records,capture.dropped),(2,3))
+
+    def test_replay_routes_by_endpoint(self):
+        frames = [(DIR_TX,BASE,array.array('B',[0]),0.0)]
+        frames += [(DIR_RX,BASE if (i%2) else HEAD,array.array('B',[i]),0.001*i) for i in range(10)]
+        self._capture(frames)
+        base = []
+        reader = CaptureReader(self.path)
+        stats = PacketReplay(reader,dict({BASE[1]:lambda data,stamp: base.append(data[0])}),speed=0).run()
+        reader.close()
+        self.assertEqual(base,[1,3,5,7,9])
+        self.assertEqual((stats.frames,stats.skipped),(5,6))
+
+if __name__ == '__main__':
+    unittest.main()
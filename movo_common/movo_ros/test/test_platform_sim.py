@@ -0,0 +1,152 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_platform_sim.py
+
+ \brief  Loopback tests of the platform simulator
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import threading
+import socket
+import struct
+import time
+
+from movo.platform_sim import MovoPlatformSim,LinkImpairments,GRIPPER_FRAME_SIZE
+from movo.utils import generate_cmd_bytes,convert_float_to_u32
+from movo.crc32 import valid_crc32,calc_crc32
+from movo.system_defines import *
+from movo_gripper_interface.modbus_crc import compute_modbus_rtu_crc,verify_modbus_rtu_crc
+
+EPHEMERAL_PORTS = dict({'base':0,'linear_actuator':0,'pan_tilt':0,'gripper':0})
+
+class PlatformSimTest(unittest.TestCase):
+    def setUp(self):
+        self.sim = MovoPlatformSim(ports=EPHEMERAL_PORTS,base_rate_hz=500.0)
+        self.thread = threading.Thread(target=self.sim.run)
+        self.thread.start()
+        self.conn = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
+        self.conn.settimeout(1.0)
+        self.conn.connect(self.sim.address('base'))
+
+    def tearDown(self):
+        self.sim.stop()
+        self.thread.join()
+        self.sim.close()
+        self.conn.close()
+
+    def _send(self,cmd):
+        self.conn.send(generate_cmd_bytes(cmd).tostring())
+
+    def _recv_base(self):
+        data = bytearray(self.conn.recv(2048))
+        self.assertTrue(valid_crc32(data))
+        self.assertEqual(len(data),(NUMBER_OF_MOVO_RSP_WORDS+1)*4)
+        return struct.unpack_from('=%dI' % NUMBER_OF_MOVO_RSP_WORDS,data)
+
+    def _word_float(self,words,index):
+        return struct.unpack('<f',struct.pack('<I',words[index]))[0]
+
+    def test_streams_valid_frames(self):
+        self._send([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_CONTINUOUS_DATA,1]])
+        for i in range(20):
+            words = self._recv_base()
+        self.assertEqual(words[ROS_OPERATIONAL_STATE_INDEX],MOVO_MODES_DICT[STANDBY_REQUEST])
+
+    def test_faultlog(self):
+        self._send([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_FAULTLOG,0]])
+        data = bytearray(self.conn.recv(2048))
+        self.assertTrue(valid_crc32(data))
+        self.assertEqual(len(data),(NUMBER_OF_FAULTLOG_WORDS+1)*4)
+
+    def test_base_follows_motion_commands_in_tractor(self):
+        self._send([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SET_OPERATIONAL_MODE,TRACTOR_REQUEST]])
+        self._send([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_SEND_CONTINUOUS_DATA,1]])
+        start = time.time()
+        while ((time.time() - start) < 0.5):
+            self._send([MOTION_CMD_ID,[convert_float_to_u32(0.3),0,0]])
+            words = self._recv_base()
+        self.assertEqual(words[ROS_OPERATIONAL_STATE_INDEX],MOVO_MODES_DICT[TRACTOR_REQUEST])
+        self.assertGreater(self._word_float(words,ROS_ODOM_X_VELOCITY_INDEX),0.1)
+        self.assertGreater(self._word_float(words,ROS_ODOM_X_POSITION_INDEX),0.0)
+
+    def test_configuration_is_stored(self):
+        config = [convert_float_to_u32(0.25)] + [convert_float_to_u32(1.0)]*10 + [0x10]
+        self._send([LOAD_MACH_CONFIG_CMD_ID,config])
+        self._send([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_NONE,0]])
+        words = self._recv_base()
+        self.assertEqual(list(words[START_FRAM_CONFIG_BLOCK:START_FRAM_CONFIG_BLOCK+12]),config)
+
+    def test_rejects_bad_frames(self):
+        frame = generate_cmd_bytes([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_NONE,0]])
+        frame[-1] ^= 0xFF
+        self.conn.send(frame.tostring())
+        self.assertRaises(socket.timeout,self.conn.recv,2048)
+        self.assertEqual(self.sim.stats.rx_bad_crc,1)
+
+    def test_gripper_status(self):
+        conn = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
+        conn.settimeout(1.0)
+        conn.connect(self.sim.address('gripper'))
+        request = [9,0x03,0x07,0xD0,0x00,0x08]
+        compute_modbus_rtu_crc(request)
+        frame = bytearray(GRIPPER_FRAME_SIZE - 4)
+        frame[2] = len(request)
+        frame[3] = 21
+        frame[4:4+len(request)] = bytearray(request)
+        frame += struct.pack('<I',calc_crc32(frame))
+        conn.send(bytes(frame))
+        rsp = bytearray(conn.recv(2048))
+        conn.close()
+        self.assertEqual(len(rsp),GRIPPER_FRAME_SIZE)
+        self.assertTrue(valid_crc32(rsp))
+        self.assertTrue(verify_modbus_rtu_crc(rsp[4:4+21]))
+
+class PlatformSimImpairmentsTest(unittest.TestCase):
+    def test_loss(self):
+        impairments = LinkImpairments(loss=1.0,seed=1)
+        sim = MovoPlatformSim(ports=EPHEMERAL_PORTS,impairments=impairments)
+        thread = threading.Thread(target=sim.run)
+        thread.start()
+        conn = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
+        conn.settimeout(0.3)
+        conn.connect(sim.address('base'))
+        try:
+            conn.send(generate_cmd_bytes([GENERAL_PURPOSE_CMD_ID,[GENERAL_PURPOSE_CMD_NONE,0]]).tostring())
+            self.assertRaises(socket.timeout,conn.recv,2048)
+            self.assertEqual(sim.stats.tx_dropped,1)
+        finally:
+            sim.stop()
+            thread.join()
+            sim.close()
+            conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
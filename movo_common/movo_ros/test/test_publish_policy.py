@@ -0,0 +1,103 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_publish_policy.py
+
+ \brief  Tests of the feedback publish policies
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+
+try:
+    import rospy
+    from movo import publish_policy
+    from movo.publish_policy import PublishPolicy
+except ImportError:
+    rospy = None
+
+class FakeTime(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@unittest.skipIf(rospy is None, "ROS is not installed")
+class PublishPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self._time = publish_policy.time
+        self.clock = FakeTime()
+        publish_policy.time = self.clock
+
+    def tearDown(self):
+        publish_policy.time = self._time
+
+    def test_default_publishes_every_frame(self):
+        policy = PublishPolicy()
+        self.assertTrue(all([policy.should_publish([1.0]) for i in range(10)]))
+
+    def test_rate_divider(self):
+        policy = PublishPolicy(rate_divider=3)
+        self.assertEqual([policy.should_publish() for i in range(9)],[False,False,True]*3)
+        self.assertEqual(PublishPolicy(rate_divider=0).rate_divider,1)
+
+    def test_on_change_with_deadband(self):
+        policy = PublishPolicy(on_change=True,deadband=0.1)
+        published = [policy.should_publish(values) for values in [[1.0,2.0],[1.05,2.0],[1.05,2.09],[1.15,2.0],[1.15,2.0]]]
+        self.assertEqual(published,[True,False,False,True,False])
+
+        """
+        Without a deadband any difference is a change, a new length always is
+        """
+        policy = PublishPolicy(on_change=True)
+        self.assertEqual([policy.should_publish(values) for values in [[1],[1],[2],[2,0]]],[True,False,True,True])
+
+        """
+        Frames without values are not filtered
+        """
+        self.assertTrue(policy.should_publish())
+
+    def test_heartbeat(self):
+        policy = PublishPolicy(on_change=True,heartbeat_hz=2.0)
+        self.assertTrue(policy.should_publish([1.0]))
+        self.clock.now += 0.25
+        self.assertFalse(policy.should_publish([1.0]))
+        self.clock.now += 0.25
+        self.assertTrue(policy.should_publish([1.0]))
+        self.clock.now += 0.1
+        self.assertFalse(policy.should_publish([1.0]))
+        self.assertTrue(policy.should_publish([3.0]))
+
+    def test_rate_divider_before_change_detection(self):
+        policy = PublishPolicy(rate_divider=2,on_change=True)
+        self.assertEqual([policy.should_publish([v]) for v in [1,2,2,2,3,3]],[False,True,False,False,False,True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_ring_queue.py
+
+ \brief  Tests of the in-process datagram ring
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import struct
+import threading
+import time
+
+from movo.ring_queue import RingQueue,RING_OVERWRITE_OLDEST,RING_DROP_NEWEST
+
+def drain(ring):
+    items = []
+    while True:
+        data = ring.get(block=False)
+        if data is None:
+            return items
+        items.append(data)
+
+class RingQueueTest(unittest.TestCase):
+    def test_wraparound_keeps_order(self):
+        ring = RingQueue(slot_size=8,num_slots=4)
+        received = []
+        for i in range(10):
+            self.assertTrue(ring.put(struct.pack('=I',i)))
+            if (i % 2):
+                received.extend(drain(ring))
+        received.extend(drain(ring))
+        self.assertEqual([struct.unpack('=I',data.tostring())[0] for data in received],list(range(10)))
+        ring.close()
+
+    def test_overwrite_oldest(self):
+        ring = RingQueue(slot_size=8,num_slots=4,policy=RING_OVERWRITE_OLDEST)
+        for i in range(10):
+            self.assertTrue(ring.put(struct.pack('=I',i)))
+        self.assertEqual([struct.unpack('=I',data.tostring())[0] for data in drain(ring)],[6,7,8,9])
+        self.assertEqual(ring.overwritten,6)
+        self.assertEqual(ring.dropped,0)
+        ring.close()
+
+    def test_drop_newest(self):
+        ring = RingQueue(slot_size=8,num_slots=4,policy=RING_DROP_NEWEST)
+        results = [ring.put(struct.pack('=I',i)) for i in range(10)]
+        self.assertEqual(results,[True]*4 + [False]*6)
+        self.assertEqual([struct.unpack('=I',data.tostring())[0] for data in drain(ring)],[0,1,2,3])
+        self.assertEqual(ring.dropped,6)
+        ring.close()
+
+    def test_oversized_datagram(self):
+        ring = RingQueue(slot_size=4,num_slots=2)
+        self.assertRaises(ValueError,ring.put,b'12345')
+        ring.close()
+
+    def test_stamped_slots(self):
+        ring = RingQueue(slot_size=8,num_slots=4,stamped=True)
+        ring.put((b'ab',1.5))
+        ring.put((b'cde',2.5))
+        self.assertEqual([(data.tostring(),stamp) for data,stamp in drain(ring)],[(b'ab',1.5),(b'cde',2.5)])
+        ring.close()
+
+    def test_slot_being_overwritten_is_skipped(self):
+        ring = RingQueue(slot_size=8,num_slots=4)
+        ring.put(b'a')
+        ring.put(b'b')
+        ring._seqs[0] = -1
+        self.assertEqual([data.tostring() for data in drain(ring)],[b'b'])
+        self.assertEqual(ring.overwritten,1)
+        ring.close()
+
+    def test_close_wakes_a_waiting_consumer(self):
+        ring = RingQueue(slot_size=8,num_slots=4)
+        result = []
+        def consume():
+            try:
+                ring.get()
+            except EOFError:
+                result.append('eof')
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        time.sleep(0.05)
+        ring.close()
+        consumer.join(2.0)
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(result,['eof'])
+        self.assertFalse(ring.put(b'a'))
+
+    def test_concurrent_producers(self):
+        producers = 4
+        puts = 10000
+        ring = RingQueue(slot_size=8,num_slots=producers*puts,policy=RING_DROP_NEWEST)
+        def produce(n):
+            for i in range(puts):
+                ring.put(struct.pack('=II',n,i))
+        threads = [threading.Thread(target=produce,args=(n,)) for n in range(producers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        received = [struct.unpack('=II',data.tostring()) for data in drain(ring)]
+        self.assertEqual(ring.dropped,0)
+        self.assertEqual(len(received),producers*puts)
+        self.assertEqual(set(received),set([(n,i) for n in range(producers) for i in range(puts)]))
+        for n in range(producers):
+            self.assertEqual([i for m,i in received if (m == n)],list(range(puts)))
+        ring.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_shm_feedback.py
+
+ \brief  Tests of the shared memory feedback channel
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import os
+import threading
+
+from movo import shm_feedback
+from movo.shm_feedback import ShmFeedbackWriter,ShmFeedbackReader,BASE_FEEDBACK_FIELDS,shm_feedback_path
+
+class ShmFeedbackTest(unittest.TestCase):
+    def setUp(self):
+        self.name = 'test_%d/base' % os.getpid()
+        self.writer = ShmFeedbackWriter(self.name,BASE_FEEDBACK_FIELDS)
+
+    def tearDown(self):
+        self.writer.close()
+
+    def test_reader_gets_latest(self):
+        reader = ShmFeedbackReader(self.name)
+        self.assertEqual(reader.fields,BASE_FEEDBACK_FIELDS)
+        self.assertEqual(reader.updates(),0)
+        self.writer.write(range(len(BASE_FEEDBACK_FIELDS)))
+        self.writer.write([2.0*i for i in range(len(BASE_FEEDBACK_FIELDS))])
+        updates,values = reader.read()
+        self.assertEqual(updates,2)
+        self.assertEqual(values[6],12.0)
+        self.assertEqual(reader.read_dict()['linear_actuator_position_m'],16.0)
+        reader.close()
+
+    def test_snapshots_are_consistent(self):
+        reader = ShmFeedbackReader(self.name)
+        done = threading.Event()
+
+        def write():
+            i = 0
+            while not done.is_set():
+                self.writer.write([float(i)]*len(BASE_FEEDBACK_FIELDS))
+                i += 1
+        thread = threading.Thread(target=write)
+        thread.start()
+        try:
+            for i in range(20000):
+                result = reader.read()
+                if result is not None:
+                    self.assertEqual(len(set(result[1])),1)
+        finally:
+            done.set()
+            thread.join()
+            reader.close()
+
+    def test_close_removes_region(self):
+        self.writer.close()
+        self.assertFalse(os.path.exists(shm_feedback_path(self.name)))
+
+    def test_only_x86_is_supported(self):
+        machine = shm_feedback.platform.machine
+        try:
+            for name,supported in [('x86_64',True),('AMD64',True),('aarch64',False),('armv7l',False)]:
+                shm_feedback.platform.machine = lambda: name
+                self.assertEqual(shm_feedback.shm_feedback_supported(),supported)
+        finally:
+            shm_feedback.platform.machine = machine
+
+if __name__ == '__main__':
+    unittest.main()
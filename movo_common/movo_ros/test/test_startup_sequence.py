@@ -0,0 +1,86 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_startup_sequence.py
+
+ \brief  Tests of the response driven startup handshake
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import threading
+import time
+
+from movo.startup_sequence import StartupSequence,StartupStep
+
+class StartupSequenceTest(unittest.TestCase):
+    def test_moves_on_when_notified(self):
+        acked = threading.Event()
+        states = []
+        seq = StartupSequence([StartupStep('request',lambda: None,acked.is_set,timeout=2.0),
+                               StartupStep('check',None,lambda: True)],
+                              states.append)
+
+        def respond():
+            time.sleep(0.1)
+            acked.set()
+            seq.notify()
+        threading.Thread(target=respond).start()
+
+        start = time.time()
+        self.assertTrue(seq.run())
+        self.assertLess(time.time() - start,0.5)
+        self.assertEqual(states,['request','check','ready'])
+
+    def test_retransmits_with_backoff(self):
+        sent = []
+        seq = StartupSequence([StartupStep('request',lambda: sent.append(time.time()),lambda: False,
+                                           timeout=0.5,initial_backoff=0.05,max_backoff=0.1)])
+        self.assertFalse(seq.run())
+        self.assertEqual(seq.failed_step,'request')
+        self.assertEqual(seq.state,'failed')
+        gaps = [b - a for a,b in zip(sent,sent[1:])]
+        self.assertAlmostEqual(gaps[0],0.05,delta=0.03)
+        self.assertAlmostEqual(gaps[-1],0.1,delta=0.03)
+
+    def test_start_is_called_once(self):
+        started = []
+        seq = StartupSequence([StartupStep('wait',None,lambda: len(started) > 0,start=lambda: started.append(1))])
+        self.assertTrue(seq.run())
+        self.assertEqual(started,[1])
+
+    def test_abort(self):
+        seq = StartupSequence([StartupStep('wait',None,lambda: False,timeout=5.0)])
+        threading.Timer(0.1,seq.abort).start()
+        start = time.time()
+        self.assertFalse(seq.run())
+        self.assertLess(time.time() - start,1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""--------------------------------------------------------------------
+Copyright (c) 2017, Kinova Robotics inc.
+
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification,
+are permitted provided that the following conditions are met:
+
+    * Redistributions of source code must retain the above copyright notice,
+      this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright notice,
+      this list of conditions and the following disclaimer in the documentation
+      and/or other materials provided with the distribution.
+    * Neither the name of the copyright holder nor the names of its contributors
+      may be used to endorse or promote products derived from this software
+      without specific prior written permission.
+      
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR 
+CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, 
+EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, 
+PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR 
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF 
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING 
+NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS 
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ 
+ \file   test_trajectory_streamer.py
+
+ \brief  Tests of the time indexed trajectory streaming
+
+ \Platform: Linux/ROS Indigo
+--------------------------------------------------------------------"""
+import unittest
+import struct
+import threading
+
+from movo.trajectory_streamer import TrajectoryStreamer
+
+try:
+    import rospy
+    from trajectory_msgs.msg import JointTrajectory,JointTrajectoryPoint
+    from movo.movo_pan_tilt import PanTiltIO
+    from movo.link_monitor import LinkMonitor
+    from movo.system_defines import STREAM_VELOCITY_LIMIT
+except ImportError:
+    rospy = None
+
+class TrajectoryStreamerTest(unittest.TestCase):
+    def assertListAlmostEqual(self,first,second):
+        self.assertEqual(len(first),len(second))
+        for a,b in zip(first,second):
+            self.assertAlmostEqual(a,b)
+
+    def test_linear_follows_time_from_start(self):
+        streamer = TrajectoryStreamer(2)
+        streamer.set_trajectory(10.0,[0.0,1.0,3.0],[[0.0,0.0],[1.0,-1.0],[2.0,-1.0]])
+        self.assertTrue(streamer.timed())
+        self.assertListAlmostEqual(streamer.sample(9.0)[0],[0.0,0.0])
+        self.assertListAlmostEqual(streamer.sample(10.5)[0],[0.5,-0.5])
+        self.assertListAlmostEqual(streamer.sample(12.0)[0],[1.5,-1.0])
+        self.assertListAlmostEqual(streamer.sample(12.0)[1],[0.5,0.0])
+        self.assertListAlmostEqual(streamer.sample(20.0)[0],[2.0,-1.0])
+
+        """
+        Samples going back in time find their segment again
+        """
+        self.assertListAlmostEqual(streamer.sample(10.25)[0],[0.25,-0.25])
+
+    def test_hermite_matches_the_points(self):
+        streamer = TrajectoryStreamer(1)
+        streamer.set_trajectory(0.0,[0.0,2.0],[[0.0],[2.0]],[[0.0],[0.0]])
+        positions,velocities,accelerations = streamer.sample(1.0)
+        self.assertAlmostEqual(positions[0],1.0)
+        self.assertAlmostEqual(velocities[0],1.5)
+        self.assertAlmostEqual(accelerations[0],0.0)
+        self.assertAlmostEqual(streamer.sample(1e-9)[1][0],0.0,places=6)
+        self.assertAlmostEqual(streamer.sample(2.0-1e-9)[0][0],2.0,places=6)
+
+    def test_preemption_replaces_the_trajectory(self):
+        streamer = TrajectoryStreamer(2)
+        streamer.set_trajectory(0.0,[0.0,10.0],[[0.0,0.0],[10.0,10.0]])
+        self.assertListAlmostEqual(streamer.sample(5.0)[0],[5.0,5.0])
+        streamer.set_point([1.0,2.0],[0.5,0.5],[0.0,0.0])
+        self.assertFalse(streamer.timed())
+        self.assertEqual(streamer.sample(6.0),([1.0,2.0],[0.5,0.5],[0.0,0.0]))
+
+    def test_deadband(self):
+        streamer = TrajectoryStreamer(2,deadband=0.01)
+        self.assertTrue(streamer.changed([0.0,1.0]))
+        self.assertFalse(streamer.changed([0.005,1.0]))
+        self.assertTrue(streamer.changed([0.02,1.0]))
+        streamer.reset_sent()
+        self.assertTrue(streamer.changed([0.02,1.0]))
+
+    def test_rejects_bad_trajectories(self):
+        streamer = TrajectoryStreamer(2)
+        self.assertRaises(ValueError,streamer.set_trajectory,0.0,[1.0,0.5],[[0.0,0.0],[1.0,1.0]])
+        self.assertRaises(ValueError,streamer.set_trajectory,0.0,[0.0],[[0.0]])
+        self.assertFalse(streamer.active())
+
+@unittest.skipIf(rospy is None, "ROS is not installed")
+class PanTiltCommandTest(unittest.TestCase):
+    def setUp(self):
+        """
+        Only the command side of the driver, no link is opened
+        """
+        self.io = PanTiltIO.__new__(PanTiltIO)
+        self.io._control_loop = None
+        self.io._cmd_mutex = threading.Lock()
+        self.io._link_monitor = LinkMonitor('pan_tilt')
+        self.io._streamer = TrajectoryStreamer(2,0.01)
+        self.io._last_cmd = JointTrajectoryPoint()
+        self.io._last_cmd.positions = [0.0,0.0]
+        self.io._streamer.changed([0.0,0.0])
+
+    def test_new_commands_are_always_sent(self):
+        self.io.command_setpoint([0.001,0.0],[1.0,1.0],[0.0,0.0])
+        self.assertTrue(self.io._streamer.changed([0.001,0.0]))
+
+        self.io._add_traj_command_to_queue(JointTrajectory())
+        self.assertTrue(self.io._streamer.changed([0.001,0.0]))
+
+        msg = JointTrajectory()
+        msg.header.stamp = rospy.Time(1.0)
+        msg.points = [JointTrajectoryPoint(positions=[0.002,0.0])]
+        self.io._add_traj_command_to_queue(msg)
+        self.assertTrue(self.io._streamer.changed([0.001,0.0]))
+
+    def test_hosted_setpoints_are_sent_at_once(self):
+        sent = []
+        self.io.tx_queue_ = type('TxQueue',(object,),{'put':lambda queue,frame: sent.append(frame)})()
+        self.io.command_setpoint([0.5,0.0],[1.0,1.0],[0.0,0.0])
+        self.assertEqual(sent,[])
+        self.io._control_loop = object()
+        self.io.command_setpoint([0.75,0.0],[1.0,1.0],[0.0,0.0])
+        self.assertEqual(len(sent),1)
+        self.assertEqual(struct.unpack_from('<f',sent[0],2)[0],0.75)
+
+        """
+        The setpoint is timed until the next feedback frame
+        """
+        sent_time = self.io._link_monitor._requests['command']
+        self.io._link_monitor.response_received('command',sent_time+0.004)
+        self.assertAlmostEqual(self.io._link_monitor.last_latency_ms,4.0)
+
+    def test_desired_state_keeps_the_sampled_velocities(self):
+        sent = []
+        self.io.tx_queue_ = type('TxQueue',(object,),{'put':lambda queue,frame: sent.append(frame)})()
+        self.io._streamer.set_trajectory(10.0,[0.0,2.0],[[0.0,0.0],[1.0,-0.5]])
+        get_time = rospy.get_time
+        rospy.get_time = lambda: 11.0
+        try:
+            self.io._update_command_queue(None)
+        finally:
+            rospy.get_time = get_time
+        self.assertEqual(len(sent),1)
+        self.assertAlmostEqual(self.io._last_cmd.positions[0],0.5)
+        self.assertAlmostEqual(self.io._last_cmd.velocities[0],0.5)
+        self.assertAlmostEqual(self.io._last_cmd.velocities[1],-0.25)
+        self.assertEqual(struct.unpack_from('<f',sent[0],6)[0],STREAM_VELOCITY_LIMIT)
+
+if __name__ == '__main__':
+    unittest.main()